@@ -0,0 +1,54 @@
+"""Холодный старт: время импорта приложения и адаптеров бирж.
+
+Каждый сценарий запускается в новом интерпретаторе (как при перезапуске watchdog),
+время импорта - сумма self-времени из python -X importtime.
+
+Запуск: python -m benchmarks.bench_import [--runs 5]
+"""
+import argparse
+import subprocess
+import sys
+
+APP = "import src.server.app"
+ADAPTER = "from src.trading.exchange_manager import load_adapter, ExchangeType; load_adapter(ExchangeType.{})"
+
+SCENARIOS = {
+    "app": APP,
+    "app+bybit": f"{APP}; {ADAPTER.format('BYBIT')}",
+    "app+binance": f"{APP}; {ADAPTER.format('BINANCE')}",
+    # Прежнее поведение: оба SDK при каждом старте
+    "app+оба SDK": f"{APP}; {ADAPTER.format('BYBIT')}; {ADAPTER.format('BINANCE')}",
+}
+
+
+def import_time_ms(code: str) -> float:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, check=True
+    )
+    total_us = 0
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            self_us = line.split(":", 1)[1].split("|")[0].strip()
+            if self_us.isdigit():
+                total_us += int(self_us)
+    return total_us / 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Время холодного импорта")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    results = {}
+    for name, code in SCENARIOS.items():
+        results[name] = min(import_time_ms(code) for _ in range(args.runs))
+        print(f"{name:<14} {results[name]:9.1f} мс")
+
+    baseline = results["app+оба SDK"]
+    for name in ("app+bybit", "app+binance"):
+        print(f"Экономия {name}: {baseline - results[name]:.1f} мс ({baseline / results[name]:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
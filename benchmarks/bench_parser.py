@@ -0,0 +1,54 @@
+"""Сравнение пути приема вебхука: прежний (json + проверки + generic except) и текущий.
+
+Запуск: python -m benchmarks.bench_parser
+"""
+import json
+import logging
+import timeit
+from src.parser import SignalParser, SignalType, TradingSignal, loads, decoder
+
+logging.disable(logging.CRITICAL)
+
+BODY = b'{"symbol": "ethusdt", "signal": "long", "timeframe": "15"}'
+ROUNDS = 200000
+
+
+def legacy_parse(body: bytes) -> TradingSignal:
+    """Прежняя реализация: stdlib json, isinstance-проверки, upper/lower и Enum(value)"""
+    try:
+        data = json.loads(body)
+        if not isinstance(data, dict):
+            raise ValueError("Данные должны быть словарем")
+        missing_fields = SignalParser.REQUIRED_FIELDS - data.keys()
+        if missing_fields:
+            raise ValueError(f"Отсутствуют обязательные поля: {missing_fields}")
+        if not data['symbol'] or not isinstance(data['symbol'], str):
+            raise ValueError("Поле 'symbol' должно быть непустой строкой")
+        if not data['signal'] or not isinstance(data['signal'], str):
+            raise ValueError("Поле 'signal' должно быть непустой строкой")
+        return TradingSignal(
+            symbol=data['symbol'].upper(),
+            signal=SignalType(data['signal'].lower()),
+            timeframe=data.get('timeframe')
+        )
+    except Exception as e:
+        raise ValueError(f"Не удалось распарсить сигнал: {e}")
+
+
+def fast_parse(body: bytes) -> TradingSignal:
+    return SignalParser.parse(loads(body))
+
+
+def bench(name: str, func) -> float:
+    seconds = min(timeit.repeat(lambda: func(BODY), number=ROUNDS, repeat=5))
+    per_call = seconds / ROUNDS * 1e6
+    print(f"{name:<10} {per_call:7.3f} мкс/сигнал  {ROUNDS / seconds:12,.0f} сигналов/сек")
+    return per_call
+
+
+if __name__ == "__main__":
+    assert legacy_parse(BODY).symbol == fast_parse(BODY).symbol
+    print(f"JSON декодер: {'orjson' if decoder.orjson is not None else 'json (stdlib)'}")
+    legacy = bench("legacy", legacy_parse)
+    fast = bench("fast-path", fast_parse)
+    print(f"Ускорение: x{legacy / fast:.2f}")
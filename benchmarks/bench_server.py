@@ -0,0 +1,138 @@
+"""Задержка HTTP-сервера: профиль default против low_latency на тех же маршрутах.
+
+Для каждого профиля поднимается настоящий сервер (start_server, paper trading на
+записанных ценах, отдельный процесс), затем /health и /webhook получают по N
+запросов; печатаются перцентили задержки клиента. Сигналы чередуют long/short
+и уникальны (поле n), поэтому каждый доходит до стратегии, а не отвечается из
+индекса повторов.
+
+Запуск: python -m benchmarks.bench_server [--requests 2000] [--concurrency 1] [--new-connections]
+"""
+import argparse
+import http.client
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+PROFILES = ("default", "low_latency")
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start(profile: str, port: int, workdir: str, env: dict = None, prices: int = 1000) -> subprocess.Popen:
+    """Сервер (paper trading на записанных ценах) в отдельном процессе; env дополняет окружение"""
+    price_file = os.path.join(workdir, "prices.csv")
+    with open(price_file, "w") as f:
+        f.write("close\n" + "\n".join(str(2000 + i % 50) for i in range(prices)) + "\n")
+
+    server_env = dict(
+        os.environ, SERVER_PROFILE=profile, SERVER_HOST="127.0.0.1", SERVER_PORT=str(port), SERVER_IP="127.0.0.1",
+        BYBIT_ENABLED="true", BINANCE_ENABLED="false", PAPER_TRADING="true", PAPER_PRICE_FILE=price_file,
+        PAPER_SHADOW="false", JOURNAL_ENABLED="false", DEV_MODE="true", WEBHOOK_WORKERS="1",
+        CONSENSUS_TIMEFRAMES="", ORDER_TEMPLATES="false"
+    )
+    server_env.update(env or {})
+    process = subprocess.Popen(
+        [sys.executable, "-c", "from src.server.app import start_server; start_server()"],
+        env=server_env, cwd=workdir, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline and process.poll() is None:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", port, timeout=1)
+            connection.request("GET", "/health")
+            if connection.getresponse().status == 200:
+                connection.close()
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"Сервер с профилем {profile} не запустился")
+
+
+def run(port: int, method: str, path: str, bodies, concurrency: int, new_connections: bool):
+    local = threading.local()
+
+    def connection() -> http.client.HTTPConnection:
+        if new_connections or getattr(local, "connection", None) is None:
+            local.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        return local.connection
+
+    def one(body) -> float:
+        conn = connection()
+        started = time.perf_counter()
+        conn.request(method, path, body=body, headers={"Content-Type": "application/json"} if body else {})
+        response = conn.getresponse()
+        response.read()
+        elapsed = time.perf_counter() - started
+        if response.status != 200:
+            raise RuntimeError(f"{path}: HTTP {response.status}")
+        if new_connections:
+            conn.close()
+        return elapsed
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        return list(pool.map(one, bodies))
+
+
+def summary(latencies) -> str:
+    ms = sorted(value * 1000 for value in latencies)
+    q = statistics.quantiles(ms, n=100)
+    return (f"p50 {q[49]:7.3f}  p90 {q[89]:7.3f}  p99 {q[98]:7.3f}  max {ms[-1]:7.3f}  "
+            f"mean {statistics.fmean(ms):7.3f} мс")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Задержка сервера по профилям")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    parser.add_argument("--new-connections", action="store_true", help="Новое соединение на запрос (как TradingView)")
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    results = {}
+    for profile in PROFILES:
+        port = free_port()
+        with tempfile.TemporaryDirectory() as workdir:
+            os.symlink(os.path.join(root, "src"), os.path.join(workdir, "src"))
+            process = start(profile, port, workdir)
+            try:
+                signals = [
+                    json.dumps({"symbol": "ETHUSDT", "signal": "long" if i % 2 else "short", "n": i}).encode()
+                    for i in range(args.warmup + args.requests)
+                ]
+                run(port, "GET", "/health", [None] * args.warmup, args.concurrency, args.new_connections)
+                run(port, "POST", "/webhook", signals[:args.warmup], args.concurrency, args.new_connections)
+
+                results[profile] = {
+                    "/health": run(port, "GET", "/health", [None] * args.requests,
+                                   args.concurrency, args.new_connections),
+                    "/webhook": run(port, "POST", "/webhook", signals[args.warmup:],
+                                    args.concurrency, args.new_connections),
+                }
+            finally:
+                process.terminate()
+                process.wait(timeout=10)
+
+    mode = "новое соединение на запрос" if args.new_connections else "keep-alive"
+    print(f"{args.requests} запросов на маршрут, параллельно {args.concurrency}, {mode}")
+    for path in ("/health", "/webhook"):
+        for profile in PROFILES:
+            print(f"{path:<9} {profile:<12} {summary(results[profile][path])}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,315 @@
+"""Soak-тест: многочасовой прогон сервера и поиск дрейфа памяти, fd и задержек.
+
+Сервер запускается как в бою (start_server, watchdog, сверка не нужна - paper
+trading на записанных ценах вместо биржи), на него идет синтетический поток
+алертов: чередование long/short, новое соединение на запрос, как у TradingView.
+Раз в --sample-interval снимаются RSS и открытые fd всех процессов сервера
+(psutil), задержка event loop (сводка event_loop_lag_seconds из /metrics) и
+задержка сигналов за интервал (p50/p99 клиента).
+
+После прогрева сравниваются медианы первой и последней трети выборок и наклон
+линейной регрессии; растущий сверх допуска ряд - провал (код выхода 1).
+Перезапуск процесса сервера (watchdog) - тоже провал.
+
+Запуск: python -m benchmarks.soak --duration 4h [--rate 2] [--workers 1] [--csv soak.csv]
+"""
+import argparse
+import csv
+import http.client
+import json
+import os
+import random
+import secrets
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+import psutil
+from benchmarks.bench_server import free_port, start
+
+SYMBOL = "ETHUSDT"
+SERIES = ("rss_mb", "open_fds", "loop_lag_ms", "latency_p50_ms", "latency_p99_ms")
+
+
+def parse_duration(value: str) -> float:
+    units = {"s": 1, "m": 60, "h": 3600}
+    if value and value[-1] in units:
+        return float(value[:-1]) * units[value[-1]]
+    return float(value)
+
+
+@dataclass
+class Sample:
+    elapsed_s: float
+    rss_mb: float
+    open_fds: int
+    processes: int
+    loop_lag_ms: Optional[float]
+    latency_p50_ms: Optional[float]
+    latency_p99_ms: Optional[float]
+    signals: int
+    errors: int
+    restarted: bool
+
+
+@dataclass
+class Verdict:
+    series: str
+    first: float
+    last: float
+    slope_per_hour: float
+    failed: bool
+    note: str = ""
+
+
+@dataclass
+class AlertStream:
+    """Синтетические алерты с заданной частотой (пуассоновский поток) в отдельном потоке"""
+    port: int
+    rate: float
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    sent: int = 0
+
+    def __post_init__(self):
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="alerts", daemon=True)
+
+    def start(self):
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def drain(self):
+        with self._lock:
+            latencies, self.latencies = self.latencies, []
+            errors, self.errors = self.errors, 0
+        return latencies, errors
+
+    def _run(self):
+        long = False
+        while not self._stop.wait(random.expovariate(self.rate)):
+            long = not long
+            body = json.dumps({"symbol": SYMBOL, "signal": "long" if long else "short",
+                               "timeframe": "15", "n": self.sent}).encode()
+            self.sent += 1
+            started = time.perf_counter()
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=30)
+                connection.request("POST", "/webhook", body=body, headers={"Content-Type": "application/json"})
+                response = connection.getresponse()
+                response.read()
+                connection.close()
+                ok = response.status == 200
+            except OSError:
+                ok = False
+            elapsed = time.perf_counter() - started
+            with self._lock:
+                if ok:
+                    self.latencies.append(elapsed)
+                else:
+                    self.errors += 1
+
+
+class LoopLagReader:
+    """Средняя задержка event loop за интервал: приращения sum/count сводки из /metrics"""
+
+    def __init__(self, port: int, token: str):
+        self.port = port
+        self.token = token
+        self.reset = False
+        self._previous = None
+
+    def read(self) -> Optional[float]:
+        try:
+            connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=10)
+            connection.request("GET", "/metrics", headers={"X-Admin-Token": self.token})
+            text = connection.getresponse().read().decode()
+            connection.close()
+        except OSError:
+            return None
+
+        values = {}
+        for line in text.splitlines():
+            if line.startswith(("event_loop_lag_seconds_count", "event_loop_lag_seconds_sum")):
+                name, value = line.split()
+                values[name] = float(value)
+        if len(values) < 2:
+            return None
+
+        current = (values["event_loop_lag_seconds_count"], values["event_loop_lag_seconds_sum"])
+        previous, self._previous = self._previous, current
+        if previous is not None and current[0] < previous[0]:
+            # Счетчик сбросился - процесс перезапущен (watchdog делает execv с тем же pid)
+            self.reset = True
+        if previous is None or current[0] <= previous[0]:
+            return None
+        return (current[1] - previous[1]) / (current[0] - previous[0]) * 1000
+
+
+def process_tree(root: psutil.Process) -> List[psutil.Process]:
+    try:
+        return [root] + root.children(recursive=True)
+    except psutil.NoSuchProcess:
+        return []
+
+
+def resources(root: psutil.Process) -> Dict[str, Any]:
+    rss, fds, pids = 0, 0, set()
+    for process in process_tree(root):
+        try:
+            rss += process.memory_info().rss
+            fds += process.num_fds()
+            pids.add(process.pid)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return {"rss_mb": rss / 2 ** 20, "open_fds": fds, "pids": pids}
+
+
+def slope_per_hour(xs: List[float], ys: List[float]) -> float:
+    mean_x, mean_y = statistics.fmean(xs), statistics.fmean(ys)
+    variance = sum((x - mean_x) ** 2 for x in xs)
+    if variance == 0:
+        return 0.0
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / variance * 3600
+
+
+def judge(samples: List[Sample], args) -> List[Verdict]:
+    """Рост ряда: медиана последней трети против первой + положительный наклон"""
+    verdicts = []
+    for series in SERIES:
+        points = [(s.elapsed_s, getattr(s, series)) for s in samples if getattr(s, series) is not None]
+        if len(points) < 6:
+            verdicts.append(Verdict(series, 0, 0, 0, False, "недостаточно данных"))
+            continue
+
+        third = len(points) // 3
+        first = statistics.median(y for _, y in points[:third])
+        last = statistics.median(y for _, y in points[-third:])
+        slope = slope_per_hour([x for x, _ in points], [y for _, y in points])
+        growth = last - first
+
+        if series == "open_fds":
+            failed = growth > args.max_fd_growth
+        elif series == "rss_mb":
+            failed = growth > first * args.max_rss_growth
+        elif series == "loop_lag_ms":
+            failed = growth > max(first * args.max_latency_growth, args.min_lag_growth_ms)
+        else:
+            failed = growth > max(first * args.max_latency_growth, args.min_latency_growth_ms)
+        verdicts.append(Verdict(series, first, last, slope, failed and slope > 0))
+    return verdicts
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Soak-тест сервера")
+    parser.add_argument("--duration", default="4h", help="Длительность: 90s, 30m, 4h")
+    parser.add_argument("--warmup", default="5m", help="Прогрев, не участвует в оценке трендов")
+    parser.add_argument("--sample-interval", default="30s")
+    parser.add_argument("--rate", type=float, default=2.0, help="Сигналов в секунду")
+    parser.add_argument("--workers", type=int, default=1, help="WEBHOOK_WORKERS сервера")
+    parser.add_argument("--profile", default="default", help="SERVER_PROFILE сервера")
+    parser.add_argument("--journal", action="store_true", help="Включить журнал SQLite (как в бою)")
+    parser.add_argument("--csv", help="Записать выборки в CSV")
+    parser.add_argument("--max-rss-growth", type=float, default=0.10, help="Допустимый рост RSS, доля")
+    parser.add_argument("--max-fd-growth", type=int, default=5, help="Допустимый рост числа fd")
+    parser.add_argument("--max-latency-growth", type=float, default=0.5, help="Допустимый рост задержек, доля")
+    parser.add_argument("--min-latency-growth-ms", type=float, default=1.0, help="Рост задержки сигнала ниже - шум")
+    parser.add_argument("--min-lag-growth-ms", type=float, default=0.5, help="Рост задержки loop ниже - шум")
+    args = parser.parse_args()
+
+    duration = parse_duration(args.duration)
+    warmup = parse_duration(args.warmup)
+    interval = parse_duration(args.sample_interval)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    token = secrets.token_hex(16)
+    port = free_port()
+    env = {"WEBHOOK_WORKERS": str(args.workers), "ADMIN_TOKEN": token,
+           "JOURNAL_ENABLED": "true" if args.journal else "false"}
+    if args.workers > 1:
+        # /metrics исполнителя - на его служебном порту
+        env["EXECUTOR_PORT"] = str(free_port())
+        env["EXECUTOR_SOCKET"] = "data/executor.sock"
+    metrics_port = int(env.get("EXECUTOR_PORT", port))
+
+    samples: List[Sample] = []
+    with tempfile.TemporaryDirectory() as workdir:
+        os.symlink(os.path.join(root, "src"), os.path.join(workdir, "src"))
+        # Цены не должны кончиться за прогон: сигнал расходует 1-2 цены
+        server = start(args.profile, port, workdir, env=env, prices=int(duration * args.rate * 3) + 1000)
+        root_process = psutil.Process(server.pid)
+        pids = resources(root_process)["pids"]
+        print(f"Сервер pid {server.pid} (процессов: {len(pids)}), {args.rate} сиг/сек, "
+              f"{args.duration}, выборка раз в {args.sample_interval}", flush=True)
+
+        stream = AlertStream(port, args.rate)
+        lag = LoopLagReader(metrics_port, token)
+        lag.read()
+        stream.start()
+        started = time.monotonic()
+        exited = False
+        try:
+            while (elapsed := time.monotonic() - started) < duration:
+                time.sleep(min(interval, max(0.0, duration - elapsed)))
+                elapsed = time.monotonic() - started
+                if server.poll() is not None:
+                    print(f"Сервер завершился с кодом {server.returncode}", flush=True)
+                    exited = True
+                    break
+
+                latencies, errors = stream.drain()
+                ms = sorted(value * 1000 for value in latencies)
+                usage = resources(root_process)
+                loop_lag = lag.read()
+                sample = Sample(
+                    elapsed_s=round(elapsed, 1), rss_mb=usage["rss_mb"], open_fds=usage["open_fds"],
+                    processes=len(usage["pids"]), loop_lag_ms=loop_lag,
+                    latency_p50_ms=statistics.median(ms) if ms else None,
+                    latency_p99_ms=statistics.quantiles(ms, n=100)[98] if len(ms) >= 2 else None,
+                    signals=len(ms), errors=errors, restarted=usage["pids"] != pids or lag.reset
+                )
+                pids, lag.reset = usage["pids"], False
+                samples.append(sample)
+                print("  ".join(f"{key}={value:.2f}" if isinstance(value, float) else f"{key}={value}"
+                                for key, value in asdict(sample).items()), flush=True)
+        finally:
+            stream.stop()
+            server.terminate()
+            try:
+                server.wait(timeout=15)
+            except Exception:
+                server.kill()
+
+    if args.csv:
+        with open(args.csv, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(asdict(samples[0]).keys()) if samples else ["elapsed_s"])
+            writer.writeheader()
+            writer.writerows(asdict(sample) for sample in samples)
+
+    # Смена процессов исполнителя/воркеров или сброс счетчиков - перезапуск после сбоя
+    measured = [s for s in samples if s.elapsed_s >= warmup]
+    restarts = [s for s in samples if s.restarted]
+    verdicts = judge(measured, args)
+    errors = sum(s.errors for s in samples)
+
+    print(f"\nВыборок после прогрева: {len(measured)}, сигналов: {stream.sent}, ошибок: {errors}")
+    for verdict in verdicts:
+        status = "РОСТ" if verdict.failed else "ok"
+        print(f"{verdict.series:<16} {verdict.first:10.3f} -> {verdict.last:10.3f}  "
+              f"наклон {verdict.slope_per_hour:+10.3f}/час  {status} {verdict.note}")
+
+    failed = exited or bool(restarts) or any(v.failed for v in verdicts)
+    if exited or restarts:
+        print("Процессы сервера перезапускались во время прогона")
+    print("ПРОВАЛ" if failed else "OK")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4 @@
+from .engine import MacdParams, BacktestResult, run_backtest
+from .sweep import SweepGrid, run_sweep
+
+__all__ = ['MacdParams', 'BacktestResult', 'run_backtest', 'SweepGrid', 'run_sweep']
@@ -0,0 +1,25 @@
+import csv
+import numpy as np
+
+
+def load_closes(path: str) -> np.ndarray:
+    """Загрузка цен закрытия из CSV (колонка close, остальные игнорируются)"""
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        if not reader.fieldnames or 'close' not in reader.fieldnames:
+            raise ValueError(f"В файле {path} нет колонки 'close'")
+        closes = [float(row['close']) for row in reader]
+
+    if len(closes) < 2:
+        raise ValueError(f"В файле {path} недостаточно данных")
+
+    return np.asarray(closes, dtype=np.float64)
+
+
+def resample_closes(closes: np.ndarray, factor: int) -> np.ndarray:
+    """Переход на старший таймфрейм: берем close последнего бара каждого окна"""
+    if factor <= 1:
+        return closes
+
+    usable = (len(closes) // factor) * factor
+    return closes[factor - 1:usable:factor]
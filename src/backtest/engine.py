@@ -0,0 +1,106 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from src.trading.instrument import InstrumentSpec
+
+DEFAULT_FEE_RATE = 0.00055
+
+
+@dataclass(frozen=True)
+class MacdParams:
+    fast: int
+    slow: int
+    signal: int
+
+    @property
+    def warmup(self) -> int:
+        return self.slow + self.signal
+
+
+@dataclass
+class BacktestResult:
+    trades: int
+    total_pnl: float
+    win_rate: float
+    max_drawdown: float
+    liquidations: int
+
+    @property
+    def score(self) -> float:
+        """Доходность с поправкой на просадку - для ранжирования конфигураций"""
+        return self.total_pnl / (1.0 + self.max_drawdown)
+
+
+def ema(values: np.ndarray, period: int) -> np.ndarray:
+    """EMA как в TradingView (alpha = 2 / (period + 1), старт с первого значения)"""
+    alpha = 2.0 / (period + 1)
+    out = []
+    acc = float(values[0])
+    # Рекурсия не векторизуется - sweep кеширует EMA по периодам
+    for value in values.tolist():
+        acc += alpha * (value - acc)
+        out.append(acc)
+    return np.asarray(out, dtype=np.float64)
+
+
+def macd_positions(fast_ema: np.ndarray, slow_ema: np.ndarray, params: MacdParams) -> np.ndarray:
+    """Позиция по бару: +1 long, -1 short, 0 до прогрева. Переворот на пересечении MACD и сигнальной"""
+    macd = fast_ema - slow_ema
+    hist = macd - ema(macd, params.signal)
+
+    positions = np.sign(hist).astype(np.int8)
+    positions[:params.warmup] = 0
+
+    # Нулевая гистограмма не меняет позицию - протягиваем предыдущее значение
+    idx = np.where(positions != 0, np.arange(len(positions)), 0)
+    np.maximum.accumulate(idx, out=idx)
+    return positions[idx]
+
+
+def evaluate_positions(closes: np.ndarray, positions: np.ndarray, position_size: float,
+                       leverage: int, fee_rate: float = DEFAULT_FEE_RATE,
+                       spec: Optional[InstrumentSpec] = None) -> BacktestResult:
+    """Симуляция стратегии разворота: маркет-вход на close бара с фиксированным номиналом.
+    Со spec количество округляется по фильтрам инструмента так же, как в живом движке"""
+    starts = np.flatnonzero(np.diff(positions) != 0) + 1
+    starts = starts[positions[starts] != 0]
+
+    if len(starts) == 0:
+        return BacktestResult(trades=0, total_pnl=0.0, win_rate=0.0, max_drawdown=0.0, liquidations=0)
+
+    ends = np.append(starts[1:], len(closes) - 1)
+    sides = positions[starts].astype(np.float64)
+    entry = closes[starts]
+    exit_ = closes[ends]
+
+    # Экстремумы цены внутри сделки (включая бар выхода) для проверки ликвидации
+    seg_min = np.minimum(np.minimum.reduceat(closes, starts), exit_)
+    seg_max = np.maximum(np.maximum.reduceat(closes, starts), exit_)
+    adverse = np.where(sides > 0, seg_min / entry - 1.0, 1.0 - seg_max / entry)
+    liquidated = adverse <= -1.0 / leverage
+
+    notional = position_size * leverage
+    if spec is None:
+        pnl = np.where(liquidated, -position_size, notional * sides * (exit_ / entry - 1.0))
+        pnl -= 2.0 * fee_rate * notional
+    else:
+        qty = spec.clamp_quantities(spec.round_quantities(notional / entry))
+        pnl = np.where(liquidated, -position_size, qty * sides * (exit_ - entry))
+        pnl -= fee_rate * qty * (entry + exit_)
+
+    equity = np.cumsum(pnl)
+    peak = np.maximum.accumulate(np.maximum(equity, 0.0))
+
+    return BacktestResult(
+        trades=len(pnl),
+        total_pnl=float(equity[-1]),
+        win_rate=float(np.count_nonzero(pnl > 0) / len(pnl)),
+        max_drawdown=float(np.max(peak - equity)),
+        liquidations=int(np.count_nonzero(liquidated))
+    )
+
+
+def run_backtest(closes: np.ndarray, params: MacdParams, position_size: float, leverage: int,
+                 fee_rate: float = DEFAULT_FEE_RATE, spec: Optional[InstrumentSpec] = None) -> BacktestResult:
+    positions = macd_positions(ema(closes, params.fast), ema(closes, params.slow), params)
+    return evaluate_positions(closes, positions, position_size, leverage, fee_rate, spec)
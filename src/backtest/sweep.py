@@ -0,0 +1,219 @@
+import argparse
+import csv
+import heapq
+import os
+import time
+from dataclasses import dataclass
+from multiprocessing import Pool, shared_memory
+from typing import Dict, List, Tuple, Iterator, Optional
+import numpy as np
+from .data import load_closes, resample_closes
+from .engine import MacdParams, ema, macd_positions, evaluate_positions, DEFAULT_FEE_RATE
+from src.trading.instrument import InstrumentSpec
+from src.logger.config import setup_logger
+
+logger = setup_logger(__name__)
+
+RESULT_FIELDS = [
+    'symbol', 'timeframe', 'fast', 'slow', 'signal', 'position_size', 'leverage',
+    'trades', 'total_pnl', 'win_rate', 'max_drawdown', 'liquidations', 'score'
+]
+
+Task = Tuple[str, int, int, int, int]
+
+
+@dataclass
+class SweepGrid:
+    fast: List[int]
+    slow: List[int]
+    signal: List[int]
+    timeframes: List[int]
+    position_sizes: List[float]
+    leverages: List[int]
+
+    def tasks(self, symbols: List[str]) -> Iterator[Task]:
+        """Задачи сгруппированы по (символ, таймфрейм), чтобы воркеры переиспользовали кеш EMA"""
+        for symbol in symbols:
+            for timeframe in self.timeframes:
+                for fast in self.fast:
+                    for slow in self.slow:
+                        if fast >= slow:
+                            continue
+                        for signal in self.signal:
+                            yield symbol, timeframe, fast, slow, signal
+
+    def size(self, symbols: List[str]) -> int:
+        return sum(1 for _ in self.tasks(symbols)) * len(self.position_sizes) * len(self.leverages)
+
+
+class SharedCloses:
+    """Ценовые ряды в shared memory - воркеры читают их без пиклинга"""
+
+    def __init__(self, closes: Dict[str, np.ndarray]):
+        self._blocks: List[shared_memory.SharedMemory] = []
+        self.descriptors: Dict[str, Tuple[str, int]] = {}
+
+        for symbol, values in closes.items():
+            block = shared_memory.SharedMemory(create=True, size=values.nbytes)
+            np.ndarray(values.shape, dtype=np.float64, buffer=block.buf)[:] = values
+            self._blocks.append(block)
+            self.descriptors[symbol] = (block.name, len(values))
+
+    def close(self):
+        for block in self._blocks:
+            block.close()
+            block.unlink()
+        self._blocks.clear()
+
+    def __enter__(self) -> 'SharedCloses':
+        return self
+
+    def __exit__(self, *_exc):
+        self.close()
+
+
+# Состояние воркера (заполняется в _init_worker)
+_series: Dict[str, np.ndarray] = {}
+_blocks: List[shared_memory.SharedMemory] = []
+_grid: Optional[SweepGrid] = None
+_fee_rate = DEFAULT_FEE_RATE
+_specs: Dict[str, InstrumentSpec] = {}
+_cache_key: Optional[Tuple[str, int]] = None
+_cache_closes: Optional[np.ndarray] = None
+_cache_ema: Dict[int, np.ndarray] = {}
+
+
+def _init_worker(descriptors: Dict[str, Tuple[str, int]], grid: SweepGrid, fee_rate: float,
+                 specs: Dict[str, InstrumentSpec]):
+    global _grid, _fee_rate
+    _grid = grid
+    _fee_rate = fee_rate
+    _specs.update(specs)
+
+    for symbol, (name, length) in descriptors.items():
+        block = shared_memory.SharedMemory(name=name)
+        _blocks.append(block)
+        _series[symbol] = np.ndarray((length,), dtype=np.float64, buffer=block.buf)
+
+
+def _closes_for(symbol: str, timeframe: int) -> np.ndarray:
+    global _cache_key, _cache_closes
+    key = (symbol, timeframe)
+    if _cache_key != key:
+        _cache_key = key
+        _cache_closes = resample_closes(_series[symbol], timeframe)
+        _cache_ema.clear()
+    return _cache_closes
+
+
+def _ema_for(closes: np.ndarray, period: int) -> np.ndarray:
+    values = _cache_ema.get(period)
+    if values is None:
+        values = _cache_ema[period] = ema(closes, period)
+    return values
+
+
+def _evaluate(task: Task) -> List[tuple]:
+    symbol, timeframe, fast, slow, signal = task
+    params = MacdParams(fast=fast, slow=slow, signal=signal)
+    closes = _closes_for(symbol, timeframe)
+
+    if len(closes) <= params.warmup:
+        return []
+
+    # Сигналы не зависят от размера и плеча - считаем их один раз на группу
+    positions = macd_positions(_ema_for(closes, fast), _ema_for(closes, slow), params)
+
+    rows = []
+    for position_size in _grid.position_sizes:
+        for leverage in _grid.leverages:
+            result = evaluate_positions(closes, positions, position_size, leverage, _fee_rate, _specs.get(symbol))
+            rows.append((
+                symbol, timeframe, fast, slow, signal, position_size, leverage,
+                result.trades, round(result.total_pnl, 4), round(result.win_rate, 4),
+                round(result.max_drawdown, 4), result.liquidations, round(result.score, 4)
+            ))
+    return rows
+
+
+def run_sweep(closes: Dict[str, np.ndarray], grid: SweepGrid, output_path: str,
+              workers: Optional[int] = None, top: int = 20, fee_rate: float = DEFAULT_FEE_RATE,
+              specs: Optional[Dict[str, InstrumentSpec]] = None) -> List[tuple]:
+    """Перебор сетки параметров на всех ядрах. Результаты пишутся потоково, возвращается топ по score.
+    specs - фильтры инструментов по символам (округление количества как у биржи)"""
+    symbols = list(closes)
+    workers = workers or os.cpu_count() or 1
+    total = grid.size(symbols)
+    score_index = RESULT_FIELDS.index('score')
+
+    logger.info(f"Sweep: {total} конфигураций, {len(symbols)} символов, воркеров: {workers}")
+    started = time.perf_counter()
+    best: List[Tuple[float, int, tuple]] = []
+    done = 0
+
+    with SharedCloses(closes) as shared, open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(RESULT_FIELDS)
+
+        with Pool(workers, initializer=_init_worker, initargs=(shared.descriptors, grid, fee_rate, specs or {})) as pool:
+            for rows in pool.imap_unordered(_evaluate, grid.tasks(symbols), chunksize=32):
+                writer.writerows(rows)
+                for row in rows:
+                    done += 1
+                    item = (row[score_index], done, row)
+                    if len(best) < top:
+                        heapq.heappush(best, item)
+                    elif item > best[0]:
+                        heapq.heapreplace(best, item)
+
+    elapsed = time.perf_counter() - started
+    logger.info(f"Sweep завершен: {done} конфигураций за {elapsed:.1f} сек, результаты в {output_path}")
+    return [row for _, _, row in sorted(best, reverse=True)]
+
+
+def _parse_values(spec: str, cast=int) -> list:
+    """'8:20:2' -> 8, 10, ..., 20 (включительно); '5,15,60' -> список"""
+    if ':' in spec:
+        start, stop, *step = spec.split(':')
+        start, stop = cast(start), cast(stop)
+        step = cast(step[0]) if step else cast(1)
+        values = []
+        while start <= stop:
+            values.append(start)
+            start += step
+        return values
+    return [cast(value) for value in spec.split(',')]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Перебор параметров MACD стратегии")
+    parser.add_argument('--data', action='append', required=True, help="SYMBOL=path.csv (колонка close)")
+    parser.add_argument('--fast', default='8:16:2')
+    parser.add_argument('--slow', default='20:32:2')
+    parser.add_argument('--signal', default='7:11:2')
+    parser.add_argument('--timeframes', default='1', help="Множители базового таймфрейма данных")
+    parser.add_argument('--position-sizes', default=os.getenv('POSITION_SIZE', '100'))
+    parser.add_argument('--leverages', default=os.getenv('LEVERAGE', '10'))
+    parser.add_argument('--fee-rate', type=float, default=DEFAULT_FEE_RATE)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--output', default='sweep_results.csv')
+    args = parser.parse_args()
+
+    closes = {}
+    for item in args.data:
+        symbol, path = item.split('=', 1)
+        closes[symbol.upper()] = load_closes(path)
+
+    grid = SweepGrid(
+        fast=_parse_values(args.fast),
+        slow=_parse_values(args.slow),
+        signal=_parse_values(args.signal),
+        timeframes=_parse_values(args.timeframes),
+        position_sizes=_parse_values(args.position_sizes, float),
+        leverages=_parse_values(args.leverages)
+    )
+
+    for rank, row in enumerate(run_sweep(closes, grid, args.output, args.workers, args.top, args.fee_rate), 1):
+        logger.info(f"#{rank}: " + ", ".join(f"{name}={value}" for name, value in zip(RESULT_FIELDS, row)))
+
@@ -0,0 +1,3 @@
+from .journal import TradeJournal, JournalEvent, get_journal
+
+__all__ = ['TradeJournal', 'JournalEvent', 'get_journal']
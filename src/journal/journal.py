@@ -0,0 +1,179 @@
+import json
+import os
+import queue
+import sqlite3
+import threading
+import time
+from enum import Enum
+from typing import Optional, Dict, Any, List
+from src.logger.config import setup_logger
+
+
+class JournalEvent(Enum):
+    WEBHOOK = "webhook"
+    FILTER = "filter"
+    ORDER_REQUEST = "order_request"
+    ORDER_RESPONSE = "order_response"
+    FILL = "fill"
+    DRIFT = "drift"
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,
+    event TEXT NOT NULL,
+    symbol TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_events_symbol_ts ON events (symbol, ts);
+CREATE INDEX IF NOT EXISTS idx_events_ts ON events (ts);
+"""
+
+_STOP = object()
+
+
+class TradeJournal:
+    """Append-only журнал торговых событий в SQLite (WAL).
+
+    record() только кладет событие в очередь; запись идет в отдельном потоке,
+    который коммитит все накопившиеся события одной транзакцией.
+    """
+
+    def __init__(self, path: str, max_queue: int = 100000, max_batch: int = 1000):
+        self.logger = setup_logger(__name__)
+        self.path = path
+        self.max_batch = max_batch
+        self.written = 0
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+
+        # Схема создается синхронно, чтобы чтение работало сразу после старта
+        with sqlite3.connect(self.path) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+        self._thread = threading.Thread(target=self._writer_loop, name="trade-journal", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Журнал сделок: {self.path}")
+
+    def record(self, event: JournalEvent, symbol: Optional[str], payload: Dict[str, Any]):
+        try:
+            self._queue.put_nowait((time.time(), event.value, symbol, payload))
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout: float = 5.0):
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    def _writer_loop(self):
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+
+        running = True
+        while running:
+            item = self._queue.get()
+            if item is _STOP:
+                break
+
+            batch = [item]
+            # Group commit: забираем все, что накопилось, без ожидания
+            while len(batch) < self.max_batch:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    running = False
+                    break
+                batch.append(item)
+
+            rows = [
+                (ts, event, symbol, json.dumps(payload, ensure_ascii=False, separators=(',', ':'), default=str))
+                for ts, event, symbol, payload in batch
+            ]
+            try:
+                conn.execute("BEGIN")
+                conn.executemany("INSERT INTO events (ts, event, symbol, payload) VALUES (?, ?, ?, ?)", rows)
+                conn.execute("COMMIT")
+                self.written += len(rows)
+            except Exception as e:
+                self.logger.error(f"Ошибка записи в журнал: {e}")
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+
+        conn.close()
+
+    def query(self, symbol: Optional[str] = None, since: Optional[float] = None, until: Optional[float] = None,
+              event: Optional[str] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Выборка событий по символу и диапазону времени (read-only соединение, не трогает запись)"""
+        conditions, params = [], []
+        if symbol:
+            conditions.append("symbol = ?")
+            params.append(symbol.upper())
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(until)
+        if event:
+            conditions.append("event = ?")
+            params.append(event)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        sql = f"SELECT id, ts, event, symbol, payload FROM events {where} ORDER BY ts LIMIT ?"
+        params.append(limit)
+
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            return [
+                {'id': row[0], 'ts': row[1], 'event': row[2], 'symbol': row[3], 'payload': json.loads(row[4])}
+                for row in conn.execute(sql, params)
+            ]
+        finally:
+            conn.close()
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'written': self.written, 'dropped': self.dropped, 'pending': self._queue.qsize()}
+
+
+class _DisabledJournal:
+    """Заглушка при JOURNAL_ENABLED=false - record() ничего не делает"""
+
+    def record(self, event: JournalEvent, symbol: Optional[str], payload: Dict[str, Any]):
+        pass
+
+    def close(self, timeout: float = 5.0):
+        pass
+
+    def query(self, *args, **kwargs) -> List[Dict[str, Any]]:
+        return []
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {'written': 0, 'dropped': 0, 'pending': 0}
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_journal():
+    """Общий на процесс журнал (создается при первом обращении)"""
+    global _journal
+    if _journal is None:
+        with _journal_lock:
+            if _journal is None:
+                if os.getenv('JOURNAL_ENABLED', 'true').lower() == 'true':
+                    _journal = TradeJournal(os.getenv('JOURNAL_PATH', 'data/journal.db'))
+                else:
+                    _journal = _DisabledJournal()
+    return _journal
@@ -0,0 +1,3 @@
+from .registry import MetricsRegistry, get_metrics
+
+__all__ = ['MetricsRegistry', 'get_metrics']
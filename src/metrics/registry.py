@@ -0,0 +1,105 @@
+import threading
+from typing import Dict, Tuple, Optional
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+# Единицы в конце имени метрики: максимум сводки получает имя с единицей в конце
+_UNITS = ('seconds', 'bps')
+
+
+def _key(labels: Optional[Dict[str, str]]) -> LabelKey:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+class MetricsRegistry:
+    """Счетчики, gauge и сводки (count/sum/max) в памяти процесса, отдаются в формате Prometheus"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self._summaries: Dict[str, Dict[LabelKey, list]] = {}
+
+    def inc(self, name: str, labels: Optional[Dict[str, str]] = None, value: float = 1):
+        key = _key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        with self._lock:
+            self._gauges.setdefault(name, {})[_key(labels)] = value
+
+    def observe(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        key = _key(labels)
+        with self._lock:
+            series = self._summaries.setdefault(name, {})
+            summary = series.get(key)
+            if summary is None:
+                series[key] = [1, value, value]
+            else:
+                summary[0] += 1
+                summary[1] += value
+                summary[2] = max(summary[2], value)
+
+    def get(self, name: str, labels: Optional[Dict[str, str]] = None) -> float:
+        key = _key(labels)
+        with self._lock:
+            for store in (self._counters, self._gauges):
+                if name in store and key in store[name]:
+                    return store[name][key]
+        return 0
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        with self._lock:
+            result = {}
+            for store in (self._counters, self._gauges):
+                for name, series in store.items():
+                    result[name] = {_format_labels(key) or '': value for key, value in series.items()}
+            for name, series in self._summaries.items():
+                for key, (count, total, maximum) in series.items():
+                    labels = _format_labels(key) or ''
+                    result.setdefault(f"{name}_count", {})[labels] = count
+                    result.setdefault(f"{name}_sum", {})[labels] = total
+                    result.setdefault(_max_name(name), {})[labels] = maximum
+            return result
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for kind, store in (("counter", self._counters), ("gauge", self._gauges)):
+                for name, series in store.items():
+                    lines.append(f"# TYPE {name} {kind}")
+                    lines.extend(f"{name}{_format_labels(key)} {value}" for key, value in series.items())
+            for name, series in self._summaries.items():
+                lines.append(f"# TYPE {name} summary")
+                for key, (count, total, _) in series.items():
+                    labels = _format_labels(key)
+                    lines.append(f"{name}_count{labels} {count}")
+                    lines.append(f"{name}_sum{labels} {total}")
+                # У summary нет серии _max: максимум - отдельным семейством gauge
+                max_name = _max_name(name)
+                lines.append(f"# TYPE {max_name} gauge")
+                lines.extend(f"{max_name}{_format_labels(key)} {maximum}" for key, (_, _, maximum) in series.items())
+        return "\n".join(lines) + "\n"
+
+
+def _max_name(name: str) -> str:
+    """execution_fill_seconds -> execution_fill_max_seconds"""
+    for unit in _UNITS:
+        if name.endswith(f"_{unit}"):
+            return f"{name[:-len(unit)]}max_{unit}"
+    return f"{name}_max"
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in key) + "}"
+
+
+_metrics = MetricsRegistry()
+
+
+def get_metrics() -> MetricsRegistry:
+    return _metrics
@@ -1,5 +1,6 @@
 # src/parser/__init__.py
 from .signal_parser import SignalParser, SignalParserError
 from .models import TradingSignal, SignalType
+from .decoder import loads, dumps
 
-__all__ = ['SignalParser', 'SignalParserError', 'TradingSignal', 'SignalType']
\ No newline at end of file
+__all__ = ['SignalParser', 'SignalParserError', 'TradingSignal', 'SignalType', 'loads', 'dumps']
\ No newline at end of file
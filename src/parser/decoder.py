@@ -0,0 +1,24 @@
+import json
+from typing import Any
+from .signal_parser import SignalParserError
+
+try:
+    import orjson
+except ImportError:  # orjson опционален - без него работает stdlib json
+    orjson = None
+
+
+def loads(body: bytes) -> Any:
+    """Декодирование тела вебхука: orjson если установлен, иначе json"""
+    try:
+        if orjson is not None:
+            return orjson.loads(body)
+        return json.loads(body)
+    except ValueError as e:
+        raise SignalParserError(f"Некорректный JSON: {e}")
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(',', ':')).encode()
@@ -9,11 +9,13 @@ class SignalType(Enum):
     SHORT = "short"
 
 
-@dataclass
+@dataclass(slots=True)
 class TradingSignal:
     symbol: str
     signal: SignalType
     timeframe: Optional[str] = None
+    # Детерминированный id доставки (payload + интервал приема), основа clientOrderId
+    signal_id: Optional[str] = None
 
     def __str__(self) -> str:
         return f"{self.symbol} {self.signal.value}"
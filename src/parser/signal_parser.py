@@ -1,5 +1,6 @@
 # src/parser/signal_parser.py
-from typing import Dict, Any
+import sys
+from typing import Dict, Any, List, Union
 from .models import TradingSignal, SignalType
 from src.logger.config import setup_logger
 
@@ -12,30 +13,58 @@ class SignalParserError(Exception):
 
 class SignalParser:
     REQUIRED_FIELDS = {'symbol', 'signal'}
+    MAX_SYMBOLS = 1024
+
+    _SIGNAL_TYPES = {signal_type.value: signal_type for signal_type in SignalType}
+    # Таблица нормализованных символов: 'ethusdt' -> интернированная 'ETHUSDT'
+    _symbols: Dict[str, str] = {}
 
     @staticmethod
     def parse(webhook_data: Dict[str, Any]) -> TradingSignal:
         try:
-            SignalParser._validate_data(webhook_data)
+            if not isinstance(webhook_data, dict):
+                raise ValueError("Данные должны быть словарем")
 
-            symbol = webhook_data['symbol'].upper()
-            signal_str = webhook_data['signal'].lower()
-            timeframe = webhook_data.get('timeframe')
+            symbol = webhook_data.get('symbol')
+            signal_str = webhook_data.get('signal')
 
-            signal_type = SignalParser._parse_signal_type(signal_str)
+            # Быстрый путь: оба поля - непустые строки; иначе подробная проверка с причиной
+            if not (symbol and signal_str and isinstance(symbol, str) and isinstance(signal_str, str)):
+                SignalParser._validate_data(webhook_data)
 
-            trading_signal = TradingSignal(
-                symbol=symbol,
-                signal=signal_type,
-                timeframe=timeframe
+            return TradingSignal(
+                symbol=SignalParser._normalize_symbol(symbol),
+                signal=SignalParser._parse_signal_type(signal_str),
+                timeframe=webhook_data.get('timeframe')
             )
 
-            return trading_signal
-
-        except Exception as e:
+        except ValueError as e:
             logger.error(f"Ошибка парсинга сигнала: {e}")
             raise SignalParserError(f"Не удалось распарсить сигнал: {e}")
 
+    @staticmethod
+    def _normalize_symbol(symbol: str) -> str:
+        normalized = SignalParser._symbols.get(symbol)
+        if normalized is None:
+            normalized = sys.intern(symbol.upper())
+            if len(SignalParser._symbols) < SignalParser.MAX_SYMBOLS:
+                SignalParser._symbols[symbol] = normalized
+        return normalized
+
+    @staticmethod
+    def parse_batch(items: List[Any]) -> List[Union[TradingSignal, SignalParserError]]:
+        """Разбор массива сигналов: ошибка одного элемента не отменяет остальные"""
+        if not isinstance(items, list):
+            raise SignalParserError("Ожидается массив сигналов")
+
+        results = []
+        for item in items:
+            try:
+                results.append(SignalParser.parse(item))
+            except SignalParserError as e:
+                results.append(e)
+        return results
+
     @staticmethod
     def _validate_data(data: Dict[str, Any]) -> None:
         if not isinstance(data, dict):
@@ -53,7 +82,7 @@ class SignalParser:
 
     @staticmethod
     def _parse_signal_type(signal_str: str) -> SignalType:
-        try:
-            return SignalType(signal_str)
-        except ValueError:
-            raise ValueError(f"Неизвестный тип сигнала: {signal_str}. Поддерживаются: long, short")
\ No newline at end of file
+        signal_type = SignalParser._SIGNAL_TYPES.get(signal_str) or SignalParser._SIGNAL_TYPES.get(signal_str.lower())
+        if signal_type is None:
+            raise ValueError(f"Неизвестный тип сигнала: {signal_str}. Поддерживаются: long, short")
+        return signal_type
\ No newline at end of file
@@ -0,0 +1,89 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional
+from src.logger.config import setup_logger
+from src.metrics import get_metrics
+
+
+class AdmissionRejected(Exception):
+    def __init__(self, status_code: int, reason: str):
+        super().__init__(reason)
+        self.status_code = status_code
+        self.reason = reason
+
+
+class _SymbolSlot:
+    __slots__ = ('running', 'waiter')
+
+    def __init__(self):
+        self.running = False
+        self.waiter: Optional[asyncio.Future] = None
+
+
+class AdmissionController:
+    """Admission control для /webhook.
+
+    По символу одновременно исполняется один сигнал и ждет не больше одного:
+    новый сигнал сразу вытесняет ожидающий (429 superseded). Общий лимит
+    in-flight и таймаут ожидания дают быстрый 503 вместо зависшего запроса.
+    """
+
+    def __init__(self, max_in_flight: int = 32, max_wait: float = 10.0):
+        self.logger = setup_logger(__name__)
+        self.metrics = get_metrics()
+        self.max_in_flight = max_in_flight
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self._slots: Dict[str, _SymbolSlot] = {}
+
+    def _shed(self, status_code: int, reason: str, symbol: str) -> AdmissionRejected:
+        self.metrics.inc('webhook_shed_total', {'reason': reason})
+        self.logger.warning(f"Сигнал {symbol} отклонен: {reason}")
+        return AdmissionRejected(status_code, reason)
+
+    def check_capacity(self):
+        """Дешевая проверка до разбора тела запроса"""
+        if self.in_flight >= self.max_in_flight:
+            raise self._shed(503, "overloaded", "*")
+
+    @asynccontextmanager
+    async def admit(self, symbol: str):
+        self.check_capacity()
+
+        slot = self._slots.get(symbol)
+        if slot is None:
+            slot = self._slots[symbol] = _SymbolSlot()
+
+        self.in_flight += 1
+        self.metrics.set('webhook_in_flight', self.in_flight)
+        try:
+            if slot.running:
+                await self._wait_turn(slot, symbol)
+            else:
+                slot.running = True
+
+            try:
+                yield
+            finally:
+                # Передаем очередь ожидающему сигналу, если он есть
+                waiter, slot.waiter = slot.waiter, None
+                if waiter is not None and not waiter.done():
+                    waiter.set_result(None)
+                else:
+                    slot.running = False
+        finally:
+            self.in_flight -= 1
+            self.metrics.set('webhook_in_flight', self.in_flight)
+
+    async def _wait_turn(self, slot: _SymbolSlot, symbol: str):
+        previous = slot.waiter
+        if previous is not None and not previous.done():
+            previous.set_exception(self._shed(429, "superseded", symbol))
+
+        waiter = slot.waiter = asyncio.get_running_loop().create_future()
+        try:
+            await asyncio.wait_for(waiter, timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            if slot.waiter is waiter:
+                slot.waiter = None
+            raise self._shed(503, "queue_timeout", symbol)
@@ -1,16 +1,43 @@
 # src/server/app.py
+import asyncio
+import hmac
+import multiprocessing
 import os
+import signal
+import sys
+import threading
 import time
+from dataclasses import replace
 from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import PlainTextResponse
 import uvicorn
+from uvicorn.supervisors import Multiprocess
 import requests
 from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from src.logger.config import setup_logger
-from src.parser import SignalParser, SignalParserError
-from typing import Union
-from src.trading import ExchangeManager, BybitStrategy, BinanceStrategy
+from src.parser import SignalParser, SignalParserError, TradingSignal, loads
+from src.journal import get_journal, JournalEvent
+from src.metrics import get_metrics
+from src.trading.risk import get_risk_engine
+from src.trading.reconciler import PositionReconciler
+from src.trading.consensus import SignalConsensus, ConsensusConfig
+from src.trading.status import status_snapshot
+from typing import TYPE_CHECKING, Union, Optional, Tuple
+from src.trading import ExchangeManager, PaperStrategy, PaperConfig
+from src.trading.exchange_manager import config_diff
+from src.trading.risk import RiskLimits
 from .watchdog import ServerWatchdog
+from .profile import ServerProfile
+from .admission import AdmissionController, AdmissionRejected
+from .client_ip import get_client_ip
+from .ipc import ExecutorServer, signal_from_dict
+from .profiler import profiler, ProfilerBusy
+from .loop_monitor import LoopLagMonitor
+from .dedup import Delivery, DeliveryIndex, make_signal_id, assign_signal_ids
+
+if TYPE_CHECKING:
+    from src.trading import BybitStrategy, BinanceStrategy
 
 # Загружаем переменные из .env файла
 load_dotenv()
@@ -19,8 +46,12 @@ logger = setup_logger(__name__)
 
 # Глобальные переменные
 exchange_manager: ExchangeManager | None = None
-trading_strategy: Union[BybitStrategy, BinanceStrategy, None] = None
+trading_strategy: Union['BybitStrategy', 'BinanceStrategy', PaperStrategy, None] = None
+shadow_strategy: PaperStrategy | None = None
+reconciler: PositionReconciler | None = None
 watchdog: ServerWatchdog | None = None
+executor_server: ExecutorServer | None = None
+loop_monitor: LoopLagMonitor | None = None
 
 
 def get_server_ip():
@@ -35,16 +66,18 @@ def get_server_ip():
         raise RuntimeError("Ошибка получения внешнего IP сервера")
 
 
-def get_client_ip(request: Request) -> str:
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-
-    real_ip = request.headers.get("X-Real-IP")
-    if real_ip:
-        return real_ip.strip()
+def require_admin(request: Request):
+    """Доступ к служебным эндпоинтам по X-Admin-Token или Authorization: Bearer (ADMIN_TOKEN в .env)"""
+    admin_token = os.getenv("ADMIN_TOKEN")
+    if not admin_token:
+        raise HTTPException(status_code=403, detail="Admin API disabled")
 
-    return request.client.host
+    provided = request.headers.get("X-Admin-Token", "")
+    authorization = request.headers.get("Authorization", "")
+    if not provided and authorization.startswith("Bearer "):
+        provided = authorization[len("Bearer "):]
+    if not hmac.compare_digest(provided, admin_token):
+        raise HTTPException(status_code=403, detail="Forbidden")
 
 
 def validate_configuration():
@@ -78,17 +111,36 @@ def validate_configuration():
         logger.error(str(e))
         logger.error("Проверьте настройки в .env файле")
         logger.error("=" * 60)
-        import sys
         sys.exit(1)
 
 
+def start_order_templates(strategy):
+    templates = getattr(strategy.engine, 'templates', None) if strategy else None
+    if templates is not None:
+        asyncio.create_task(templates.start())
+
+
+def stop_order_templates(strategy):
+    templates = getattr(strategy.engine, 'templates', None) if strategy else None
+    if templates is not None:
+        templates.stop()
+
+
+def shutdown_strategy(strategy):
+    """Освобождает потоки движка замененной стратегии (у paper-движка их нет)"""
+    shutdown = getattr(strategy.engine, 'shutdown', None) if strategy else None
+    if shutdown is not None:
+        shutdown()
+
+
 @asynccontextmanager
 async def lifespan(_app: FastAPI):
-    global exchange_manager, trading_strategy, watchdog
+    global exchange_manager, trading_strategy, shadow_strategy, reconciler, watchdog, executor_server, loop_monitor
 
     logger.info("Сервер успешно запущен")
     server_ip = get_server_ip()
-    logger.info(f"Ваш хук для TradingView: http://{server_ip}/webhook")
+    port = os.getenv("SERVER_PORT", "80")
+    logger.info(f"Ваш хук для TradingView: http://{server_ip}{'' if port == '80' else f':{port}'}/webhook")
 
     # Инициализация менеджера бирж
     try:
@@ -106,10 +158,50 @@ async def lifespan(_app: FastAPI):
         logger.error(f"Ошибка инициализации торговой стратегии: {e}")
         raise RuntimeError(f"Не удалось инициализировать торговую стратегию: {e}")
 
+    # Теневая paper-стратегия (опционально)
+    try:
+        shadow_strategy = exchange_manager.get_shadow_strategy(trading_strategy)
+    except Exception as e:
+        logger.error(f"Ошибка инициализации shadow стратегии: {e}")
+
+    # Сверка позиций с биржей (для paper trading не нужна)
+    if not isinstance(trading_strategy, PaperStrategy):
+        try:
+            reconciler = PositionReconciler(
+                idle_interval=float(os.getenv('RECONCILE_IDLE_INTERVAL', '60')),
+                active_interval=float(os.getenv('RECONCILE_ACTIVE_INTERVAL', '2'))
+            )
+            reconciler.register(trading_strategy.engine)
+            asyncio.create_task(reconciler.start())
+        except Exception as e:
+            logger.error(f"Ошибка запуска сверки позиций: {e}")
+
+    # Шаблоны ордеров: цена, баланс и объем готовятся фоном до прихода сигнала
+    start_order_templates(trading_strategy)
+
+    # Перезагрузка конфигурации по SIGHUP (нет на Windows)
+    try:
+        loop = asyncio.get_running_loop()
+        loop.add_signal_handler(signal.SIGHUP, lambda: asyncio.create_task(reload_configuration("SIGHUP")))
+    except (AttributeError, NotImplementedError, RuntimeError):
+        pass
+
+    # Режим исполнителя: сигналы приходят от воркеров приема по IPC
+    executor_socket = getattr(_app.state, 'executor_socket', None)
+    if executor_socket:
+        executor_server = ExecutorServer(executor_socket, handle_executor_request)
+        await executor_server.start()
+
+    # Задержка event loop в метриках (LOOP_LAG_INTERVAL=0 - выключено)
+    if (lag_interval := float(os.getenv("LOOP_LAG_INTERVAL", "0.5"))) > 0:
+        loop_monitor = LoopLagMonitor(lag_interval)
+        asyncio.create_task(loop_monitor.start())
+
     # Запуск watchdog
     try:
-        watchdog = ServerWatchdog(check_interval=300, max_connections=50)
-        import asyncio
+        # Исполнитель при сбое завершается - его перезапускает родительский процесс
+        watchdog = ServerWatchdog(check_interval=300, max_connections=50, restart_in_place=not executor_socket,
+                                  health_url=getattr(_app.state, 'health_url', ServerWatchdog.DEFAULT_HEALTH_URL))
         asyncio.create_task(watchdog.start())
         logger.info("Watchdog запущен")
     except Exception as e:
@@ -121,10 +213,24 @@ async def lifespan(_app: FastAPI):
     if watchdog:
         watchdog.stop()
 
+    if reconciler:
+        reconciler.stop()
+
+    shutdown_strategy(trading_strategy)
+
+    if loop_monitor:
+        loop_monitor.stop()
+
+    if executor_server:
+        await executor_server.stop()
+
+    # Дописываем накопленные события журнала
+    get_journal().close()
+
 
 app = FastAPI(lifespan=lifespan)
 
-ALLOWED_IPS = {
+DEFAULT_ALLOWED_IPS = {
     "52.89.214.238",
     "34.212.75.30",
     "54.218.53.128",
@@ -132,66 +238,578 @@ ALLOWED_IPS = {
     "5.145.227.179"
 }
 
+
+def load_allowed_ips() -> set:
+    """ALLOWED_IPS из .env (через запятую) заменяет список по умолчанию"""
+    if allowed := os.getenv("ALLOWED_IPS"):
+        return {ip.strip() for ip in allowed.split(",") if ip.strip()}
+    return set(DEFAULT_ALLOWED_IPS)
+
+
+ALLOWED_IPS = load_allowed_ips()
+
 DEVELOPMENT_MODE = os.getenv("DEV_MODE", "false").lower() == "true"
 
+admission = AdmissionController(
+    max_in_flight=int(os.getenv("WEBHOOK_MAX_IN_FLIGHT", "32")),
+    max_wait=float(os.getenv("WEBHOOK_MAX_WAIT", "10"))
+)
+WEBHOOK_MAX_BATCH = int(os.getenv("WEBHOOK_MAX_BATCH", "100"))
+
+# Защита от повторной доставки (ретраи TradingView при таймауте)
+DEDUP_BUCKET = float(os.getenv("DEDUP_BUCKET_SECONDS", "60"))
+deliveries = DeliveryIndex(
+    ttl=float(os.getenv("DEDUP_TTL", "60")),
+    max_entries=int(os.getenv("DEDUP_MAX_ENTRIES", "10000"))
+)
+
+# Консенсус таймфреймов (CONSENSUS_TIMEFRAMES пуст - сигналы идут в стратегию напрямую)
+consensus = SignalConsensus(ConsensusConfig.from_env())
+
+
+_reload_lock = asyncio.Lock()
+
+
+def _needs_new_strategy(manager: ExchangeManager, changed: list) -> bool:
+    # Символ, ключи, testnet и режим paper требуют нового движка (инструмент, сессия)
+    return (
+        manager.configured_symbol() != trading_strategy.engine.symbol
+        or manager.paper_trading != isinstance(trading_strategy, PaperStrategy)
+        or bool({'api_key', 'secret', 'testnet', 'price_file', 'initial_balance'} & set(changed))
+    )
+
+
+async def reload_configuration(source: str) -> dict:
+    """Перечитывает .env и применяет только изменившиеся настройки, не останавливая прием вебхуков"""
+    global ALLOWED_IPS, DEVELOPMENT_MODE, WEBHOOK_MAX_BATCH, DEDUP_BUCKET, trading_strategy, shadow_strategy
+
+    async with _reload_lock:
+        logger.info(f"Перезагрузка конфигурации ({source})")
+        load_dotenv(override=True)
+        applied = []
+
+        try:
+            manager = ExchangeManager()
+            consensus_config = ConsensusConfig.from_env()
+        except ValueError as e:
+            logger.error(f"Новая конфигурация некорректна: {e}")
+            return {"status": "error", "detail": str(e)}
+
+        if exchange_manager is None or trading_strategy is None:
+            return {"status": "error", "detail": "Trading strategy not initialized"}
+
+        if manager.active_exchange != exchange_manager.active_exchange:
+            logger.warning("Смена биржи требует перезапуска сервера")
+            return {"status": "restart_required", "detail": "Active exchange changed"}
+
+        new_config = manager.load_config()
+        changed = config_diff(trading_strategy.config, new_config)
+        rebuild = _needs_new_strategy(manager, changed)
+
+        if rebuild:
+            # Новая стратегия инициализируется в стороне, старая продолжает принимать сигналы
+            old_strategy = trading_strategy
+            new_strategy = await asyncio.to_thread(manager.get_trading_strategy)
+            if new_strategy.engine.symbol == old_strategy.engine.symbol:
+                new_strategy.signal_filter = old_strategy.signal_filter
+
+            if reconciler is not None:
+                reconciler.unregister(old_strategy.engine)
+                if not isinstance(new_strategy, PaperStrategy):
+                    reconciler.register(new_strategy.engine)
+
+            stop_order_templates(old_strategy)
+            start_order_templates(new_strategy)
+            trading_strategy = new_strategy
+            shadow_strategy = await asyncio.to_thread(manager.get_shadow_strategy, new_strategy)
+            exchange_manager.paper_trading = manager.paper_trading
+            exchange_manager.paper_shadow = manager.paper_shadow
+            # Сигналы уже идут в новую стратегию; ордер старой, если он исполняется, завершится
+            shutdown_strategy(old_strategy)
+            applied.append(f"strategy:{new_strategy.engine.symbol}")
+        elif changed:
+            applied.extend(await asyncio.to_thread(trading_strategy.engine.apply_config, new_config))
+            trading_strategy.config = new_config
+            applied.extend(name for name in changed if name not in applied)
+
+        if shadow_strategy is not None and not rebuild:
+            # Теневая стратегия торгует тем же объемом и плечом, что и живая
+            shadow_config = PaperConfig.from_env()
+            if shadow_changed := config_diff(shadow_strategy.config, shadow_config):
+                await asyncio.to_thread(shadow_strategy.engine.apply_config, shadow_config)
+                shadow_strategy.config = shadow_config
+                applied.extend(f"shadow:{name}" for name in shadow_changed)
+
+        ALLOWED_IPS = load_allowed_ips()
+        DEVELOPMENT_MODE = os.getenv("DEV_MODE", "false").lower() == "true"
+        WEBHOOK_MAX_BATCH = int(os.getenv("WEBHOOK_MAX_BATCH", "100"))
+        DEDUP_BUCKET = float(os.getenv("DEDUP_BUCKET_SECONDS", "60"))
+        deliveries.ttl = float(os.getenv("DEDUP_TTL", "60"))
+        consensus.configure(consensus_config)
+        admission.max_in_flight = int(os.getenv("WEBHOOK_MAX_IN_FLIGHT", "32"))
+        admission.max_wait = float(os.getenv("WEBHOOK_MAX_WAIT", "10"))
+        get_risk_engine().update_limits(RiskLimits.from_env())
+
+        logger.info(f"Конфигурация перезагружена: {', '.join(applied) or 'торговые настройки без изменений'}")
+        return {"status": "ok", "applied": applied}
+
+
+def ensure_ip_allowed(client_ip: str):
+    if not DEVELOPMENT_MODE and client_ip not in ALLOWED_IPS:
+        raise HTTPException(status_code=403, detail="Forbidden")
+
+
+def check_client_ip(request: Request) -> str:
+    client_ip = get_client_ip(request)
+    ensure_ip_allowed(client_ip)
+    return client_ip
+
+
+def journal_webhook(client_ip: str, data, batch: bool = False):
+    if batch:
+        get_journal().record(JournalEvent.WEBHOOK, None, {'client_ip': client_ip, 'data': data, 'batch': True})
+    else:
+        get_journal().record(
+            JournalEvent.WEBHOOK,
+            str(data.get('symbol', '')).upper() or None if isinstance(data, dict) else None,
+            {'client_ip': client_ip, 'data': data}
+        )
+
+
+def routable(trading_signal) -> bool:
+    """Есть ли движок для символа сигнала"""
+    return trading_strategy is not None and trading_strategy.engine.symbol == trading_signal.symbol
+
+
+def admission_key(trading_signal) -> str:
+    """Очередь admission control - символ сигнала. Одиночный вебхук исполняется на инструменте движка
+    при любом символе (алерты вида ETHUSDT.P), такой сигнал встает в очередь движка"""
+    if trading_strategy is None or routable(trading_signal):
+        return trading_signal.symbol
+    return trading_strategy.engine.symbol
+
+
+async def process_trading_signal(trading_signal) -> bool:
+    """Исполнение сигнала с admission control; биржевые вызовы уходят из event loop в поток"""
+    if trading_strategy is None:
+        logger.error("Торговая стратегия не инициализирована")
+        raise HTTPException(status_code=500, detail="Trading strategy not initialized")
+
+    # Один сигнал на торгуемый символ одновременно
+    async with admission.admit(admission_key(trading_signal)):
+        success = await asyncio.to_thread(trading_strategy.process_signal, trading_signal)
+
+        if shadow_strategy is not None:
+            await asyncio.to_thread(shadow_strategy.process_signal, trading_signal)
+
+    if profiler.active:
+        profiler.on_signal()
+
+    if success:
+        logger.info(f"Сигнал {trading_signal} успешно обработан")
+    else:
+        logger.warning(f"Сигнал {trading_signal} не был обработан")
+    return success
+
+
+def claim_delivery(trading_signal) -> Tuple[Optional[Delivery], TradingSignal]:
+    """Закрепление доставки до консенсуса и исполнения: (предыдущая доставка или None,
+    сигнал с id ордеров). Повтор отвечается из индекса без обращения к бирже"""
+    if trading_signal.signal_id is None:
+        return None, trading_signal
+
+    delivery, order_id = deliveries.claim(trading_signal.signal_id, trading_signal.symbol)
+    if delivery is not None:
+        get_metrics().inc('webhook_duplicates_total')
+        logger.warning(f"Повторная доставка сигнала {trading_signal} ({trading_signal.signal_id}) - ответ из индекса")
+        return delivery, trading_signal
+    return None, replace(trading_signal, signal_id=order_id)
+
+
+def complete_delivery(trading_signal, processed: Optional[bool]):
+    if trading_signal.signal_id is not None:
+        deliveries.complete(trading_signal.signal_id, processed)
+
+
+def release_delivery(trading_signal):
+    """Сигнал не исполнялся (отказ admission, вытеснен в пакете) - повторная доставка должна пройти"""
+    if trading_signal.signal_id is not None:
+        deliveries.release(trading_signal.signal_id)
+
+
+async def execute_claimed(trading_signal) -> bool:
+    """Исполнение закрепленной доставки; объединенное направление консенсуса фиксируется
+    только после успеха - отказ или сбой оставляют сделку для повтора сигнала"""
+    try:
+        success = await process_trading_signal(trading_signal)
+    except BaseException:
+        release_delivery(trading_signal)
+        raise
+    complete_delivery(trading_signal, success)
+    if success and consensus.enabled:
+        consensus.confirm(trading_signal)
+    return success
+
+
+async def process_once(trading_signal) -> Tuple[Optional[bool], bool]:
+    """Исполнение с защитой от повторной доставки и консенсусом: (processed, duplicate).
+    processed None - голос учтен, объединенное направление не изменилось, сделки нет"""
+    delivery, trading_signal = claim_delivery(trading_signal)
+    if delivery is not None:
+        return delivery.processed, True
+
+    if consensus.enabled:
+        combined = consensus.update(trading_signal)
+        if combined is None:
+            complete_delivery(trading_signal, None)
+            return None, False
+        trading_signal = combined
+
+    return await execute_claimed(trading_signal), False
+
+
+async def execute_signal(trading_signal) -> dict:
+    success, duplicate = await process_once(trading_signal)
+    response = {"status": "ok", "signal": str(trading_signal), "processed": success}
+    if duplicate:
+        response["duplicate"] = True
+    elif success is None and consensus.enabled:
+        response["consensus"] = consensus.state(trading_signal.symbol)
+    return response
+
+
+async def execute_batch(parsed: list) -> dict:
+    """Исполнение разобранного пакета: из нескольких сигналов одного символа - последний,
+    символы параллельно. Сигналы пакета не вытесняют друг друга в admission control.
+    Пакет собирает сигналы многих графиков, поэтому символ без движка не исполняется
+    на чужом инструменте, а получает статус unroutable"""
+    results = [None] * len(parsed)
+    latest = {}
+    for index, item in enumerate(parsed):
+        if isinstance(item, SignalParserError):
+            results[index] = {"index": index, "status": "error", "processed": False, "detail": str(item)}
+            continue
+        if trading_strategy is not None and not routable(item):
+            results[index] = {"index": index, "status": "unroutable", "signal": str(item), "processed": False,
+                              "detail": f"No trading engine for {item.symbol}"}
+            continue
+        delivery, item = claim_delivery(item)
+        if delivery is not None:
+            results[index] = {"index": index, "status": "duplicate", "signal": str(item),
+                              "processed": delivery.processed}
+            continue
+        if consensus.enabled:
+            # Голоса учитываются все и по порядку, до выбора последнего сигнала символа
+            combined = consensus.update(item)
+            if combined is None:
+                complete_delivery(item, None)
+                results[index] = {"index": index, "status": "no_consensus", "signal": str(item), "processed": None}
+                continue
+            item = combined
+        parsed[index] = item
+        key = admission_key(item)
+        if key in latest:
+            previous = latest[key]
+            release_delivery(parsed[previous])
+            results[previous] = {"index": previous, "status": "superseded", "signal": str(parsed[previous]),
+                                 "processed": False}
+        latest[key] = index
+
+    async def run(index: int):
+        trading_signal = parsed[index]
+        try:
+            success = await execute_claimed(trading_signal)
+            results[index] = {"index": index, "status": "ok", "signal": str(trading_signal), "processed": success}
+        except AdmissionRejected as e:
+            results[index] = {"index": index, "status": e.reason, "signal": str(trading_signal),
+                              "processed": False}
+        except Exception as e:
+            logger.error(f"Ошибка обработки сигнала {trading_signal} из пакета: {e}")
+            results[index] = {"index": index, "status": "error", "signal": str(trading_signal),
+                              "processed": False, "detail": str(getattr(e, 'detail', e))}
+
+    await asyncio.gather(*(run(index) for index in latest.values()))
+    return {"status": "ok", "results": results}
+
+
+def ingest_settings() -> dict:
+    """Настройки разбора в воркерах приема: идут в каждом ответе IPC, перезагрузка применяется и там"""
+    return {'max_batch': WEBHOOK_MAX_BATCH, 'dedup_bucket': DEDUP_BUCKET}
+
+
+async def handle_executor_request(message: dict) -> dict:
+    """Запрос воркера приема по IPC. Воркер уже разобрал сигнал; IP, журнал и исполнение - здесь,
+    чтобы список IP и лимиты перезагружались в одном месте"""
+    response = await _handle_executor_request(message)
+    response['settings'] = ingest_settings()
+    return response
+
+
+async def _handle_executor_request(message: dict) -> dict:
+    op = message.get('op')
+    if op == 'health':
+        return {"status_code": 200, "body": health_payload()}
+
+    try:
+        client_ip = message['client_ip']
+        ensure_ip_allowed(client_ip)
+        admission.check_capacity()
+
+        if op == 'signal':
+            journal_webhook(client_ip, message['data'])
+            trading_signal = signal_from_dict(message['signal'])
+            logger.info(f"Получен вебхук от {client_ip}: {trading_signal}")
+            return {"status_code": 200, "body": await execute_signal(trading_signal)}
+
+        if op == 'batch':
+            journal_webhook(client_ip, message['data'], batch=True)
+            parsed = [signal_from_dict(item) if isinstance(item, dict) else SignalParserError(item)
+                      for item in message['signals']]
+            logger.info(f"Получен пакет вебхуков от {client_ip}: {len(parsed)} сигналов")
+            return {"status_code": 200, "body": await execute_batch(parsed)}
+
+        return {"status_code": 400, "body": {"detail": f"Unknown operation: {op}"}}
+
+    except AdmissionRejected as e:
+        return {"status_code": e.status_code, "body": {"detail": e.reason}}
+    except HTTPException as e:
+        return {"status_code": e.status_code, "body": {"detail": e.detail}}
+
 
 @app.post("/webhook")
 async def webhook_handler(request: Request):
+    received_at = time.time()
     try:
-        client_ip = get_client_ip(request)
-
-        if not DEVELOPMENT_MODE and client_ip not in ALLOWED_IPS:
-            raise HTTPException(status_code=403, detail="Forbidden")
+        client_ip = check_client_ip(request)
+        admission.check_capacity()
 
-        data = await request.json()
-        logger.info(f"Получен вебхук от {client_ip}: {data}")
+        data = loads(await request.body())
+        journal_webhook(client_ip, data)
 
-        # Парсинг сигнала
+        # Парсинг сигнала (исходный payload пишется в журнал, в лог - только разобранный сигнал)
         trading_signal = SignalParser.parse(data)
+        trading_signal.signal_id = make_signal_id(data, received_at, DEDUP_BUCKET)
+        logger.info(f"Получен вебхук от {client_ip}: {trading_signal}")
 
         # Обработка сигнала торговой стратегией
-        if trading_strategy is None:
-            logger.error("Торговая стратегия не инициализирована")
-            raise HTTPException(status_code=500, detail="Trading strategy not initialized")
-
-        success = trading_strategy.process_signal(trading_signal)
-
-        if success:
-            logger.info(f"Сигнал {trading_signal} успешно обработан")
-            return {"status": "ok", "signal": str(trading_signal), "processed": True}
-        else:
-            logger.warning(f"Сигнал {trading_signal} не был обработан")
-            return {"status": "ok", "signal": str(trading_signal), "processed": False}
+        return await execute_signal(trading_signal)
 
     except SignalParserError as e:
         logger.error(f"Ошибка парсинга: {e}")
         raise HTTPException(status_code=400, detail=str(e))
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Ошибка в webhook_handler: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@app.get("/health")
-async def health_check():
-    """Health check эндпоинт для watchdog"""
+@app.post("/webhook/batch")
+async def webhook_batch_handler(request: Request):
+    """Пакет сигналов: [{symbol, signal}, ...] или {"signals": [...]}.
+    Разные символы обрабатываются параллельно, из нескольких сигналов одного символа исполняется последний.
+    Сигналы по символам без движка не исполняются (status unroutable)"""
+    received_at = time.time()
+    try:
+        client_ip = check_client_ip(request)
+        admission.check_capacity()
+
+        data = loads(await request.body())
+        items = data.get('signals') if isinstance(data, dict) else data
+        if isinstance(items, list) and len(items) > WEBHOOK_MAX_BATCH:
+            raise HTTPException(status_code=413, detail=f"Batch too large (max {WEBHOOK_MAX_BATCH})")
+
+        logger.info(f"Получен пакет вебхуков от {client_ip}: {len(items) if isinstance(items, list) else 0} сигналов")
+        journal_webhook(client_ip, data, batch=True)
+
+        parsed = SignalParser.parse_batch(items)
+        assign_signal_ids(parsed, items, received_at, DEDUP_BUCKET)
+
+    except SignalParserError as e:
+        logger.error(f"Ошибка парсинга пакета: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+    except AdmissionRejected as e:
+        raise HTTPException(status_code=e.status_code, detail=e.reason)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Ошибка в webhook_batch_handler: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+    return await execute_batch(parsed)
+
+
+def health_payload() -> dict:
     return {
         "status": "ok",
         "timestamp": time.time(),
         "trading_active": trading_strategy is not None,
+        "paper_trading": isinstance(trading_strategy, PaperStrategy),
+        "shadow_active": shadow_strategy is not None,
+        "webhooks_in_flight": admission.in_flight,
         "watchdog_active": watchdog is not None and watchdog.is_running,
         "active_exchange": exchange_manager.active_exchange.value if exchange_manager else None
     }
 
 
+@app.get("/health")
+async def health_check():
+    """Health check эндпоинт для watchdog"""
+    return health_payload()
+
+
+@app.get("/status")
+async def status(request: Request):
+    """Позиция, баланс, последний сигнал и ордер по символам - из памяти, без запросов к бирже"""
+    require_admin(request)
+    return status_snapshot((trading_strategy, shadow_strategy))
+
+
+@app.get("/journal")
+def journal_query(request: Request, symbol: Optional[str] = None, since: Optional[float] = None,
+                  until: Optional[float] = None, event: Optional[str] = None, limit: int = 1000):
+    """Выборка из журнала сделок (выполняется в пуле потоков, event loop не блокируется)"""
+    require_admin(request)
+    journal = get_journal()
+    return {
+        "events": journal.query(symbol=symbol, since=since, until=until, event=event, limit=min(limit, 10000)),
+        "stats": journal.stats
+    }
+
+
+@app.post("/admin/reload")
+async def admin_reload(request: Request):
+    require_admin(request)
+    result = await reload_configuration("admin")
+    if result["status"] == "error":
+        raise HTTPException(status_code=400, detail=result["detail"])
+    return result
+
+
+@app.post("/admin/profile")
+async def admin_profile(request: Request, mode: str = "cpu", seconds: float = 10, signals: int = 0,
+                        interval_ms: float = 5, top: int = 30):
+    """Профилирование на лету: seconds секунд или signals сигналов.
+    cpu - folded stacks для flame graph (flamegraph.pl, speedscope), memory - рост памяти по tracemalloc"""
+    require_admin(request)
+    try:
+        if mode == "cpu":
+            result = await profiler.profile_cpu(seconds, signals, max(interval_ms, 1) / 1000)
+            return PlainTextResponse(result['folded'], headers={
+                "X-Profile-Samples": str(result['samples']),
+                "X-Profile-Duration": f"{result['duration']:.3f}"
+            })
+        if mode == "memory":
+            return await profiler.profile_memory(seconds, signals, top)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    raise HTTPException(status_code=400, detail="mode must be cpu or memory")
+
+
+@app.get("/metrics")
+async def metrics(request: Request):
+    require_admin(request)
+    return PlainTextResponse(get_metrics().render_prometheus())
+
+
+@app.get("/reconciler")
+async def reconciler_state(request: Request, symbol: Optional[str] = None):
+    require_admin(request)
+    if reconciler is None:
+        return {"active": False, "checks": 0, "drift_events": []}
+    return {
+        "active": reconciler.is_running,
+        "checks": reconciler.checks,
+        "drift_events": reconciler.drift_events(symbol.upper() if symbol else None)
+    }
+
+
+@app.get("/risk")
+async def risk_state(request: Request):
+    require_admin(request)
+    return get_risk_engine().snapshot()
+
+
+@app.post("/risk/kill-switch")
+async def risk_kill_switch(request: Request, enabled: bool = True):
+    """Мгновенная остановка открытия новых позиций (закрытие остается доступным)"""
+    require_admin(request)
+    get_risk_engine().set_kill_switch(enabled)
+    return {"status": "ok", "kill_switch": enabled}
+
+
+def serve(target, profile: ServerProfile, workers: int = 1):
+    """uvicorn.run, но слушающий сокет создает профиль (TCP-опции)"""
+    config = uvicorn.Config(target, workers=workers, **profile.uvicorn_options())
+    server = uvicorn.Server(config)
+    sock = profile.bind_socket()
+    if workers > 1:
+        Multiprocess(config, target=server.run, sockets=[sock]).run()
+    else:
+        server.run(sockets=[sock])
+
+
+def run_executor(socket_path: str, port: int):
+    """Процесс-исполнитель: биржевые сессии и состояние стратегий. Служебные эндпоинты - на localhost"""
+    app.state.executor_socket = socket_path
+    profile = replace(ServerProfile.from_env(), host="127.0.0.1", port=port)
+    app.state.health_url = profile.local_url("/health")
+    serve(app, profile)
+
+
+def _supervise_executor(socket_path: str, port: int, stopping: threading.Event):
+    # spawn: исполнитель перезапускается из потока, fork многопоточного процесса небезопасен
+    context = multiprocessing.get_context("spawn")
+    while not stopping.is_set():
+        process = context.Process(target=run_executor, args=(socket_path, port), name="executor")
+        process.start()
+        logger.info(f"Исполнитель запущен (pid {process.pid})")
+        while process.is_alive() and not stopping.is_set():
+            process.join(timeout=1)
+
+        if process.is_alive():
+            process.terminate()
+            process.join(timeout=10)
+        elif not stopping.is_set():
+            logger.error(f"Исполнитель завершился с кодом {process.exitcode}, перезапуск через 5 секунд")
+            stopping.wait(5)
+
+
 def start_server():
     logger.info("Запуск сервера")
 
     # Проверяем конфигурацию ДО запуска FastAPI
     validate_configuration()
 
-    uvicorn.run(
-        app,
-        host="0.0.0.0",
-        port=80,
-        log_level="error"
-    )
\ No newline at end of file
+    try:
+        profile = ServerProfile.from_env()
+    except ValueError as e:
+        logger.error(str(e))
+        sys.exit(1)
+    logger.info(f"HTTP сервер: {profile.describe()}")
+    if profile.low_latency and (profile.loop, profile.http) != ("uvloop", "httptools"):
+        logger.warning("uvloop/httptools не установлены - low_latency работает на asyncio/h11")
+
+    workers = int(os.getenv("WEBHOOK_WORKERS", "1"))
+    if workers <= 1:
+        app.state.health_url = profile.local_url("/health")
+        serve(app, profile)
+        return
+
+    # Несколько воркеров приема (без состояния) + один процесс-исполнитель за Unix сокетом
+    socket_path = os.environ.setdefault("EXECUTOR_SOCKET", "data/executor.sock")
+    executor_port = int(os.getenv("EXECUTOR_PORT", "8081"))
+    logger.info(f"Воркеров приема: {workers}, исполнитель: {socket_path}, служебный API: 127.0.0.1:{executor_port}")
+
+    stopping = threading.Event()
+    supervisor = threading.Thread(
+        target=_supervise_executor, args=(socket_path, executor_port, stopping), name="executor-supervisor"
+    )
+    supervisor.start()
+    try:
+        serve("src.server.ingest:app", profile, workers=workers)
+    finally:
+        stopping.set()
+        supervisor.join()
\ No newline at end of file
@@ -0,0 +1,93 @@
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from src.parser import TradingSignal, dumps
+
+
+def make_signal_id(payload: Any, received_at: float, bucket: float = 60) -> str:
+    """Детерминированный id доставки: хеш payload + номер интервала приема.
+
+    Повтор той же доставки (ретрай TradingView) дает тот же id; id укладывается
+    в лимиты orderLinkId/newClientOrderId (36 символов) вместе с суффиксами ног.
+    """
+    digest = hashlib.blake2b(dumps(payload), digest_size=8).hexdigest()
+    return f"{digest}-{int(received_at // bucket)}"
+
+
+def assign_signal_ids(parsed: List[Any], items: List[Any], received_at: float, bucket: float = 60):
+    """id доставки для каждого разобранного сигнала пакета (ошибки разбора пропускаются)"""
+    for signal, item in zip(parsed, items):
+        if isinstance(signal, TradingSignal):
+            signal.signal_id = make_signal_id(item, received_at, bucket)
+
+
+@dataclass
+class Delivery:
+    received_at: float
+    processed: Optional[bool] = None  # None - сигнал еще исполняется
+
+
+class DeliveryIndex:
+    """Ограниченный индекс доставок с TTL для защиты от повторной доставки.
+
+    Ключ - хеш payload без номера интервала, поэтому ретрай на границе интервала
+    тоже распознается. TTL держим коротким (порядка интервала): одинаковый payload
+    позже - уже новый сигнал. Повтором считается только доставка подряд: другой
+    сигнал по символу вытесняет его прежние записи (алерты MACD одинаковы, и
+    long -> short -> long - три сделки). Работает в event loop, блокировки не нужны.
+    """
+
+    def __init__(self, ttl: float = 60, max_entries: int = 10000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Delivery]" = OrderedDict()
+        self._latest: Dict[str, str] = {}
+        # Сколько раз payload уже исполнялся: повторному сигналу - новый id ордеров
+        self._occurrences: "OrderedDict[str, int]" = OrderedDict()
+
+    @staticmethod
+    def _key(signal_id: str) -> str:
+        return signal_id.partition('-')[0]
+
+    def _expire(self, now: float):
+        while self._entries:
+            key, delivery = next(iter(self._entries.items()))
+            if now - delivery.received_at < self.ttl and len(self._entries) <= self.max_entries:
+                break
+            del self._entries[key]
+
+    def claim(self, signal_id: str, symbol: str) -> Tuple[Optional[Delivery], str]:
+        """(None, id ордеров) - доставка новая и закреплена за вызывающим;
+        иначе (запись о предыдущей доставке, signal_id)"""
+        now = time.time()
+        self._expire(now)
+
+        key = self._key(signal_id)
+        if (delivery := self._entries.get(key)) is not None:
+            return delivery, signal_id
+
+        previous = self._latest.get(symbol)
+        if previous is not None and previous != key:
+            self._entries.pop(previous, None)
+        self._latest[symbol] = key
+        self._entries[key] = Delivery(received_at=now)
+
+        # Тот же payload в том же интервале дал бы тот же orderLinkId - биржа отклонила бы ордер
+        occurrence = self._occurrences.pop(key, 0)
+        self._occurrences[key] = occurrence + 1
+        if len(self._occurrences) > self.max_entries:
+            self._occurrences.popitem(last=False)
+        return None, f"{signal_id}r{occurrence}" if occurrence else signal_id
+
+    def complete(self, signal_id: str, processed: bool):
+        if (delivery := self._entries.get(self._key(signal_id))) is not None:
+            delivery.processed = processed
+
+    def release(self, signal_id: str):
+        """Сигнал не исполнялся (отказ admission) - повторная доставка должна пройти"""
+        self._entries.pop(self._key(signal_id), None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
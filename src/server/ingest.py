@@ -0,0 +1,92 @@
+# src/server/ingest.py
+"""Воркер приема вебхуков (WEBHOOK_WORKERS > 1).
+
+Без торгового состояния: декодирует и разбирает сигналы и передает их
+процессу-исполнителю по Unix сокету. Воркеров можно запускать сколько угодно.
+Лимит пакета и интервал дедупликации приходят от исполнителя в каждом ответе:
+перезагрузка конфигурации (SIGHUP, /admin/reload) применяется и в воркерах.
+"""
+import os
+import time
+from typing import Optional
+from fastapi import FastAPI, Request, HTTPException
+from fastapi.responses import JSONResponse
+from dotenv import load_dotenv
+from src.logger.config import setup_logger
+from src.parser import SignalParser, SignalParserError, loads
+from .client_ip import get_client_ip
+from .dedup import make_signal_id, assign_signal_ids
+from .ipc import ExecutorClient, ExecutorUnavailable, signal_to_dict
+
+load_dotenv()
+
+logger = setup_logger(__name__)
+
+WEBHOOK_MAX_BATCH = int(os.getenv("WEBHOOK_MAX_BATCH", "100"))
+DEDUP_BUCKET = float(os.getenv("DEDUP_BUCKET_SECONDS", "60"))
+
+executor = ExecutorClient(
+    os.getenv("EXECUTOR_SOCKET", "data/executor.sock"),
+    timeout=float(os.getenv("EXECUTOR_TIMEOUT", "30"))
+)
+
+app = FastAPI(title="TradingView Webhook Ingest")
+
+
+def apply_settings(settings: Optional[dict]):
+    global WEBHOOK_MAX_BATCH, DEDUP_BUCKET
+    if settings:
+        WEBHOOK_MAX_BATCH = settings['max_batch']
+        DEDUP_BUCKET = settings['dedup_bucket']
+
+
+async def forward(message: dict) -> JSONResponse:
+    try:
+        response = await executor.request(message)
+    except ExecutorUnavailable as e:
+        logger.error(f"{e}")
+        raise HTTPException(status_code=503, detail="executor_unavailable")
+    apply_settings(response.get('settings'))
+    return JSONResponse(response['body'], status_code=response['status_code'])
+
+
+@app.post("/webhook")
+async def webhook_handler(request: Request):
+    received_at = time.time()
+    client_ip = get_client_ip(request)
+    try:
+        data = loads(await request.body())
+        trading_signal = SignalParser.parse(data)
+        trading_signal.signal_id = make_signal_id(data, received_at, DEDUP_BUCKET)
+    except SignalParserError as e:
+        logger.error(f"Ошибка парсинга вебхука от {client_ip}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return await forward({'op': 'signal', 'client_ip': client_ip, 'data': data,
+                          'signal': signal_to_dict(trading_signal)})
+
+
+@app.post("/webhook/batch")
+async def webhook_batch_handler(request: Request):
+    received_at = time.time()
+    client_ip = get_client_ip(request)
+    try:
+        data = loads(await request.body())
+        items = data.get('signals') if isinstance(data, dict) else data
+        if isinstance(items, list) and len(items) > WEBHOOK_MAX_BATCH:
+            raise HTTPException(status_code=413, detail=f"Batch too large (max {WEBHOOK_MAX_BATCH})")
+        parsed = SignalParser.parse_batch(items)
+        assign_signal_ids(parsed, items, received_at, DEDUP_BUCKET)
+    except SignalParserError as e:
+        logger.error(f"Ошибка парсинга пакета от {client_ip}: {e}")
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Ошибки разбора отдельных сигналов передаются текстом - исполнитель вернет их в результатах
+    signals = [str(item) if isinstance(item, SignalParserError) else signal_to_dict(item) for item in parsed]
+    return await forward({'op': 'batch', 'client_ip': client_ip, 'data': data, 'signals': signals})
+
+
+@app.get("/health")
+async def health_check():
+    """Health check всей цепочки: воркер приема -> исполнитель"""
+    return await forward({'op': 'health'})
@@ -0,0 +1,171 @@
+import asyncio
+import itertools
+import os
+import struct
+from typing import Any, Awaitable, Callable, Dict, Optional
+from src.logger.config import setup_logger
+from src.parser import TradingSignal, SignalType, loads, dumps
+
+# Кадр: 4 байта длины (big-endian) + JSON
+_HEADER = struct.Struct('>I')
+MAX_FRAME = 4 * 1024 * 1024
+
+
+def encode_frame(message: Dict[str, Any]) -> bytes:
+    payload = dumps(message)
+    return _HEADER.pack(len(payload)) + payload
+
+
+async def read_frame(reader: asyncio.StreamReader) -> Dict[str, Any]:
+    header = await reader.readexactly(_HEADER.size)
+    (length,) = _HEADER.unpack(header)
+    if length > MAX_FRAME:
+        raise ConnectionError(f"Слишком большой кадр IPC: {length} байт")
+    return loads(await reader.readexactly(length))
+
+
+def signal_to_dict(signal: TradingSignal) -> Dict[str, Any]:
+    return {'symbol': signal.symbol, 'signal': signal.signal.value, 'timeframe': signal.timeframe,
+            'signal_id': signal.signal_id}
+
+
+def signal_from_dict(data: Dict[str, Any]) -> TradingSignal:
+    return TradingSignal(symbol=data['symbol'], signal=SignalType(data['signal']), timeframe=data.get('timeframe'),
+                         signal_id=data.get('signal_id'))
+
+
+class ExecutorServer:
+    """Сервер IPC в процессе-исполнителе: принимает разобранные сигналы от воркеров приема.
+
+    Запросы одного соединения запускаются задачами в порядке поступления, ответы
+    сопоставляются по id; порядок исполнения по символу обеспечивает admission control.
+    """
+
+    def __init__(self, path: str, handler: Callable[[Dict[str, Any]], Awaitable[Dict[str, Any]]]):
+        self.logger = setup_logger(__name__)
+        self.path = path
+        self.handler = handler
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._writers = set()
+        self._tasks = set()
+
+    async def start(self):
+        if os.path.dirname(self.path):
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        if os.path.exists(self.path):
+            os.unlink(self.path)  # сокет от предыдущего запуска
+
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+        self.logger.info(f"IPC исполнителя слушает {self.path}")
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            # Открытые соединения воркеров server.close() не закрывает
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        write_lock = asyncio.Lock()
+        self._writers.add(writer)
+        try:
+            while True:
+                message = await read_frame(reader)
+                task = asyncio.create_task(self._respond(message, writer, write_lock))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        except Exception as e:
+            self.logger.error(f"Ошибка соединения IPC: {e}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def _respond(self, message: Dict[str, Any], writer: asyncio.StreamWriter, write_lock: asyncio.Lock):
+        try:
+            response = await self.handler(message)
+        except Exception as e:
+            self.logger.error(f"Ошибка обработки запроса IPC {message.get('op')}: {e}")
+            response = {'status_code': 500, 'body': {'detail': str(e)}}
+
+        response['id'] = message.get('id')
+        try:
+            async with write_lock:
+                writer.write(encode_frame(response))
+                await writer.drain()
+        except ConnectionError:
+            self.logger.warning(f"Воркер отключился до ответа на {message.get('op')}")
+
+
+class ExecutorUnavailable(Exception):
+    pass
+
+
+class ExecutorClient:
+    """Клиент IPC в воркере приема: одно соединение на процесс, переподключение по требованию"""
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        self.logger = setup_logger(__name__)
+        self.path = path
+        self.timeout = timeout
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._pending: Dict[int, asyncio.Future] = {}
+        self._ids = itertools.count()
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def _ensure_connected(self) -> asyncio.StreamWriter:
+        if self._writer is not None and not self._writer.is_closing():
+            return self._writer
+
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self._writer is None or self._writer.is_closing():
+                try:
+                    reader, self._writer = await asyncio.open_unix_connection(self.path)
+                except OSError as e:
+                    raise ExecutorUnavailable(f"Исполнитель недоступен: {e}")
+                self._reader_task = asyncio.create_task(self._read_responses(reader, self._writer))
+        return self._writer
+
+    async def _read_responses(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                response = await read_frame(reader)
+                future = self._pending.get(response.pop('id', None))
+                if future is not None and not future.done():
+                    future.set_result(response)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            self.logger.warning("Соединение с исполнителем закрыто")
+        except Exception as e:
+            self.logger.error(f"Ошибка чтения ответа исполнителя: {e}")
+        finally:
+            writer.close()
+            if self._writer is writer:
+                self._writer = None
+            for future in self._pending.values():
+                if not future.done():
+                    future.set_exception(ExecutorUnavailable("Соединение с исполнителем потеряно"))
+
+    async def request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Отправка запроса исполнителю; ответ {'status_code': int, 'body': dict}"""
+        writer = await self._ensure_connected()
+        request_id = next(self._ids)
+        future = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = future
+        try:
+            writer.write(encode_frame({**message, 'id': request_id}))
+            await writer.drain()
+            return await asyncio.wait_for(future, timeout=self.timeout)
+        except ConnectionError as e:
+            raise ExecutorUnavailable(f"Исполнитель недоступен: {e}")
+        except asyncio.TimeoutError:
+            raise ExecutorUnavailable("Таймаут ответа исполнителя")
+        finally:
+            self._pending.pop(request_id, None)
@@ -0,0 +1,33 @@
+import asyncio
+import time
+from src.logger.config import setup_logger
+from src.metrics import get_metrics
+
+
+class LoopLagMonitor:
+    """Задержка event loop: насколько позже запланированного просыпается sleep(interval).
+
+    Рост задержки - блокирующий код в loop или нехватка CPU; значения идут в метрики
+    event_loop_lag_seconds (сводка) и event_loop_lag_last_seconds (последнее).
+    """
+
+    def __init__(self, interval: float = 0.5):
+        self.logger = setup_logger(__name__)
+        self.metrics = get_metrics()
+        self.interval = interval
+        self.is_running = False
+
+    async def start(self):
+        if self.is_running:
+            return
+
+        self.is_running = True
+        while self.is_running:
+            started = time.perf_counter()
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.perf_counter() - started - self.interval)
+            self.metrics.observe('event_loop_lag_seconds', lag)
+            self.metrics.set('event_loop_lag_last_seconds', lag)
+
+    def stop(self):
+        self.is_running = False
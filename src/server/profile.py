@@ -0,0 +1,97 @@
+import importlib.util
+import os
+import socket
+from dataclasses import dataclass
+from typing import Any, Dict
+from src.logger.config import setup_logger
+
+logger = setup_logger(__name__)
+
+PROFILES = ("default", "low_latency")
+
+
+def _installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+@dataclass
+class ServerProfile:
+    """Настройки HTTP-сервера приема вебхуков.
+
+    default - поведение uvicorn по умолчанию. low_latency - uvloop и httptools
+    (если установлены, иначе asyncio/h11), длинный keep-alive, без заголовков
+    Server/Date и с TCP-опциями слушающего сокета.
+    """
+    name: str = "default"
+    host: str = "0.0.0.0"
+    port: int = 80
+    backlog: int = 2048
+    keep_alive: int = 5
+
+    @classmethod
+    def from_env(cls) -> 'ServerProfile':
+        name = os.getenv('SERVER_PROFILE', 'default').lower()
+        if name not in PROFILES:
+            raise ValueError(f"SERVER_PROFILE: неизвестный профиль {name}. Поддерживаются: {', '.join(PROFILES)}")
+
+        low_latency = name == "low_latency"
+        return cls(
+            name=name,
+            host=os.getenv('SERVER_HOST', '0.0.0.0'),
+            port=int(os.getenv('SERVER_PORT', '80')),
+            backlog=int(os.getenv('SERVER_BACKLOG', '4096' if low_latency else '2048')),
+            keep_alive=int(os.getenv('SERVER_KEEP_ALIVE', '75' if low_latency else '5'))
+        )
+
+    @property
+    def low_latency(self) -> bool:
+        return self.name == "low_latency"
+
+    @property
+    def loop(self) -> str:
+        return "uvloop" if self.low_latency and _installed("uvloop") else "asyncio"
+
+    @property
+    def http(self) -> str:
+        return "httptools" if self.low_latency and _installed("httptools") else "h11"
+
+    def local_url(self, path: str) -> str:
+        """URL сервера для проверок с этой же машины (watchdog)"""
+        host = {"0.0.0.0": "127.0.0.1", "": "127.0.0.1", "::": "[::1]"}.get(self.host, self.host)
+        if ":" in host and not host.startswith("["):
+            host = f"[{host}]"
+        return f"http://{host}:{self.port}{path}"
+
+    def uvicorn_options(self) -> Dict[str, Any]:
+        options = dict(
+            host=self.host,
+            port=self.port,
+            backlog=self.backlog,
+            timeout_keep_alive=self.keep_alive,
+            log_level="error"
+        )
+        if self.low_latency:
+            options.update(loop=self.loop, http=self.http, access_log=False, server_header=False, date_header=False)
+        return options
+
+    def bind_socket(self) -> socket.socket:
+        """Слушающий сокет; сервер вызывает listen(backlog) сам"""
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+
+        if self.low_latency:
+            # Принятые соединения наследуют опции слушающего сокета (Linux)
+            # (asyncio ставит TCP_NODELAY сам только для сокетов с proto=IPPROTO_TCP, а uvicorn
+            # создает proto=0 - без этого ответ из двух write ждет delayed ACK клиента ~40 мс)
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            if hasattr(socket, "TCP_FASTOPEN"):
+                sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_FASTOPEN, 256)
+
+        sock.bind((self.host, self.port))
+        sock.set_inheritable(True)
+        return sock
+
+    def describe(self) -> str:
+        return (f"профиль {self.name}: {self.host}:{self.port}, loop={self.loop}, http={self.http}, "
+                f"backlog={self.backlog}, keep-alive={self.keep_alive} сек")
@@ -0,0 +1,143 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, Optional
+from src.logger.config import setup_logger
+
+
+class ProfilerBusy(Exception):
+    pass
+
+
+class SamplingProfiler:
+    """Семплирующий профайлер: поток раз в interval снимает стеки всех потоков.
+
+    Результат - folded stacks ("поток;внешняя;...;внутренняя N"), формат
+    flamegraph.pl и speedscope. Пока профайлер не запущен, потока нет.
+    """
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self._stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> str:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return "\n".join(f"{stack} {count}" for stack, count in self._stacks.most_common())
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)))
+                self._stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+
+class Profiler:
+    """Профилирование по запросу: CPU (семплирование) или память (tracemalloc).
+
+    Сессия длится seconds секунд либо до signals обработанных сигналов (seconds
+    тогда ограничивает ожидание). Одновременно работает одна сессия.
+    """
+
+    MAX_SECONDS = 300
+
+    def __init__(self):
+        self.logger = setup_logger(__name__)
+        self._done: Optional[asyncio.Event] = None
+        self._signals_left = 0
+
+    @property
+    def active(self) -> bool:
+        return self._done is not None
+
+    def on_signal(self):
+        """Вызывается после обработки сигнала (в event loop)"""
+        if self._done is not None and self._signals_left > 0:
+            self._signals_left -= 1
+            if self._signals_left == 0:
+                self._done.set()
+
+    async def _wait(self, seconds: float, signals: int):
+        self._signals_left = signals
+        try:
+            await asyncio.wait_for(self._done.wait(), timeout=min(seconds, self.MAX_SECONDS))
+        except asyncio.TimeoutError:
+            pass
+
+    def _begin(self, kind: str, seconds: float, signals: int):
+        if self._done is not None:
+            raise ProfilerBusy("Профилирование уже запущено")
+        self._done = asyncio.Event()
+        self.logger.warning(
+            f"Профилирование {kind}: {f'{signals} сигналов, не дольше ' if signals else ''}{seconds} сек")
+
+    async def profile_cpu(self, seconds: float = 10, signals: int = 0, interval: float = 0.005) -> Dict[str, Any]:
+        self._begin("CPU", seconds, signals)
+        sampler = SamplingProfiler(interval)
+        started = time.monotonic()
+        sampler.start()
+        try:
+            await self._wait(seconds, signals)
+        finally:
+            folded = sampler.stop()
+            self._done = None
+        return {'folded': folded, 'samples': sampler.samples, 'duration': time.monotonic() - started}
+
+    async def profile_memory(self, seconds: float = 10, signals: int = 0, top: int = 30) -> Dict[str, Any]:
+        self._begin("памяти", seconds, signals)
+        # Если tracemalloc включен снаружи (PYTHONTRACEMALLOC), не выключаем его
+        was_tracing = tracemalloc.is_tracing()
+        if not was_tracing:
+            tracemalloc.start(25)
+        started = time.monotonic()
+        try:
+            before = tracemalloc.take_snapshot()
+            await self._wait(seconds, signals)
+            after = tracemalloc.take_snapshot()
+            current, peak = tracemalloc.get_traced_memory()
+        finally:
+            if not was_tracing:
+                tracemalloc.stop()
+            self._done = None
+
+        filters = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap>")]
+        diff = after.filter_traces(filters).compare_to(before.filter_traces(filters), 'lineno')
+        return {
+            'duration': time.monotonic() - started,
+            'traced_current_kb': round(current / 1024, 1),
+            'traced_peak_kb': round(peak / 1024, 1),
+            'growth': [
+                {
+                    'location': f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}",
+                    'size_diff_kb': round(stat.size_diff / 1024, 2),
+                    'count_diff': stat.count_diff,
+                    'size_kb': round(stat.size / 1024, 2)
+                }
+                for stat in diff[:top]
+            ]
+        }
+
+
+profiler = Profiler()
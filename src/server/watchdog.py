@@ -8,11 +8,16 @@ from src.logger.config import setup_logger
 
 
 class ServerWatchdog:
-    def __init__(self, check_interval: int = 300, max_connections: int = 100):
+    DEFAULT_HEALTH_URL = "http://127.0.0.1:80/health"
+
+    def __init__(self, check_interval: int = 300, max_connections: int = 100, restart_in_place: bool = True,
+                 health_url: str = DEFAULT_HEALTH_URL):
         self.logger = setup_logger(__name__)
         self.check_interval = check_interval
         self.max_connections = max_connections
-        self.health_url = "http://127.0.0.1:80/health"
+        # False - при сбое процесс завершается, перезапуск делает родитель (режим исполнителя)
+        self.restart_in_place = restart_in_place
+        self.health_url = health_url
         self.consecutive_failures = 0
         self.max_failures = 3
         self.is_running = False
@@ -106,6 +111,10 @@ class ServerWatchdog:
         # Даем время для записи логов
         await asyncio.sleep(5)
 
+        if not self.restart_in_place:
+            self.logger.error("Завершение процесса для перезапуска родителем")
+            os._exit(1)
+
         # Принудительный перезапуск процесса
         try:
             # Получаем текущие аргументы запуска
@@ -1,11 +1,35 @@
 # src/trading/__init__.py
-from .bybit import BybitStrategy, BybitEngine, BybitConfig
-from .binance import BinanceStrategy, BinanceEngine, BinanceConfig
+import importlib
+from .bybit import BybitConfig
+from .binance import BinanceConfig
+from .paper import PaperStrategy, PaperEngine, PaperConfig
 from .signal_filter import SignalFilter
+from .engine import ExchangeEngine
+from .strategy import TradingStrategy
+from .consensus import SignalConsensus, ConsensusConfig, ConsensusRule
 from .exchange_manager import ExchangeManager
+from .algos import ExecutionAlgo, MarketAlgo, MakerFirstAlgo, register_algo
+
+# Адаптеры бирж загружаются по требованию: SDK активной биржи, а не обоих сразу
+_LAZY = {
+    'BybitStrategy': '.bybit', 'BybitEngine': '.bybit',
+    'BinanceStrategy': '.binance', 'BinanceEngine': '.binance',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = [
     'BybitStrategy', 'BybitEngine', 'BybitConfig',
     'BinanceStrategy', 'BinanceEngine', 'BinanceConfig',
-    'SignalFilter', 'ExchangeManager'
-]
\ No newline at end of file
+    'PaperStrategy', 'PaperEngine', 'PaperConfig',
+    'SignalFilter', 'ExchangeManager', 'ExchangeEngine', 'TradingStrategy',
+    'SignalConsensus', 'ConsensusConfig', 'ConsensusRule',
+    'ExecutionAlgo', 'MarketAlgo', 'MakerFirstAlgo', 'register_algo'
+]
@@ -0,0 +1,268 @@
+import time
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Any, Dict, Optional, Tuple
+from .execution import ExecutionReport, OrderResult, split_quantity
+from src.logger.config import setup_logger
+
+
+class ExecutionAlgo(ABC):
+    """Алгоритм исполнения ордера движка (под open_position/close_position).
+
+    Наследник реализует _execute; run() добавляет общий учет: задержку исполнения,
+    улучшение цены и объем по ликвидности (maker/taker) в метриках.
+    """
+
+    name = ""
+
+    @classmethod
+    def from_config(cls, config) -> 'ExecutionAlgo':
+        return cls()
+
+    def run(self, engine, side: str, quantity: float, reduce_only: bool = False,
+            client_id: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> ExecutionReport:
+        started = time.perf_counter()
+        report = self._execute(engine, side, quantity, reduce_only, client_id, extra)
+        report.algo = self.name
+
+        if report.avg_price and report.arrival_price:
+            direction = 1 if side == engine.BUY else -1
+            report.price_improvement_bps = round(
+                direction * (report.arrival_price - report.avg_price) / report.arrival_price * 10000, 3)
+
+        labels = {'symbol': engine.symbol, 'algo': self.name}
+        if report.filled_qty > 0:
+            engine.metrics.observe('execution_fill_seconds', time.perf_counter() - started, labels)
+            taker_qty = report.filled_qty - report.maker_qty
+            if report.maker_qty > 0:
+                engine.metrics.inc('execution_filled_qty_total', {'symbol': engine.symbol, 'liquidity': 'maker'},
+                                   report.maker_qty)
+            if taker_qty > 0:
+                engine.metrics.inc('execution_filled_qty_total', {'symbol': engine.symbol, 'liquidity': 'taker'},
+                                   taker_qty)
+        if report.price_improvement_bps is not None:
+            engine.metrics.observe('execution_price_improvement_bps', report.price_improvement_bps, labels)
+        return report
+
+    @abstractmethod
+    def _execute(self, engine, side: str, quantity: float, reduce_only: bool,
+                 client_id: Optional[str], extra: Optional[Dict[str, Any]]) -> ExecutionReport:
+        raise NotImplementedError
+
+
+class MarketAlgo(ExecutionAlgo):
+    """Маркет-ордер (с нарезкой исполнителя) - поведение по умолчанию"""
+
+    name = "market"
+
+    def _execute(self, engine, side, quantity, reduce_only, client_id, extra) -> ExecutionReport:
+        return engine.executor.execute(side, quantity, reduce_only=reduce_only, client_id=client_id, extra=extra)
+
+
+class MakerFirstAlgo(ExecutionAlgo):
+    """Post-only лимитка по лучшей цене своей стороны, перевыставление за стаканом,
+    остаток - маркетом по истечении deadline_ms.
+
+    Стакан и состояние ордера читаются параллельно раз в reprice_ms. Цена прихода -
+    лучшая встречная цена на старте: ее заплатил бы маркет-ордер. Если итог снятой
+    лимитки не прочитать, исполненное восстанавливается по позиции биржи; если и она
+    недоступна, остаток маркетом не отправляется (отчет - частичное исполнение).
+    """
+
+    name = "maker_first"
+    # Попыток прочитать итог снятого ордера (новый ордер может еще не дойти до чтения)
+    READ_ATTEMPTS = 3
+
+    def __init__(self, deadline_ms: int = 1000, reprice_ms: int = 100):
+        self.logger = setup_logger(__name__)
+        self.deadline = deadline_ms / 1000
+        self.reprice = reprice_ms / 1000
+
+    @classmethod
+    def from_config(cls, config) -> 'MakerFirstAlgo':
+        return cls(deadline_ms=config.maker_deadline_ms, reprice_ms=config.maker_reprice_ms)
+
+    def _execute(self, engine, side, quantity, reduce_only, client_id, extra) -> ExecutionReport:
+        spec = engine.spec
+        if len(split_quantity(spec, quantity)) > 1:
+            # Объем больше лимита биржи нарезается и уходит маркетом
+            return engine.executor.execute(side, quantity, reduce_only=reduce_only, client_id=client_id, extra=extra)
+
+        is_buy = side == engine.BUY
+        direction = 1 if is_buy else -1
+        # Позиция до исполнения (со знаком): reduce-only закрывает ее целиком, открытие - от учтенной
+        start_position = -direction * quantity if reduce_only else self._signed(engine.current_position)
+        deadline = time.perf_counter() + self.deadline
+        bid, ask = engine._fetch_book_top()
+        report = ExecutionReport(requested=quantity, arrival_price=ask if is_buy else bid)
+
+        maker_filled, notional = Decimal(0), Decimal(0)
+        order_id, price, posts = None, None, 0
+        last_order_id = None
+        # Последнее прочитанное исполнение рабочего ордера: (объем, средняя цена)
+        known = (0.0, 0.0)
+
+        def settle(filled: float, avg_price: float):
+            nonlocal maker_filled, notional
+            maker_filled += Decimal(str(filled))
+            notional += Decimal(str(filled)) * Decimal(str(avg_price))
+
+        def finish(working_id: str) -> bool:
+            """Снятие рабочей лимитки и учет ее исполнения; False - исполнение неизвестно"""
+            outcome = self._cancel(engine, working_id)
+            if outcome is None:
+                outcome = self._fill_from_position(engine, start_position, direction, float(maker_filled),
+                                                   order_qty, known, price)
+            if outcome is None:
+                # Исполнение сверх прочитанного неизвестно: учитывается только подтвержденное биржей
+                settle(*known)
+                return False
+            settle(*outcome)
+            return True
+
+        unknown = False
+        while time.perf_counter() < deadline:
+            remaining = spec.round_quantity(quantity - float(maker_filled), floor=True)
+            if remaining < float(spec.min_qty):
+                break
+
+            if order_id is None:
+                price = bid if is_buy else ask
+                engine.executor.throttle()
+                result = engine._place_limit_order(side, remaining, price, reduce_only,
+                                                   f"{client_id}p{posts}" if client_id else None, extra)
+                posts += 1
+                if result.ok:
+                    order_id, last_order_id, order_qty = result.order_id, result.order_id, remaining
+                    known = (0.0, 0.0)
+                else:
+                    # Post-only отклонен (цена пересекла спред) - следующая попытка по новому стакану
+                    self.logger.info(f"{engine.symbol}: post-only по {price} отклонен: {result.error}")
+
+            time.sleep(min(self.reprice, max(0.0, deadline - time.perf_counter())))
+            book = engine._reads.submit(engine._fetch_book_top)
+            if order_id is not None:
+                try:
+                    state, filled, avg_price = engine._fetch_order(order_id)
+                except Exception as e:
+                    # Разовый сбой чтения не повод бросать ордер: итог снятия покажет финальное чтение
+                    self.logger.warning(f"{engine.symbol}: не удалось прочитать ордер {order_id}: {e}")
+                    state, filled, avg_price = 'open', *known
+                known = (filled, avg_price)
+                if state != 'open':
+                    # Исполнен или снят биржей (post-only при пересечении); исполненная часть учитывается
+                    settle(filled, avg_price)
+                    order_id = None
+            try:
+                bid, ask = book.result()
+            except Exception as e:
+                self.logger.warning(f"{engine.symbol}: не удалось прочитать стакан: {e}")
+
+            best = bid if is_buy else ask
+            if order_id is not None and best != price:
+                try:
+                    engine.executor.throttle()
+                    engine._amend_order(order_id, side, order_qty, best)
+                    price = best
+                except Exception as e:
+                    self.logger.info(f"{engine.symbol}: перевыставление по {best} не удалось: {e}")
+                    unknown = not finish(order_id)
+                    order_id = None
+                    if unknown:
+                        break
+
+        if order_id is not None:
+            unknown = not finish(order_id)
+
+        report.maker_qty = float(maker_filled)
+        if maker_filled > 0:
+            report.children.append(OrderResult(quantity=report.maker_qty, ok=True, order_id=last_order_id))
+
+        remaining = spec.round_quantity(quantity - report.maker_qty, floor=True)
+        if unknown:
+            # Маркет по догадке мог бы превысить позицию; расхождение исправит сверка позиций
+            self.logger.error(f"{engine.symbol}: исполнение лимитки {last_order_id} неизвестно, "
+                              f"остаток {remaining} маркетом не отправлен")
+            report.children.append(OrderResult(quantity=remaining, ok=False, order_id=last_order_id,
+                                               error="Исполнение лимитного ордера неизвестно"))
+        elif remaining >= float(spec.min_qty):
+            self.logger.info(f"{engine.symbol}: за {self.deadline * 1000:.0f} мс исполнено лимиткой "
+                             f"{report.maker_qty} из {quantity}, остаток {remaining} - маркетом")
+            # Цена маркет-части неизвестна без запроса сделок - оценка по лучшей встречной цене,
+            # прочитанной одновременно с отправкой (последний опрос мог отстать на reprice_ms)
+            book = engine._reads.submit(engine._fetch_book_top)
+            market = engine.executor.execute(side, remaining, reduce_only=reduce_only,
+                                             client_id=f"{client_id}m" if client_id else None, extra=extra)
+            report.children.extend(market.children)
+            try:
+                bid, ask = book.result()
+            except Exception as e:
+                self.logger.warning(f"{engine.symbol}: не удалось прочитать стакан для оценки маркет-части: {e}")
+            notional += Decimal(str(market.filled_qty)) * Decimal(str(ask if is_buy else bid))
+
+        if report.filled_qty > 0:
+            report.avg_price = float(notional / Decimal(str(report.filled_qty)))
+        return report
+
+    def _cancel(self, engine, order_id: str) -> Optional[Tuple[float, float]]:
+        """Снятие лимитки; исполненное до снятия - по повторному чтению ордера (None - не прочитано)"""
+        try:
+            engine.executor.throttle()
+            engine._cancel_order(order_id)
+        except Exception:
+            # Ордер уже исполнен или снят - итог покажет чтение
+            pass
+
+        for attempt in range(self.READ_ATTEMPTS):
+            try:
+                _, filled, avg_price = engine._fetch_order(order_id)
+                return filled, avg_price
+            except Exception as e:
+                self.logger.warning(f"{engine.symbol}: итог ордера {order_id} не прочитан: {e}")
+                if attempt + 1 < self.READ_ATTEMPTS:
+                    time.sleep(self.reprice)
+        return None
+
+    def _fill_from_position(self, engine, start_position: float, direction: int, settled: float, order_qty: float,
+                            known: Tuple[float, float], price: float) -> Optional[Tuple[float, float]]:
+        """Исполнение снятой лимитки по изменению позиции биржи с начала исполнения.
+        Сверх последнего прочитанного исполнения - по цене лимитки"""
+        try:
+            position = engine._fetch_position()
+        except Exception as e:
+            self.logger.error(f"{engine.symbol}: не удалось прочитать позицию: {e}")
+            return None
+
+        moved = Decimal(str(self._signed(position))) - Decimal(str(start_position))
+        filled = min(max(moved * direction - Decimal(str(settled)), Decimal(0)), Decimal(str(order_qty)))
+        if filled == 0:
+            return 0.0, 0.0
+        known_filled = min(Decimal(str(known[0])), filled)
+        notional = known_filled * Decimal(str(known[1])) + (filled - known_filled) * Decimal(str(price))
+        self.logger.warning(f"{engine.symbol}: исполнение лимитки {filled} восстановлено по позиции")
+        return float(filled), float(notional / filled)
+
+    @staticmethod
+    def _signed(position: Optional[Dict[str, Any]]) -> float:
+        if not position:
+            return 0.0
+        return position['size'] if position['side'] == "Buy" else -position['size']
+
+
+# Алгоритмы по имени EXECUTION_ALGO
+_ALGOS: Dict[str, type] = {
+    MarketAlgo.name: MarketAlgo,
+    MakerFirstAlgo.name: MakerFirstAlgo,
+}
+
+
+def register_algo(name: str, algo: type):
+    """Регистрация алгоритма исполнения (наследник ExecutionAlgo) под именем EXECUTION_ALGO"""
+    _ALGOS[name] = algo
+
+
+def build_algo(config) -> ExecutionAlgo:
+    name = config.execution_algo
+    if name not in _ALGOS:
+        raise ValueError(f"EXECUTION_ALGO: неизвестный алгоритм {name}. Поддерживаются: {', '.join(_ALGOS)}")
+    return _ALGOS[name].from_config(config)
@@ -1,6 +1,17 @@
 # src/trading/binance/__init__.py
-from .strategy import BinanceStrategy
-from .engine import BinanceEngine
+import importlib
 from .config import BinanceConfig
 
-__all__ = ['BinanceStrategy', 'BinanceEngine', 'BinanceConfig']
\ No newline at end of file
+# Стратегия и движок тянут python-binance - импортируются при первом обращении
+_LAZY = {'BinanceStrategy': '.strategy', 'BinanceEngine': '.engine'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['BinanceStrategy', 'BinanceEngine', 'BinanceConfig']
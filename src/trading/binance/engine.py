@@ -1,17 +1,31 @@
 # src/trading/binance/engine.py
+import time
 from binance.client import Client
 from binance.exceptions import BinanceAPIException
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
 from .config import BinanceConfig
-from src.logger.config import setup_logger
+from ..engine import ExchangeEngine
+from ..instrument import InstrumentSpec
+from ..execution import OrderResult
 
 
-class BinanceEngine:
+class BinanceEngine(ExchangeEngine):
+    """Адаптер Binance USDⓈ-M Futures поверх python-binance Client"""
+
+    account = "binance"
+    BUY = "BUY"
+    SELL = "SELL"
+    CLIENT_ID_FIELD = "newClientOrderId"
+    WORKING_TYPE = {'mark': "MARK_PRICE", 'last': "CONTRACT_PRICE"}
+    OPEN_STATUSES = ("NEW", "PARTIALLY_FILLED")
+
     def __init__(self, config: BinanceConfig, symbol: str):
-        self.config = config
-        self.symbol = symbol
-        self.logger = setup_logger(__name__)
+        # clientOrderId защитных ордеров, выставленных этим движком: снимаются только они,
+        # ручные ордера пользователя по символу не трогаются
+        self._protection_ids: List[str] = []
+        super().__init__(config, symbol)
 
+    def _connect(self):
         self.client = Client(
             api_key=self.config.api_key,
             api_secret=self.config.secret,
@@ -22,50 +36,12 @@ class BinanceEngine:
         if self.config.testnet:
             self.client.FUTURES_URL = 'https://testnet.binancefuture.com/fapi'
 
-        self.current_position = None
-        self.qty_step = None
-        self.qty_precision = None
-        self.price_precision = None
-        self.min_qty = None
-        self.tick_size = None
-
-        self._initialize()
-
-    def _initialize(self):
-        self._get_symbol_info()
-        self._setup_leverage()
-
-    def _get_symbol_info(self):
-        try:
-            exchange_info = self.client.futures_exchange_info()
-
-            symbol_info = None
-            for symbol in exchange_info['symbols']:
-                if symbol['symbol'] == self.symbol:
-                    symbol_info = symbol
-                    break
-
-            if not symbol_info:
-                raise RuntimeError(f"Символ {self.symbol} не найден")
-
-            # Получаем precision из основной информации о символе
-            self.qty_precision = symbol_info.get('quantityPrecision', 3)
-            self.price_precision = symbol_info.get('pricePrecision', 2)
-
-            # Проходим по фильтрам
-            for filter_item in symbol_info['filters']:
-                if filter_item['filterType'] == 'LOT_SIZE':
-                    self.qty_step = float(filter_item['stepSize'])
-                    self.min_qty = float(filter_item['minQty'])
-                elif filter_item['filterType'] == 'PRICE_FILTER':
-                    self.tick_size = float(filter_item['tickSize'])
-
-            self.logger.info(
-                f"Параметры {self.symbol}: QtyStep={self.qty_step}, MinQty={self.min_qty}, TickSize={self.tick_size}")
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения информации о символе: {e}")
-            raise
+    def _load_instrument(self) -> InstrumentSpec:
+        for symbol_info in self.client.futures_exchange_info()['symbols']:
+            if symbol_info['symbol'] == self.symbol:
+                # Округляем по stepSize/tickSize фильтров, а не по quantityPrecision
+                return InstrumentSpec.from_binance(symbol_info)
+        raise RuntimeError(f"Символ {self.symbol} не найден")
 
     def _setup_leverage(self):
         try:
@@ -79,144 +55,134 @@ class BinanceEngine:
             if e.code == -4028:
                 self.logger.info(f"Плечо уже установлено {self.config.leverage}x для {self.symbol}")
             else:
-                self.logger.error(f"Ошибка установки плеча: {e}")
-        except Exception as e:
-            self.logger.error(f"Ошибка установки плеча: {e}")
-
-    def _round_quantity(self, quantity: float) -> float:
-        if self.qty_precision is None:
-            return round(quantity, 3)
-
-        rounded_qty = round(quantity, self.qty_precision)
-
-        if rounded_qty < self.min_qty:
-            rounded_qty = self.min_qty
-
-        return rounded_qty
-
-    def _round_price(self, price: float) -> float:
-        if self.price_precision is None:
-            return round(price, 2)
-
-        return round(price, self.price_precision)
-
-    def get_account_balance(self) -> float:
-        try:
-            account = self.client.futures_account()
-
-            for asset in account['assets']:
-                if asset['asset'] == 'USDT':
-                    return float(asset['walletBalance'])
-            return 0
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения баланса: {e}")
-            return 0
-
-    def get_current_position(self) -> Optional[Dict[str, Any]]:
-        try:
-            positions = self.client.futures_position_information(symbol=self.symbol)
-
-            if positions:
-                position = positions[0]
-                size = abs(float(position['positionAmt']))
-
-                if size > 0:
-                    side = "Buy" if float(position['positionAmt']) > 0 else "Sell"
-                    return {
-                        'side': side,
-                        'size': size,
-                        'entry_price': float(position['entryPrice']),
-                        'unrealized_pnl': float(position['unRealizedProfit'])
-                    }
-            return None
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения позиции: {e}")
-            return None
-
-    def get_current_price(self) -> float:
-        try:
-            ticker = self.client.futures_symbol_ticker(symbol=self.symbol)
-            return float(ticker['price'])
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения цены: {e}")
-            return 0
-
-    def _calculate_quantity(self, price: float) -> float:
-        total_value = self.config.position_size * self.config.leverage
-        raw_quantity = total_value / price
-        rounded_quantity = self._round_quantity(raw_quantity)
-
-        self.logger.info(f"Расчет: {total_value} USDT / {price} = {rounded_quantity} {self.symbol}")
-        return rounded_quantity
-
-    def close_position(self) -> bool:
-        position = self.get_current_position()
-        if not position:
-            return True
-
-        try:
-            opposite_side = "SELL" if position['side'] == "Buy" else "BUY"
-            rounded_size = self._round_quantity(position['size'])
-
-            self.client.futures_create_order(
-                symbol=self.symbol,
-                side=opposite_side,
-                type='MARKET',
-                quantity=rounded_size,
-                reduceOnly=True
-            )
-
-            self.logger.info(f"Закрыта {position['side']} позиция, PnL: {position['unrealized_pnl']} USDT")
-            self.current_position = None
-            return True
-
+                self._fail(f"Ошибка установки плеча: {e}")
         except Exception as e:
-            self.logger.error(f"Ошибка закрытия позиции: {e}")
-            return False
-
-    def open_position(self, side: str) -> bool:
-        current_price = self.get_current_price()
-        if current_price == 0:
-            self.logger.error("Не удалось получить текущую цену")
-            return False
-
-        quantity = self._calculate_quantity(current_price)
-        balance = self.get_account_balance()
-
-        if balance < self.config.position_size:
-            self.logger.error(f"Недостаточно средств. Требуется: {self.config.position_size}, доступно: {balance}")
-            return False
-
-        if quantity < self.min_qty:
-            self.logger.error(f"Количество {quantity} меньше минимального {self.min_qty}")
-            return False
-
-        try:
-            self.client.futures_create_order(
-                symbol=self.symbol,
-                side=side,
-                type='MARKET',
-                quantity=quantity
-            )
-
-            direction = "Long" if side == "BUY" else "Short"
-            self.logger.info(f"Открыта {direction} позиция: {self.config.position_size} USDT по {current_price}")
-            self.current_position = {
-                'side': "Buy" if side == "BUY" else "Sell",
-                'size': quantity,
-                'entry_price': current_price
+            self._fail(f"Ошибка установки плеча: {e}")
+
+    def _fetch_price(self) -> float:
+        return float(self.client.futures_symbol_ticker(symbol=self.symbol)['price'])
+
+    def _fetch_balance(self) -> float:
+        for asset in self.client.futures_account()['assets']:
+            if asset['asset'] == 'USDT':
+                return float(asset['walletBalance'])
+        return 0
+
+    @staticmethod
+    def _parse_position(position: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        amount = float(position['positionAmt'])
+        if amount != 0:
+            return {
+                'side': "Buy" if amount > 0 else "Sell",
+                'size': abs(amount),
+                'entry_price': float(position['entryPrice']),
+                'unrealized_pnl': float(position['unRealizedProfit'])
             }
-            return True
-
-        except Exception as e:
-            self.logger.error(f"Ошибка открытия позиции: {e}")
-            return False
-
-    def open_long(self) -> bool:
-        return self.open_position("BUY")
+        return None
+
+    def _fetch_position(self) -> Optional[Dict[str, Any]]:
+        positions = self.client.futures_position_information(symbol=self.symbol)
+        return self._parse_position(positions[0]) if positions else None
+
+    def _fetch_positions(self) -> Dict[str, Dict[str, Any]]:
+        positions = {}
+        for raw in self.client.futures_position_information():
+            if position := self._parse_position(raw):
+                positions[raw['symbol']] = position
+        return positions
+
+    def _order_params(self, side: str, quantity: float, reduce_only: bool) -> Dict[str, Any]:
+        order_params = dict(
+            symbol=self.symbol,
+            side=side,
+            type='MARKET',
+            quantity=self.spec.format_quantity(quantity)
+        )
+        if reduce_only:
+            order_params['reduceOnly'] = True
+        return order_params
+
+    def _send_order(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.client.futures_create_order(**params)
+
+    def _order_result(self, response: Dict[str, Any], quantity: float) -> OrderResult:
+        return OrderResult(quantity=quantity, ok=True, order_id=str(response.get('orderId')))
+
+    def _fetch_book_top(self) -> Tuple[float, float]:
+        ticker = self.client.futures_orderbook_ticker(symbol=self.symbol)
+        return float(ticker['bidPrice']), float(ticker['askPrice'])
+
+    def _limit_order_params(self, side: str, quantity: float, price: float, reduce_only: bool) -> Dict[str, Any]:
+        # GTX - post-only: ордер, который исполнился бы как taker, биржа отклоняет
+        order_params = dict(
+            symbol=self.symbol,
+            side=side,
+            type='LIMIT',
+            timeInForce='GTX',
+            quantity=self.spec.format_quantity(quantity),
+            price=self.spec.format_price(price)
+        )
+        if reduce_only:
+            order_params['reduceOnly'] = True
+        return order_params
+
+    def _amend_order(self, order_id: str, side: str, quantity: float, price: float):
+        # Binance требует сторону и исходный объем; GTX сохраняется
+        self.client.futures_modify_order(symbol=self.symbol, orderId=order_id, side=side,
+                                         quantity=self.spec.format_quantity(quantity),
+                                         price=self.spec.format_price(price))
+
+    def _cancel_order(self, order_id: str):
+        self.client.futures_cancel_order(symbol=self.symbol, orderId=order_id)
+
+    def _fetch_order(self, order_id: str) -> Tuple[str, float, float]:
+        order = self.client.futures_get_order(symbol=self.symbol, orderId=order_id)
+        status = order['status']
+        state = 'open' if status in self.OPEN_STATUSES else 'filled' if status == "FILLED" else 'closed'
+        return state, float(order['executedQty']), float(order['avgPrice'] or 0)
+
+    def _send_protection(self, side: str, quantity: float, price: float) -> Optional[List[Dict[str, Any]]]:
+        # Ордер входа Binance не принимает SL/TP: условные ордера одним пакетным запросом после исполнения
+        is_long = side == self.BUY
+        exit_side = self.SELL if is_long else self.BUY
+        working_type = self.WORKING_TYPE[self.protection.trigger]
+        orders = []
+
+        if (stop_loss := self.protection.stop_loss(is_long, price)) is not None:
+            orders.append(dict(symbol=self.symbol, side=exit_side, type='STOP_MARKET', closePosition='true',
+                               stopPrice=self.spec.format_price(self.spec.round_price(stop_loss)),
+                               workingType=working_type))
+        if (take_profit := self.protection.take_profit(is_long, price)) is not None:
+            orders.append(dict(symbol=self.symbol, side=exit_side, type='TAKE_PROFIT_MARKET', closePosition='true',
+                               stopPrice=self.spec.format_price(self.spec.round_price(take_profit)),
+                               workingType=working_type))
+        if self.protection.trailing_stop_pct:
+            # callbackRate Binance: 0.1-10 %, шаг 0.1
+            callback_rate = min(max(round(self.protection.trailing_stop_pct, 1), 0.1), 10.0)
+            orders.append(dict(symbol=self.symbol, side=exit_side, type='TRAILING_STOP_MARKET', reduceOnly='true',
+                               quantity=self.spec.format_quantity(quantity), callbackRate=str(callback_rate),
+                               workingType=working_type))
+
+        if not orders:
+            return None
 
-    def open_short(self) -> bool:
-        return self.open_position("SELL")
\ No newline at end of file
+        # Условные ордера прошлой позиции обычно сняты при закрытии; если снятие не удалось - снимаем здесь
+        self._clear_protection()
+        prefix = f"prot{int(time.time() * 1000)}"
+        for index, order in enumerate(orders):
+            order[self.CLIENT_ID_FIELD] = f"{prefix}-{index}"
+        responses = self.client.futures_place_batch_order(batchOrders=orders)
+        self._protection_ids = [order[self.CLIENT_ID_FIELD] for order, response in zip(orders, responses)
+                                if 'orderId' in response]
+        if errors := [response.get('msg', str(response)) for response in responses if 'orderId' not in response]:
+            raise RuntimeError('; '.join(errors))
+        return responses
+
+    def _clear_protection(self):
+        # closePosition STOP/TP и reduce-only трейлинг переживают закрытие позиции ордером.
+        # Без своих защитных ордеров (защита выключена) запроса нет
+        if not self._protection_ids:
+            return
+        # Уже сработавшие ордера биржа вернет как неизвестные - это не ошибка
+        self.client.futures_cancel_orders(symbol=self.symbol, origclientorderidlist=self._protection_ids)
+        self._protection_ids = []
@@ -1,6 +1,17 @@
 # src/trading/bybit/__init__.py
-from .strategy import BybitStrategy
-from .engine import BybitEngine
+import importlib
 from .config import BybitConfig
 
-__all__ = ['BybitStrategy', 'BybitEngine', 'BybitConfig']
\ No newline at end of file
+# Стратегия и движок тянут pybit - импортируются при первом обращении
+_LAZY = {'BybitStrategy': '.strategy', 'BybitEngine': '.engine'}
+
+
+def __getattr__(name):
+    if name in _LAZY:
+        value = getattr(importlib.import_module(_LAZY[name], __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+__all__ = ['BybitStrategy', 'BybitEngine', 'BybitConfig']
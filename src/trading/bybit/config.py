@@ -9,6 +9,13 @@ class BybitConfig:
     testnet: bool
     position_size: float
     leverage: int
+    order_rate_limit: float = 10.0
+    order_concurrency: int = 5
+    order_templates: bool = False
+    template_interval: float = 1.0
+    execution_algo: str = "market"
+    maker_deadline_ms: int = 1000
+    maker_reprice_ms: int = 100
 
     @classmethod
     def from_env(cls) -> 'BybitConfig':
@@ -21,11 +28,25 @@ class BybitConfig:
         testnet = os.getenv('BYBIT_TESTNET', 'false').lower() == 'true'
         position_size = float(os.getenv('POSITION_SIZE', '100'))
         leverage = int(os.getenv('LEVERAGE', '10'))
+        order_rate_limit = float(os.getenv('ORDER_RATE_LIMIT', '10'))
+        order_concurrency = int(os.getenv('ORDER_CONCURRENCY', '5'))
+        order_templates = os.getenv('ORDER_TEMPLATES', 'false').lower() == 'true'
+        template_interval = float(os.getenv('ORDER_TEMPLATE_INTERVAL', '1'))
+        execution_algo = os.getenv('EXECUTION_ALGO', 'market').lower()
+        maker_deadline_ms = int(os.getenv('MAKER_DEADLINE_MS', '1000'))
+        maker_reprice_ms = int(os.getenv('MAKER_REPRICE_MS', '100'))
 
         return cls(
             api_key=api_key,
             secret=secret,
             testnet=testnet,
             position_size=position_size,
-            leverage=leverage
+            leverage=leverage,
+            order_rate_limit=order_rate_limit,
+            order_concurrency=order_concurrency,
+            order_templates=order_templates,
+            template_interval=template_interval,
+            execution_algo=execution_algo,
+            maker_deadline_ms=maker_deadline_ms,
+            maker_reprice_ms=maker_reprice_ms
         )
\ No newline at end of file
@@ -1,60 +1,47 @@
 # src/trading/bybit/engine.py
 from pybit.unified_trading import HTTP
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from .config import BybitConfig
-from src.logger.config import setup_logger
+from ..engine import ExchangeEngine
+from ..instrument import InstrumentSpec
+from ..execution import OrderResult
 
 
-class BybitEngine:
+class BybitEngine(ExchangeEngine):
+    """Адаптер Bybit v5 (linear) поверх pybit HTTP"""
+
+    account = "bybit"
+    BUY = "Buy"
+    SELL = "Sell"
+    CLIENT_ID_FIELD = "orderLinkId"
+    TRIGGER_BY = {'mark': "MarkPrice", 'last': "LastPrice"}
+    OPEN_STATUSES = ("New", "PartiallyFilled", "Untriggered", "Created")
+    # Уточняется по инструменту (settleCoin)
+    settle_coin = "USDT"
+
     def __init__(self, config: BybitConfig, symbol: str):
-        self.config = config
-        self.symbol = symbol
-        self.logger = setup_logger(__name__)
+        super().__init__(config, symbol)
 
+    def _connect(self):
         self.session = HTTP(
             testnet=self.config.testnet,
             api_key=self.config.api_key,
             api_secret=self.config.secret
         )
 
-        self.current_position = None
-        self.qty_step = None
-        self.min_order_qty = None
-        self.max_order_qty = None
-        self.tick_size = None
-
-        self._initialize()
-
-    def _initialize(self):
-        self._get_instrument_info()
-        self._setup_leverage()
-
-    def _get_instrument_info(self):
-        try:
-            response = self.session.get_instruments_info(
-                category="linear",
-                symbol=self.symbol
-            )
-
-            if response['retCode'] == 0 and response['result']['list']:
-                instrument = response['result']['list'][0]
+    @staticmethod
+    def _result(response: Dict[str, Any]) -> Dict[str, Any]:
+        if response['retCode'] != 0:
+            raise RuntimeError(response.get('retMsg', 'Unknown error'))
+        return response['result']
 
-                lot_size_filter = instrument['lotSizeFilter']
-                self.qty_step = float(lot_size_filter['qtyStep'])
-                self.min_order_qty = float(lot_size_filter['minOrderQty'])
-                self.max_order_qty = float(lot_size_filter['maxOrderQty'])
-
-                price_filter = instrument['priceFilter']
-                self.tick_size = float(price_filter['tickSize'])
-                self.logger.info(
-                    f"Параметры {self.symbol}: QtyStep={self.qty_step}, MinQty={self.min_order_qty}, TickSize={self.tick_size}")
-            else:
-                raise RuntimeError(
-                    f"Не удалось получить информацию об инструменте {self.symbol}: {response.get('retMsg', 'Unknown error')}")
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения информации об инструменте: {e}")
-            raise
+    def _load_instrument(self) -> InstrumentSpec:
+        instruments = self._result(self.session.get_instruments_info(category="linear", symbol=self.symbol))['list']
+        if not instruments:
+            raise RuntimeError(f"Не удалось получить информацию об инструменте {self.symbol}")
+        # Позиции запрашиваются по расчетной монете: USDT и USDC контракты - разные списки
+        self.settle_coin = instruments[0].get('settleCoin', self.settle_coin)
+        return InstrumentSpec.from_bybit(instruments[0])
 
     def _setup_leverage(self):
         try:
@@ -70,173 +57,135 @@ class BybitEngine:
             elif response.get('retCode') == 110043:
                 self.logger.info(f"Плечо уже установлено {self.config.leverage}x для {self.symbol}")
             else:
-                self.logger.error(f"Не удалось установить плечо: {response['retMsg']}")
+                self._fail(f"Не удалось установить плечо: {response['retMsg']}")
 
         except Exception as e:
             if "110043" in str(e):
                 self.logger.info(f"Плечо уже установлено {self.config.leverage}x для {self.symbol}")
             else:
-                self.logger.error(f"Ошибка установки плеча: {e}")
-
-    def _round_quantity(self, quantity: float) -> float:
-        if self.qty_step is None:
-            return round(quantity, 3)
-
-        precision = len(str(self.qty_step).split('.')[-1]) if '.' in str(self.qty_step) else 0
-        rounded_qty = round(quantity / self.qty_step) * self.qty_step
-        rounded_qty = round(rounded_qty, precision)
-
-        if rounded_qty < self.min_order_qty:
-            rounded_qty = self.min_order_qty
-        elif rounded_qty > self.max_order_qty:
-            rounded_qty = self.max_order_qty
-
-        return rounded_qty
-
-    def _round_price(self, price: float) -> float:
-        if self.tick_size is None:
-            return round(price, 2)
-
-        precision = len(str(self.tick_size).split('.')[-1]) if '.' in str(self.tick_size) else 0
-        rounded_price = round(price / self.tick_size) * self.tick_size
-        return round(rounded_price, precision)
-
-    def get_account_balance(self) -> float:
-        try:
-            response = self.session.get_wallet_balance(accountType="UNIFIED")
-
-            if response['retCode'] == 0:
-                for coin in response['result']['list'][0]['coin']:
-                    if coin['coin'] == 'USDT':
-                        return float(coin['walletBalance'])
-            return 0
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения баланса: {e}")
-            return 0
-
-    def get_current_position(self) -> Optional[Dict[str, Any]]:
-        try:
-            response = self.session.get_positions(
-                category="linear",
-                symbol=self.symbol
-            )
-
-            if response['retCode'] == 0 and response['result']['list']:
-                position = response['result']['list'][0]
-                size = float(position['size'])
-
-                if size > 0:
-                    return {
-                        'side': position['side'],
-                        'size': size,
-                        'entry_price': float(position['avgPrice']),
-                        'unrealized_pnl': float(position['unrealisedPnl'])
-                    }
-            return None
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения позиции: {e}")
+                self._fail(f"Ошибка установки плеча: {e}")
+
+    def _fetch_price(self) -> float:
+        tickers = self._result(self.session.get_tickers(category="linear", symbol=self.symbol))['list']
+        return float(tickers[0]['lastPrice']) if tickers else 0
+
+    def _fetch_balance(self) -> float:
+        for coin in self._result(self.session.get_wallet_balance(accountType="UNIFIED"))['list'][0]['coin']:
+            if coin['coin'] == 'USDT':
+                return float(coin['walletBalance'])
+        return 0
+
+    @staticmethod
+    def _parse_position(position: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        size = float(position['size'])
+        if size > 0:
+            return {
+                'side': position['side'],
+                'size': size,
+                'entry_price': float(position['avgPrice']),
+                'unrealized_pnl': float(position['unrealisedPnl'])
+            }
+        return None
+
+    def _fetch_position(self) -> Optional[Dict[str, Any]]:
+        positions = self._result(self.session.get_positions(category="linear", symbol=self.symbol))['list']
+        return self._parse_position(positions[0]) if positions else None
+
+    @property
+    def positions_scope(self) -> Optional[str]:
+        return self.settle_coin
+
+    def _fetch_positions(self) -> Dict[str, Dict[str, Any]]:
+        positions = {}
+        response = self.session.get_positions(category="linear", settleCoin=self.settle_coin, limit=200)
+        for raw in self._result(response)['list']:
+            if position := self._parse_position(raw):
+                positions[raw['symbol']] = position
+        return positions
+
+    def _order_params(self, side: str, quantity: float, reduce_only: bool) -> Dict[str, Any]:
+        order_params = dict(
+            category="linear",
+            symbol=self.symbol,
+            side=side,
+            orderType="Market",
+            qty=self.spec.format_quantity(quantity)
+        )
+        if reduce_only:
+            order_params['reduceOnly'] = True
+        return order_params
+
+    def _send_order(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return self.session.place_order(**params)
+
+    def _fetch_book_top(self) -> Tuple[float, float]:
+        book = self._result(self.session.get_orderbook(category="linear", symbol=self.symbol, limit=1))
+        return float(book['b'][0][0]), float(book['a'][0][0])
+
+    def _limit_order_params(self, side: str, quantity: float, price: float, reduce_only: bool) -> Dict[str, Any]:
+        order_params = dict(
+            category="linear",
+            symbol=self.symbol,
+            side=side,
+            orderType="Limit",
+            qty=self.spec.format_quantity(quantity),
+            price=self.spec.format_price(price),
+            timeInForce="PostOnly"
+        )
+        if reduce_only:
+            order_params['reduceOnly'] = True
+        return order_params
+
+    def _amend_order(self, order_id: str, side: str, quantity: float, price: float):
+        # PostOnly, пересекший спред после изменения цены, биржа снимает - это покажет _fetch_order
+        self._result(self.session.amend_order(
+            category="linear", symbol=self.symbol, orderId=order_id, price=self.spec.format_price(price)))
+
+    def _cancel_order(self, order_id: str):
+        self._result(self.session.cancel_order(category="linear", symbol=self.symbol, orderId=order_id))
+
+    def _fetch_order(self, order_id: str) -> Tuple[str, float, float]:
+        # Активные и недавно закрытые ордера; более старые - только в истории
+        orders = self._result(self.session.get_open_orders(
+            category="linear", symbol=self.symbol, orderId=order_id))['list']
+        if not orders:
+            orders = self._result(self.session.get_order_history(
+                category="linear", symbol=self.symbol, orderId=order_id))['list']
+        if not orders:
+            raise RuntimeError(f"Ордер {order_id} не найден")
+
+        order = orders[0]
+        status = order['orderStatus']
+        state = 'open' if status in self.OPEN_STATUSES else 'filled' if status == "Filled" else 'closed'
+        return state, float(order['cumExecQty'] or 0), float(order['avgPrice'] or 0)
+
+    def _attached_protection(self, side: str, price: float) -> Dict[str, Any]:
+        # SL/TP уровня позиции прямо в ордере входа: защита активна с момента исполнения
+        is_long = side == self.BUY
+        trigger = self.TRIGGER_BY[self.protection.trigger]
+        params = {}
+        if (stop_loss := self.protection.stop_loss(is_long, price)) is not None:
+            params.update(stopLoss=self.spec.format_price(self.spec.round_price(stop_loss)), slTriggerBy=trigger)
+        if (take_profit := self.protection.take_profit(is_long, price)) is not None:
+            params.update(takeProfit=self.spec.format_price(self.spec.round_price(take_profit)), tpTriggerBy=trigger)
+        if params:
+            params['tpslMode'] = "Full"
+        return params
+
+    def _send_protection(self, side: str, quantity: float, price: float) -> Optional[Dict[str, Any]]:
+        # Трейлинг-стоп в ордер входа не прикладывается - ставится на позицию после исполнения
+        distance = self.protection.trailing_distance(price)
+        if distance is None:
             return None
-
-    def get_current_price(self) -> float:
-        try:
-            response = self.session.get_tickers(
-                category="linear",
-                symbol=self.symbol
-            )
-
-            if response['retCode'] == 0 and response['result']['list']:
-                return float(response['result']['list'][0]['lastPrice'])
-            return 0
-
-        except Exception as e:
-            self.logger.error(f"Ошибка получения цены: {e}")
-            return 0
-
-    def _calculate_quantity(self, price: float) -> float:
-        total_value = self.config.position_size * self.config.leverage
-        raw_quantity = total_value / price
-        rounded_quantity = self._round_quantity(raw_quantity)
-
-        self.logger.info(f"Расчет: {total_value} USDT / {price} = {rounded_quantity} {self.symbol}")
-        return rounded_quantity
-
-    def close_position(self) -> bool:
-        position = self.get_current_position()
-        if not position:
-            return True
-
-        try:
-            opposite_side = "Sell" if position['side'] == "Buy" else "Buy"
-            rounded_size = self._round_quantity(position['size'])
-
-            response = self.session.place_order(
-                category="linear",
-                symbol=self.symbol,
-                side=opposite_side,
-                orderType="Market",
-                qty=str(rounded_size),
-                reduceOnly=True
-            )
-
-            if response['retCode'] == 0:
-                self.logger.info(f"Закрыта {position['side']} позиция, PnL: {position['unrealized_pnl']} USDT")
-                self.current_position = None
-                return True
-            else:
-                self.logger.error(f"Не удалось закрыть позицию: {response['retMsg']}")
-                return False
-
-        except Exception as e:
-            self.logger.error(f"Ошибка закрытия позиции: {e}")
-            return False
-
-    def open_position(self, side: str) -> bool:
-        current_price = self.get_current_price()
-        if current_price == 0:
-            self.logger.error("Не удалось получить текущую цену")
-            return False
-
-        quantity = self._calculate_quantity(current_price)
-        balance = self.get_account_balance()
-
-        if balance < self.config.position_size:
-            self.logger.error(f"Недостаточно средств. Требуется: {self.config.position_size}, доступно: {balance}")
-            return False
-
-        if quantity < self.min_order_qty:
-            self.logger.error(f"Количество {quantity} меньше минимального {self.min_order_qty}")
-            return False
-
-        try:
-            response = self.session.place_order(
-                category="linear",
-                symbol=self.symbol,
-                side=side,
-                orderType="Market",
-                qty=str(quantity)
-            )
-
-            if response['retCode'] == 0:
-                direction = "Long" if side == "Buy" else "Short"
-                self.logger.info(f"Открыта {direction} позиция: {self.config.position_size} USDT по {current_price}")
-                self.current_position = {
-                    'side': side,
-                    'size': quantity,
-                    'entry_price': current_price
-                }
-                return True
-            else:
-                self.logger.error(f"Не удалось открыть позицию: {response['retMsg']}")
-                return False
-
-        except Exception as e:
-            self.logger.error(f"Ошибка открытия позиции: {e}")
-            return False
-
-    def open_long(self) -> bool:
-        return self.open_position("Buy")
-
-    def open_short(self) -> bool:
-        return self.open_position("Sell")
\ No newline at end of file
+        return self._result(self.session.set_trading_stop(
+            category="linear",
+            symbol=self.symbol,
+            trailingStop=self.spec.format_price(self.spec.round_price(distance)),
+            tpslMode="Full",
+            positionIdx=0
+        ))
+
+    def _order_result(self, response: Dict[str, Any], quantity: float) -> OrderResult:
+        if response['retCode'] == 0:
+            return OrderResult(quantity=quantity, ok=True, order_id=response['result'].get('orderId'))
+        return OrderResult(quantity=quantity, ok=False, error=response['retMsg'])
@@ -0,0 +1,199 @@
+import os
+import re
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Optional
+from src.parser.models import TradingSignal, SignalType
+from src.logger.config import setup_logger
+from src.journal import get_journal, JournalEvent
+
+
+class ConsensusRule(Enum):
+    ALL = "all"
+    MAJORITY = "majority"
+    WEIGHTED = "weighted"
+
+
+_TIMEFRAME = re.compile(r'^(\d+)([mhHdDwWM]?)$')
+_MINUTES = {'': 1, 'm': 1, 'h': 60, 'H': 60}
+
+
+def normalize_timeframe(timeframe: Any) -> Optional[str]:
+    """Таймфрейм в формате TradingView {{interval}}: минуты числом ('15', '60'), '1D', '1W', '1M'.
+    '15m' и '1h' приводятся к минутам; 'm' - минуты, 'M' - месяц"""
+    if timeframe is None:
+        return None
+    value = str(timeframe).strip()
+    if value in ('D', 'W', 'M'):
+        return f"1{value}"
+    match = _TIMEFRAME.match(value)
+    if match is None:
+        return value
+    number, unit = match.groups()
+    if unit in _MINUTES:
+        return str(int(number) * _MINUTES[unit])
+    return f"{int(number)}{unit.upper()}"
+
+
+def _parse_weights(raw: str) -> Dict[str, float]:
+    weights = {}
+    for item in raw.split(','):
+        if not item.strip():
+            continue
+        timeframe, _, weight = item.partition(':')
+        weights[normalize_timeframe(timeframe)] = float(weight) if weight.strip() else 1.0
+    return weights
+
+
+@dataclass
+class ConsensusConfig:
+    """Таймфреймы с весами (пустой список - консенсус выключен) и правило объединения"""
+    timeframes: Dict[str, float] = field(default_factory=dict)
+    rule: ConsensusRule = ConsensusRule.ALL
+    threshold: float = 0.5
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.timeframes)
+
+    @classmethod
+    def from_env(cls) -> 'ConsensusConfig':
+        # CONSENSUS_TIMEFRAMES=15,60 или с весами 15:1,60:2,240:3
+        rule = os.getenv('CONSENSUS_RULE', 'all').lower()
+        try:
+            parsed_rule = ConsensusRule(rule)
+        except ValueError:
+            raise ValueError(f"CONSENSUS_RULE: неизвестное правило {rule}. Поддерживаются: all, majority, weighted")
+
+        return cls(
+            timeframes=_parse_weights(os.getenv('CONSENSUS_TIMEFRAMES', '')),
+            rule=parsed_rule,
+            threshold=float(os.getenv('CONSENSUS_THRESHOLD', '0.5'))
+        )
+
+
+class _SymbolVotes:
+    __slots__ = ('votes', 'long_count', 'short_count', 'long_weight', 'short_weight', 'direction')
+
+    def __init__(self):
+        self.votes: Dict[str, SignalType] = {}
+        self.long_count = 0
+        self.short_count = 0
+        self.long_weight = 0.0
+        self.short_weight = 0.0
+        self.direction: Optional[SignalType] = None
+
+    def apply(self, vote: SignalType, weight: float, sign: int):
+        if vote == SignalType.LONG:
+            self.long_count += sign
+            self.long_weight += sign * weight
+        else:
+            self.short_count += sign
+            self.short_weight += sign * weight
+
+
+class SignalConsensus:
+    """Консенсус сигналов нескольких таймфреймов между парсером и стратегией.
+
+    По каждой паре (символ, таймфрейм) хранится последнее направление, счетчики и
+    веса голосов обновляются инкрементально: новый сигнал снимает старый голос
+    таймфрейма и добавляет новый. Сделка выпускается только когда объединенное
+    направление символа меняется на long или short; рассогласование сделку не выпускает.
+    Новое направление фиксируется вызовом confirm() после успешного исполнения: пока
+    оно не подтверждено, повтор голоса (ретрай после 429/503 или сбоя) выпускает сделку снова.
+    """
+
+    def __init__(self, config: ConsensusConfig):
+        self.logger = setup_logger(__name__)
+        self.journal = get_journal()
+        self.config = config
+        self._total_count = len(config.timeframes)
+        self._total_weight = sum(config.timeframes.values())
+        self._symbols: Dict[str, _SymbolVotes] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return self.config.enabled
+
+    def configure(self, config: ConsensusConfig):
+        """Новые таймфреймы/правило (hot reload): голоса сохраняются, суммы пересчитываются.
+        Зафиксированное направление не меняется: его меняет только исполненная сделка (confirm)"""
+        self.config = config
+        self._total_count = len(config.timeframes)
+        self._total_weight = sum(config.timeframes.values())
+        for state in self._symbols.values():
+            state.votes = {tf: vote for tf, vote in state.votes.items() if tf in config.timeframes}
+            state.long_count = state.short_count = 0
+            state.long_weight = state.short_weight = 0.0
+            for timeframe, vote in state.votes.items():
+                state.apply(vote, config.timeframes[timeframe], 1)
+
+    def _combine(self, state: _SymbolVotes) -> Optional[SignalType]:
+        rule = self.config.rule
+        if rule == ConsensusRule.ALL:
+            if state.long_count == self._total_count:
+                return SignalType.LONG
+            if state.short_count == self._total_count:
+                return SignalType.SHORT
+        elif rule == ConsensusRule.MAJORITY:
+            if state.long_count * 2 > self._total_count:
+                return SignalType.LONG
+            if state.short_count * 2 > self._total_count:
+                return SignalType.SHORT
+        else:
+            required = self.config.threshold * self._total_weight
+            if state.long_weight > required:
+                return SignalType.LONG
+            if state.short_weight > required:
+                return SignalType.SHORT
+        return None
+
+    def update(self, signal: TradingSignal) -> Optional[TradingSignal]:
+        """Учет голоса; сигнал для стратегии, если объединенное направление сменилось, иначе None"""
+        timeframe = normalize_timeframe(signal.timeframe)
+        weight = self.config.timeframes.get(timeframe)
+        if weight is None:
+            self.logger.warning(f"Сигнал {signal} с таймфреймом {signal.timeframe} не участвует в консенсусе - пропускаем")
+            self._record(signal, timeframe, False)
+            return None
+
+        state = self._symbols.get(signal.symbol)
+        if state is None:
+            state = self._symbols[signal.symbol] = _SymbolVotes()
+
+        previous_vote = state.votes.get(timeframe)
+        if previous_vote != signal.signal:
+            if previous_vote is not None:
+                state.apply(previous_vote, weight, -1)
+            state.apply(signal.signal, weight, 1)
+            state.votes[timeframe] = signal.signal
+
+        direction = self._combine(state)
+        changed = direction is not None and direction != state.direction
+        self._record(signal, timeframe, changed)
+
+        if not changed:
+            self.logger.info(f"Консенсус {signal.symbol}: голос {timeframe} {signal.signal.value}, сделки нет")
+            return None
+
+        self.logger.info(f"Консенсус {signal.symbol}: {direction.value} ({self.config.rule.value})")
+        return TradingSignal(symbol=signal.symbol, signal=direction, timeframe="consensus", signal_id=signal.signal_id)
+
+    def confirm(self, signal: TradingSignal):
+        """Сделка по объединенному сигналу исполнена - направление символа зафиксировано"""
+        if (state := self._symbols.get(signal.symbol)) is not None:
+            state.direction = signal.signal
+
+    def _record(self, signal: TradingSignal, timeframe: Optional[str], accepted: bool):
+        self.journal.record(JournalEvent.FILTER, signal.symbol, {
+            'stage': 'consensus', 'signal': signal.signal.value, 'timeframe': timeframe, 'accepted': accepted
+        })
+
+    def state(self, symbol: str) -> Dict[str, Any]:
+        state = self._symbols.get(symbol)
+        votes = state.votes if state else {}
+        return {
+            'direction': state.direction.value if state and state.direction else None,
+            'votes': {timeframe: votes[timeframe].value if timeframe in votes else None
+                      for timeframe in self.config.timeframes}
+        }
@@ -0,0 +1,530 @@
+# src/trading/engine.py
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, List, Tuple
+from .instrument import InstrumentSpec
+from .execution import OrderExecutor, OrderResult, ExecutionReport
+from .risk import get_risk_engine
+from .templates import OrderTemplates
+from .protection import ProtectionConfig
+from .algos import build_algo
+from src.logger.config import setup_logger
+from src.journal import get_journal, JournalEvent
+from src.metrics import get_metrics
+
+
+class ExchangeEngine(ABC):
+    """Общая часть движков бирж: расчет объема, риск-контроль, исполнение и учет позиции.
+
+    Адаптер биржи (наследник) реализует только обращения к API: _connect,
+    _load_instrument, _setup_leverage, _fetch_price, _fetch_balance, _fetch_position,
+    _fetch_positions, _order_params, _send_order, _order_result, для лимитных
+    алгоритмов исполнения - _fetch_book_top, _limit_order_params, _amend_order,
+    _cancel_order и _fetch_order. Это абстрактные методы: адаптер без любого из них
+    не создается. Защитные ордера (_attached_protection, _send_protection,
+    _clear_protection) - по возможностям биржи. Позиции хранятся в общем виде ('Buy'/'Sell'), стороны
+    ордера на бирже - BUY/SELL адаптера.
+    """
+
+    account = ""
+    BUY = "Buy"
+    SELL = "Sell"
+    # Поле идемпотентного id ордера в параметрах биржи
+    CLIENT_ID_FIELD = ""
+
+    def __init__(self, config, symbol: str):
+        self.config = config
+        self.symbol = symbol
+        self.logger = setup_logger(type(self).__module__)
+        self.journal = get_journal()
+        self.risk = get_risk_engine()
+        self.metrics = get_metrics()
+
+        self.current_position = None
+        self.last_price = None
+        self.last_balance = None
+        self.last_order: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[Dict[str, Any]] = None
+        self.spec: Optional[InstrumentSpec] = None
+        self.executor: Optional[OrderExecutor] = None
+        self.reconciler = None
+        self.templates = OrderTemplates(self)
+        self.protection = ProtectionConfig.from_env(symbol)
+        self.algo = build_algo(config)
+
+        # Независимые чтения (цена и баланс) идут параллельно
+        self._reads = ThreadPoolExecutor(max_workers=2, thread_name_prefix=f"reads-{symbol}")
+        # Защитные ордера, которые нельзя приложить ко входу, уходят после исполнения вне критического пути
+        self._followups = ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"protect-{symbol}")
+        # Пулы движка закрываются после последнего ордера в процессе (см. shutdown)
+        self._orders_in_flight = 0
+        self._closed = False
+        # Исполнители, замененные перезагрузкой во время ордера: закрываются, когда ордеров не останется
+        self._retired_executors: List[OrderExecutor] = []
+        self._state_lock = threading.Lock()
+
+        self._connect()
+        self._initialize()
+
+    # --- Адаптер биржи ---
+
+    @abstractmethod
+    def _connect(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _load_instrument(self) -> InstrumentSpec:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _setup_leverage(self):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _fetch_price(self) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _fetch_balance(self) -> float:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _fetch_position(self) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _fetch_positions(self) -> Dict[str, Dict[str, Any]]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _order_params(self, side: str, quantity: float, reduce_only: bool) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _send_order(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    @abstractmethod
+    def _order_result(self, response: Dict[str, Any], quantity: float) -> OrderResult:
+        raise NotImplementedError
+
+    def _attached_protection(self, side: str, price: float) -> Dict[str, Any]:
+        """Параметры SL/TP, которые биржа принимает в самом ордере входа"""
+        return {}
+
+    def _send_protection(self, side: str, quantity: float, price: float) -> Optional[Any]:
+        """Защита, которую нельзя приложить ко входу, одним запросом после исполнения; ответ - в журнал"""
+        return None
+
+    def _clear_protection(self):
+        """Снятие защитных ордеров после полного закрытия (если биржа не снимает их вместе с позицией)"""
+
+    @abstractmethod
+    def _fetch_book_top(self) -> Tuple[float, float]:
+        """Лучшие bid и ask стакана"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _limit_order_params(self, side: str, quantity: float, price: float, reduce_only: bool) -> Dict[str, Any]:
+        """Параметры post-only лимитного ордера"""
+        raise NotImplementedError
+
+    @abstractmethod
+    def _amend_order(self, order_id: str, side: str, quantity: float, price: float):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _cancel_order(self, order_id: str):
+        raise NotImplementedError
+
+    @abstractmethod
+    def _fetch_order(self, order_id: str) -> Tuple[str, float, float]:
+        """Состояние ордера ('open', 'filled' или 'closed' - снят/отклонен), исполненный объем и средняя цена"""
+        raise NotImplementedError
+
+    # --- Общая логика ---
+
+    def _initialize(self):
+        self._get_instrument_info()
+        self._setup_leverage()
+        self._sync_initial_position()
+        self._build_executor()
+
+    def _get_instrument_info(self):
+        try:
+            self.spec = self._load_instrument()
+            self.logger.info(
+                f"Параметры {self.symbol}: QtyStep={self.spec.qty_step}, MinQty={self.spec.min_qty}, "
+                f"MaxQty={self.spec.max_qty}, TickSize={self.spec.tick_size}, MinNotional={self.spec.min_notional}")
+        except Exception as e:
+            self._fail(f"Ошибка получения информации об инструменте: {e}")
+            raise
+
+    def _build_executor(self):
+        previous = self.executor
+        self.executor = OrderExecutor(
+            self._place_market_order,
+            self.spec,
+            max_concurrency=self.config.order_concurrency,
+            rate_limit=self.config.order_rate_limit
+        )
+        if previous is None:
+            return
+        with self._state_lock:
+            # Нарезанный ордер еще может отправлять части через прежний исполнитель
+            if self._orders_in_flight:
+                self._retired_executors.append(previous)
+                previous = None
+        if previous is not None:
+            previous.shutdown()
+
+    def apply_config(self, config) -> List[str]:
+        """Применение новой конфигурации на лету. Ключи и testnet требуют нового движка (новая сессия)"""
+        previous, self.config = self.config, config
+        applied = []
+
+        if config.leverage != previous.leverage:
+            self._setup_leverage()
+            applied.append('leverage')
+
+        if (config.order_rate_limit, config.order_concurrency) != \
+                (previous.order_rate_limit, previous.order_concurrency):
+            self._build_executor()
+            applied.append('executor')
+
+        protection = ProtectionConfig.from_env(self.symbol)
+        if protection != self.protection:
+            self.protection = protection
+            applied.append('protection')
+
+        if (config.execution_algo, config.maker_deadline_ms, config.maker_reprice_ms) != \
+                (previous.execution_algo, previous.maker_deadline_ms, previous.maker_reprice_ms):
+            self.algo = build_algo(config)
+            applied.append('execution_algo')
+
+        self.templates.invalidate()
+        return applied
+
+    def _sync_initial_position(self):
+        position = self.get_current_position()
+        self.current_position = position
+        self.risk.sync_position(self.account, self.symbol, position)
+
+    def _fail(self, message: str):
+        self.last_error = {'at': time.time(), 'message': message}
+        self.logger.error(message)
+
+    def _record_order(self, side: str, report: ExecutionReport, started: float):
+        # Баланс и позиция изменились - шаблоны ордеров пересобираются
+        self.templates.invalidate()
+        self.last_order = {
+            'side': side, 'requested': report.requested, 'filled': report.filled_qty, 'ok': report.ok,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2), 'at': time.time(),
+            'algo': report.algo, 'avg_price': report.avg_price, 'maker_qty': report.maker_qty,
+            'price_improvement_bps': report.price_improvement_bps
+        }
+
+    @contextmanager
+    def order_in_flight(self):
+        """Сверка позиций пропускает символ, пока его позиция меняется ордерами (вложенные вызовы допустимы)"""
+        reconciler = self.reconciler
+        with self._state_lock:
+            self._orders_in_flight += 1
+        if reconciler is not None:
+            reconciler.begin_order(self.symbol)
+        try:
+            yield
+        finally:
+            if reconciler is not None:
+                reconciler.end_order(self.symbol)
+            with self._state_lock:
+                self._orders_in_flight -= 1
+                idle = self._orders_in_flight == 0
+                retired = []
+                if idle:
+                    retired, self._retired_executors = self._retired_executors, []
+                release = self._closed and idle
+            for executor in retired:
+                executor.shutdown()
+            if release:
+                self._release_pools()
+
+    def shutdown(self):
+        """Остановка замененного движка (перезагрузка конфигурации). Ордер, который еще
+        исполняется, доводится до конца - пулы закрываются после него"""
+        self.templates.stop()
+        with self._state_lock:
+            self._closed = True
+            release = self._orders_in_flight == 0
+        if release:
+            self._release_pools()
+
+    def _release_pools(self):
+        self.executor.shutdown()
+        for executor in self._retired_executors:
+            executor.shutdown()
+        self._reads.shutdown(wait=False)
+        # Защитные ордера уже исполненной позиции в очереди еще отправятся
+        self._followups.shutdown(wait=False)
+
+    def _round_quantity(self, quantity: float) -> float:
+        if self.spec is None:
+            return round(quantity, 3)
+
+        # Верхний лимит не применяем: объем больше max_qty режется на дочерние ордера
+        return max(self.spec.round_quantity(quantity), float(self.spec.min_qty))
+
+    def _round_price(self, price: float) -> float:
+        if self.spec is None:
+            return round(price, 2)
+
+        return self.spec.round_price(price)
+
+    def get_account_balance(self) -> float:
+        try:
+            self.last_balance = self._fetch_balance()
+            return self.last_balance
+        except Exception as e:
+            self._fail(f"Ошибка получения баланса: {e}")
+            return 0
+
+    def get_current_position(self) -> Optional[Dict[str, Any]]:
+        try:
+            return self._fetch_position()
+        except Exception as e:
+            self._fail(f"Ошибка получения позиции: {e}")
+            return None
+
+    @property
+    def positions_scope(self) -> Optional[str]:
+        """Какие позиции аккаунта возвращает один _fetch_positions (None - все); сверка
+        делает по запросу на каждую группу"""
+        return None
+
+    def get_positions_batch(self) -> Optional[Dict[str, Dict[str, Any]]]:
+        """Все открытые позиции аккаунта одним запросом (для сверки). None - запрос не удался"""
+        try:
+            return self._fetch_positions()
+        except Exception as e:
+            self._fail(f"Ошибка получения позиций: {e}")
+            return None
+
+    def get_current_price(self) -> float:
+        try:
+            self.last_price = self._fetch_price()
+            return self.last_price
+        except Exception as e:
+            self._fail(f"Ошибка получения цены: {e}")
+            return 0
+
+    def _quantity_for(self, price: float) -> float:
+        return self._round_quantity(self.config.position_size * self.config.leverage / price)
+
+    def _calculate_quantity(self, price: float) -> float:
+        rounded_quantity = self._quantity_for(price)
+        total_value = self.config.position_size * self.config.leverage
+
+        self.logger.info(f"Расчет: {total_value} USDT / {price} = {rounded_quantity} {self.symbol}")
+        return rounded_quantity
+
+    def _place_market_order(self, side: str, quantity: float, reduce_only: bool = False,
+                            client_id: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> OrderResult:
+        template = self.templates.match(side, quantity, reduce_only)
+        order_params = dict(template.params) if template else self._order_params(side, quantity, reduce_only)
+        if client_id:
+            order_params[self.CLIENT_ID_FIELD] = client_id
+        if extra:
+            order_params.update(extra)
+        return self._submit(order_params, quantity)
+
+    def _place_limit_order(self, side: str, quantity: float, price: float, reduce_only: bool = False,
+                           client_id: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> OrderResult:
+        order_params = self._limit_order_params(side, quantity, price, reduce_only)
+        if client_id:
+            order_params[self.CLIENT_ID_FIELD] = client_id
+        if extra:
+            order_params.update(extra)
+        return self._submit(order_params, quantity)
+
+    def _submit(self, order_params: Dict[str, Any], quantity: float) -> OrderResult:
+        self.journal.record(JournalEvent.ORDER_REQUEST, self.symbol, order_params)
+
+        try:
+            response = self._send_order(order_params)
+        except Exception as e:
+            self.journal.record(JournalEvent.ORDER_RESPONSE, self.symbol, {'error': str(e)})
+            return OrderResult(quantity=quantity, ok=False, error=str(e))
+
+        self.journal.record(JournalEvent.ORDER_RESPONSE, self.symbol, response)
+        return self._order_result(response, quantity)
+
+    def close_position(self, client_id: Optional[str] = None) -> bool:
+        with self.order_in_flight():
+            return self._close_position(client_id)
+
+    def _close_position(self, client_id: Optional[str]) -> bool:
+        position = self.get_current_position()
+        if not position:
+            return True
+
+        try:
+            opposite_side = self.SELL if position['side'] == "Buy" else self.BUY
+            rounded_size = self._round_quantity(position['size'])
+
+            started = time.perf_counter()
+            report = self.algo.run(self, opposite_side, rounded_size, reduce_only=True, client_id=client_id)
+            self._record_order(opposite_side, report, started)
+
+            if report.filled_qty > 0:
+                self.journal.record(JournalEvent.FILL, self.symbol, {
+                    'side': opposite_side, 'qty': report.filled_qty, 'reduce_only': True,
+                    'entry_price': position['entry_price'], 'pnl': position['unrealized_pnl']
+                })
+                self.risk.on_fill(
+                    self.account, self.symbol, opposite_side == self.BUY, report.filled_qty, position['entry_price'],
+                    reduce_only=True, realized_pnl=position['unrealized_pnl'] * report.filled_qty / rounded_size
+                )
+
+            if report.ok:
+                self.logger.info(f"Закрыта {position['side']} позиция, PnL: {position['unrealized_pnl']} USDT")
+                self.current_position = None
+                self._unprotect()
+                return True
+            elif report.partial:
+                self._fail(f"Позиция закрыта частично: {report.filled_qty} из {rounded_size}")
+                self.current_position = {
+                    'side': position['side'],
+                    'size': self._round_quantity(rounded_size - report.filled_qty),
+                    'entry_price': position['entry_price']
+                }
+                return False
+            else:
+                self._fail(f"Не удалось закрыть позицию: {'; '.join(report.errors)}")
+                return False
+
+        except Exception as e:
+            self._fail(f"Ошибка закрытия позиции: {e}")
+            return False
+
+    def _prepare_open(self) -> Optional[Tuple[float, float]]:
+        """Цена и объем нового ордера с проверками; None - ордер отправлять нельзя"""
+        # Баланс запрашивается параллельно с ценой, а не после нее
+        balance_future = self._reads.submit(self.get_account_balance)
+        current_price = self.get_current_price()
+        if current_price == 0:
+            self._fail("Не удалось получить текущую цену")
+            return None
+
+        quantity = self._calculate_quantity(current_price)
+
+        # In-memory проверки до ожидания баланса
+        if reason := self.risk.check_order(self.account, self.symbol, quantity, current_price):
+            self._fail(f"Ордер отклонен риск-контролем: {reason}")
+            return None
+
+        balance = balance_future.result()
+
+        if balance < self.config.position_size:
+            self._fail(f"Недостаточно средств. Требуется: {self.config.position_size}, доступно: {balance}")
+            return None
+
+        if error := self.spec.check_order(quantity, current_price, allow_slicing=True):
+            self._fail(error)
+            return None
+
+        return current_price, quantity
+
+    def open_position(self, side: str, client_id: Optional[str] = None) -> bool:
+        with self.order_in_flight():
+            return self._open_position(side, client_id)
+
+    def _open_position(self, side: str, client_id: Optional[str]) -> bool:
+        prepare_started = time.perf_counter()
+        template = self.templates.take(side)
+
+        if template is not None:
+            # Цена, баланс и объем уже проверены фоном; риск-лимиты - только здесь, они меняются сделками
+            current_price, quantity = template.price, template.quantity
+            if reason := self.risk.check_order(self.account, self.symbol, quantity, current_price):
+                self._fail(f"Ордер отклонен риск-контролем: {reason}")
+                return False
+            self.metrics.observe('order_template_saved_seconds', template.build_seconds, {'symbol': self.symbol})
+        else:
+            prepared = self._prepare_open()
+            if prepared is None:
+                return False
+            current_price, quantity = prepared
+
+        self.metrics.observe('order_prepare_seconds', time.perf_counter() - prepare_started,
+                             {'symbol': self.symbol, 'template': 'hit' if template else 'miss'})
+
+        try:
+            attached = None
+            if self.protection.enabled:
+                # Уровни SL/TP - от свежей цены: цена шаблона могла уйти, и стоп оказался бы
+                # по другую сторону рынка (биржа отклонила бы весь ордер входа)
+                protection_price = (self.get_current_price() if template is not None else 0) or current_price
+                attached = self._attached_protection(side, protection_price)
+
+            started = time.perf_counter()
+            report = self.algo.run(self, side, quantity, client_id=client_id, extra=attached)
+            self._record_order(side, report, started)
+            # Лимитное исполнение знает свою среднюю цену - позиция и риск учитывают ее, а не цену сигнала
+            entry_price = report.avg_price or current_price
+
+            if report.filled_qty > 0:
+                if self.protection.enabled:
+                    self._followups.submit(self._protect, side, report.filled_qty, entry_price)
+                self.current_position = {
+                    'side': "Buy" if side == self.BUY else "Sell",
+                    'size': report.filled_qty,
+                    'entry_price': entry_price
+                }
+                self.journal.record(JournalEvent.FILL, self.symbol, {
+                    'side': side, 'qty': report.filled_qty, 'reduce_only': False, 'price': entry_price
+                })
+                self.risk.on_fill(self.account, self.symbol, side == self.BUY, report.filled_qty, entry_price)
+
+            direction = "Long" if side == self.BUY else "Short"
+            if report.ok:
+                self.logger.info(f"Открыта {direction} позиция: {self.config.position_size} USDT по {entry_price}")
+                return True
+            elif report.partial:
+                self._fail(f"{direction} позиция открыта частично: {report.filled_qty} из {quantity}")
+                return False
+            else:
+                self._fail(f"Не удалось открыть позицию: {'; '.join(report.errors)}")
+                return False
+
+        except Exception as e:
+            self._fail(f"Ошибка открытия позиции: {e}")
+            return False
+
+    def _unprotect(self):
+        # Синхронно, до возможного открытия при развороте: иначе снятие задело бы новые ордера
+        try:
+            self._clear_protection()
+        except Exception as e:
+            self.metrics.inc('protection_failures_total', {'symbol': self.symbol})
+            self._fail(f"Не удалось снять защитные ордера после закрытия: {e}")
+
+    def _protect(self, side: str, quantity: float, price: float):
+        try:
+            response = self._send_protection(side, quantity, price)
+        except Exception as e:
+            self.metrics.inc('protection_failures_total', {'symbol': self.symbol})
+            self._fail(f"Не удалось выставить защитные ордера: {e}")
+            return
+
+        if response is not None:
+            self.journal.record(JournalEvent.ORDER_RESPONSE, self.symbol, {'protection': response})
+            self.logger.info(f"Защитные ордера {self.symbol} выставлены")
+
+    def open_long(self, client_id: Optional[str] = None) -> bool:
+        return self.open_position(self.BUY, client_id)
+
+    def open_short(self, client_id: Optional[str] = None) -> bool:
+        return self.open_position(self.SELL, client_id)
@@ -1,21 +1,60 @@
 # src/trading/exchange_manager.py
+import importlib
 import os
+from dataclasses import fields
 from enum import Enum
-from typing import Union
-from .bybit import BybitStrategy
-from .binance import BinanceStrategy
+from typing import TYPE_CHECKING, Dict, Tuple, Union, Optional, List
+from .bybit import BybitConfig
+from .binance import BinanceConfig
+from .paper import PaperStrategy, PaperConfig, RecordedPriceSource, EnginePriceSource
+from .paper.price_source import PriceSource, bybit_ticker_source, binance_ticker_source
 from src.logger.config import setup_logger
 
+if TYPE_CHECKING:
+    from .bybit import BybitStrategy
+    from .binance import BinanceStrategy
+
 
 class ExchangeType(Enum):
     BYBIT = "bybit"
     BINANCE = "binance"
 
 
+# Адаптер биржи: модуль и класс стратегии. Модуль (и SDK биржи) импортируется
+# только при создании стратегии, поэтому запуск платит лишь за активную биржу
+_ADAPTERS: Dict[ExchangeType, Tuple[str, str]] = {
+    ExchangeType.BYBIT: ('src.trading.bybit.strategy', 'BybitStrategy'),
+    ExchangeType.BINANCE: ('src.trading.binance.strategy', 'BinanceStrategy'),
+}
+
+
+def register_adapter(exchange: ExchangeType, module: str, class_name: str):
+    _ADAPTERS[exchange] = (module, class_name)
+
+
+def load_adapter(exchange: ExchangeType) -> type:
+    if exchange not in _ADAPTERS:
+        raise ValueError(f"Неизвестная биржа: {exchange}")
+    module, class_name = _ADAPTERS[exchange]
+    return getattr(importlib.import_module(module), class_name)
+
+
+def config_diff(old, new) -> List[str]:
+    """Имена изменившихся полей конфигурации (значения не возвращаем - там ключи API)"""
+    if type(old) is not type(new):
+        return [field.name for field in fields(new)]
+    return [field.name for field in fields(new) if getattr(old, field.name) != getattr(new, field.name)]
+
+
 class ExchangeManager:
     def __init__(self):
         self.logger = setup_logger(__name__)
         self.active_exchange = self._detect_active_exchange()
+        self.paper_trading = os.getenv('PAPER_TRADING', 'false').lower() == 'true'
+        self.paper_shadow = os.getenv('PAPER_SHADOW', 'false').lower() == 'true'
+
+        if self.paper_trading:
+            self.logger.info("Режим paper trading: ордера на биржу не отправляются")
 
     def _detect_active_exchange(self) -> ExchangeType:
         bybit_enabled = os.getenv('BYBIT_ENABLED', 'false').lower() == 'true'
@@ -34,22 +73,46 @@ class ExchangeManager:
             self.logger.info("Активная биржа: Binance")
             return ExchangeType.BINANCE
 
-    def get_trading_strategy(self, symbol: str = None) -> Union[BybitStrategy, BinanceStrategy]:
+    def configured_symbol(self) -> str:
+        # Читаем символ из переменных окружения
+        if self.active_exchange == ExchangeType.BYBIT:
+            return os.getenv('BYBIT_SYMBOL', 'ETHUSDT')
+        return os.getenv('BINANCE_SYMBOL', 'ETHUSDC')
+
+    def load_config(self) -> Union[BybitConfig, BinanceConfig, PaperConfig]:
+        """Текущая конфигурация активного режима из окружения"""
+        if self.paper_trading:
+            return PaperConfig.from_env()
+        if self.active_exchange == ExchangeType.BYBIT:
+            return BybitConfig.from_env()
+        return BinanceConfig.from_env()
+
+    def get_trading_strategy(self, symbol: str = None) -> Union['BybitStrategy', 'BinanceStrategy', PaperStrategy]:
         if symbol is None:
-            # Читаем символ из переменных окружения
-            if self.active_exchange == ExchangeType.BYBIT:
-                symbol = os.getenv('BYBIT_SYMBOL', 'ETHUSDT')
-            else:
-                symbol = os.getenv('BINANCE_SYMBOL', 'ETHUSDC')
+            symbol = self.configured_symbol()
 
         self.logger.info(f"Инициализация торговой стратегии для {symbol}")
 
+        if self.paper_trading:
+            return PaperStrategy(symbol, self._paper_price_source(symbol))
+
+        return load_adapter(self.active_exchange)(symbol)
+
+    def get_shadow_strategy(self, live_strategy) -> Optional[PaperStrategy]:
+        """Теневая paper-стратегия рядом с живой: те же сигналы, цены из живого движка"""
+        if not self.paper_shadow or self.paper_trading:
+            return None
+
+        self.logger.info(f"Инициализация shadow paper trading для {live_strategy.engine.symbol}")
+        return PaperStrategy(live_strategy.engine.symbol, EnginePriceSource(live_strategy.engine), label="SHADOW")
+
+    def _paper_price_source(self, symbol: str) -> PriceSource:
+        if price_file := os.getenv('PAPER_PRICE_FILE'):
+            return RecordedPriceSource(price_file)
+
         if self.active_exchange == ExchangeType.BYBIT:
-            return BybitStrategy(symbol)
-        elif self.active_exchange == ExchangeType.BINANCE:
-            return BinanceStrategy(symbol)
-        else:
-            raise ValueError(f"Неизвестная биржа: {self.active_exchange}")
+            return bybit_ticker_source(symbol, os.getenv('BYBIT_TESTNET', 'false').lower() == 'true')
+        return binance_ticker_source(symbol, os.getenv('BINANCE_TESTNET', 'false').lower() == 'true')
 
     @property
     def is_bybit_active(self) -> bool:
@@ -0,0 +1,138 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Callable, Dict, List, Optional
+from .instrument import InstrumentSpec
+from src.logger.config import setup_logger
+
+
+@dataclass
+class OrderResult:
+    quantity: float
+    ok: bool
+    order_id: Optional[str] = None
+    error: Optional[str] = None
+
+
+@dataclass
+class ExecutionReport:
+    """Итог исполнения (возможно нарезанного) ордера"""
+    requested: float
+    children: List[OrderResult] = field(default_factory=list)
+    # Заполняются алгоритмом исполнения, если он знает цены (см. algos.py)
+    algo: str = "market"
+    arrival_price: Optional[float] = None
+    avg_price: Optional[float] = None
+    maker_qty: float = 0.0
+    # Улучшение средней цены относительно цены прихода, б.п.; > 0 - лучше
+    price_improvement_bps: Optional[float] = None
+
+    @property
+    def ok(self) -> bool:
+        return bool(self.children) and all(child.ok for child in self.children)
+
+    @property
+    def partial(self) -> bool:
+        return not self.ok and any(child.ok for child in self.children)
+
+    @property
+    def filled_qty(self) -> float:
+        return float(sum(Decimal(str(child.quantity)) for child in self.children if child.ok))
+
+    @property
+    def errors(self) -> List[str]:
+        return [child.error for child in self.children if not child.ok and child.error]
+
+
+class RateLimiter:
+    """Token bucket: не больше rate запросов в секунду с запасом burst"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+def split_quantity(spec: InstrumentSpec, quantity: float) -> List[float]:
+    """Нарезка количества на дочерние ордера не больше max_qty, кратные шагу и почти равные"""
+    total_steps = int((Decimal(str(quantity)) / spec.qty_step).to_integral_value(ROUND_HALF_UP))
+    max_steps = int(spec.max_qty / spec.qty_step) if spec.max_qty.is_finite() else total_steps
+
+    if total_steps <= max_steps or max_steps <= 0:
+        return [quantity]
+
+    children = -(-total_steps // max_steps)
+    base, remainder = divmod(total_steps, children)
+    return [float((base + (1 if i < remainder else 0)) * spec.qty_step) for i in range(children)]
+
+
+class OrderExecutor:
+    """Отправка маркет-ордеров; объем больше лимита биржи режется и отправляется параллельно"""
+
+    def __init__(self, place_order: Callable[..., OrderResult], spec: InstrumentSpec,
+                 max_concurrency: int = 5, rate_limit: float = 10.0):
+        self.logger = setup_logger(__name__)
+        self.place_order = place_order
+        self.spec = spec
+        self._limiter = RateLimiter(rate_limit)
+        self._pool = ThreadPoolExecutor(max_workers=max_concurrency, thread_name_prefix=f"orders-{spec.symbol}")
+
+    def execute(self, side: str, quantity: float, reduce_only: bool = False,
+                client_id: Optional[str] = None, extra: Optional[Dict[str, Any]] = None) -> ExecutionReport:
+        """client_id - идемпотентный id ордера; дочерние ордера получают суффикс с номером.
+        extra - дополнительные параметры биржи для каждого ордера (приложенные SL/TP)"""
+        slices = split_quantity(self.spec, quantity)
+        report = ExecutionReport(requested=quantity)
+
+        if len(slices) == 1:
+            report.children.append(self._send(side, slices[0], reduce_only, client_id, extra))
+            return report
+
+        self.logger.info(
+            f"{self.spec.symbol}: ордер {quantity} больше лимита {self.spec.max_qty}, "
+            f"нарезка на {len(slices)} частей")
+
+        futures = [
+            self._pool.submit(self._send, side, child_qty, reduce_only, f"{client_id}{index}" if client_id else None,
+                              extra)
+            for index, child_qty in enumerate(slices)
+        ]
+        report.children.extend(future.result() for future in futures)
+
+        if not report.ok:
+            self.logger.error(
+                f"{self.spec.symbol}: исполнено {report.filled_qty} из {quantity}, "
+                f"ошибки: {'; '.join(report.errors)}")
+        return report
+
+    def throttle(self):
+        """Общий лимит запросов для ордеров, отправляемых в обход execute (лимитные алгоритмы)"""
+        self._limiter.acquire()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+
+    def _send(self, side: str, quantity: float, reduce_only: bool, client_id: Optional[str],
+              extra: Optional[Dict[str, Any]]) -> OrderResult:
+        self._limiter.acquire()
+        try:
+            return self.place_order(side, quantity, reduce_only, client_id, extra)
+        except Exception as e:
+            return OrderResult(quantity=quantity, ok=False, error=str(e))
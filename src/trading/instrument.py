@@ -0,0 +1,121 @@
+from dataclasses import dataclass, field
+from decimal import Decimal, ROUND_HALF_UP, ROUND_FLOOR
+from typing import Dict, Any, Optional
+
+
+def _decimal(value: float) -> Decimal:
+    # Кратчайшее десятичное представление float: 0.1 -> Decimal('0.1'), а не 0.1000000000000000055...
+    return Decimal(str(float(value)))
+
+
+@dataclass(frozen=True)
+class InstrumentSpec:
+    """Фильтры инструмента, собранные один раз на символ.
+
+    Шаги хранятся в Decimal, поэтому округление дает ровно кратное шагу значение
+    без накопления ошибки float. Общая для движков бирж, paper trading и бэктеста.
+    """
+    symbol: str
+    qty_step: Decimal
+    tick_size: Decimal
+    min_qty: Decimal
+    max_qty: Decimal
+    min_notional: Decimal = Decimal(0)
+
+    qty_precision: int = field(init=False)
+    price_precision: int = field(init=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'qty_precision', max(0, -self.qty_step.normalize().as_tuple().exponent))
+        object.__setattr__(self, 'price_precision', max(0, -self.tick_size.normalize().as_tuple().exponent))
+
+    @classmethod
+    def from_bybit(cls, instrument: Dict[str, Any]) -> 'InstrumentSpec':
+        lot_size_filter = instrument['lotSizeFilter']
+        return cls(
+            symbol=instrument['symbol'],
+            qty_step=Decimal(lot_size_filter['qtyStep']),
+            tick_size=Decimal(instrument['priceFilter']['tickSize']),
+            min_qty=Decimal(lot_size_filter['minOrderQty']),
+            # Для маркет-ордеров действует отдельный лимит
+            max_qty=Decimal(lot_size_filter.get('maxMktOrderQty') or lot_size_filter['maxOrderQty']),
+            min_notional=Decimal(lot_size_filter.get('minNotionalValue') or 0)
+        )
+
+    @classmethod
+    def from_binance(cls, symbol_info: Dict[str, Any]) -> 'InstrumentSpec':
+        filters = {item['filterType']: item for item in symbol_info['filters']}
+        lot_size = filters['LOT_SIZE']
+        market_lot_size = filters.get('MARKET_LOT_SIZE', lot_size)
+        min_notional = filters.get('MIN_NOTIONAL', {})
+
+        return cls(
+            symbol=symbol_info['symbol'],
+            qty_step=Decimal(lot_size['stepSize']),
+            tick_size=Decimal(filters['PRICE_FILTER']['tickSize']),
+            min_qty=Decimal(lot_size['minQty']),
+            max_qty=Decimal(market_lot_size['maxQty']),
+            min_notional=Decimal(min_notional.get('notional') or min_notional.get('minNotional') or 0)
+        )
+
+    @classmethod
+    def from_step(cls, symbol: str, qty_step: float, tick_size: float = 0.01) -> 'InstrumentSpec':
+        """Спецификация без биржи (paper trading, бэктест): минимум = шаг, без верхнего предела"""
+        step = Decimal(str(qty_step))
+        return cls(
+            symbol=symbol,
+            qty_step=step,
+            tick_size=Decimal(str(tick_size)),
+            min_qty=step,
+            max_qty=Decimal('Infinity')
+        )
+
+    def round_quantity(self, quantity: float, floor: bool = False) -> float:
+        """Количество, кратное шагу лота (по умолчанию к ближайшему, floor=True - вниз)"""
+        steps = (_decimal(quantity) / self.qty_step).to_integral_value(ROUND_FLOOR if floor else ROUND_HALF_UP)
+        return float(steps * self.qty_step)
+
+    def round_price(self, price: float) -> float:
+        steps = (_decimal(price) / self.tick_size).to_integral_value(ROUND_HALF_UP)
+        return float(steps * self.tick_size)
+
+    def clamp_quantity(self, quantity: float) -> float:
+        return float(min(max(_decimal(quantity), self.min_qty), self.max_qty))
+
+    def format_quantity(self, quantity: float) -> str:
+        """Строка для API без экспоненциальной записи (str(1e-05) биржи не принимают)"""
+        return f"{quantity:.{self.qty_precision}f}"
+
+    def format_price(self, price: float) -> str:
+        return f"{price:.{self.price_precision}f}"
+
+    def check_order(self, quantity: float, price: float, allow_slicing: bool = False) -> Optional[str]:
+        """Проверка ордера по фильтрам биржи: None если проходит, иначе причина отказа.
+        allow_slicing - объем больше max_qty допустим (будет нарезан исполнителем)"""
+        qty = _decimal(quantity)
+        if qty < self.min_qty:
+            return f"Количество {quantity} меньше минимального {self.min_qty}"
+        if qty > self.max_qty and not allow_slicing:
+            return f"Количество {quantity} больше максимального {self.max_qty}"
+        if qty % self.qty_step != 0:
+            return f"Количество {quantity} не кратно шагу {self.qty_step}"
+        if self.min_notional and qty * _decimal(price) < self.min_notional:
+            return f"Стоимость ордера меньше минимальной {self.min_notional}"
+        return None
+
+    def round_quantities(self, quantities, floor: bool = False):
+        """Векторный вариант round_quantity для numpy-массивов (бэктест)"""
+        import numpy as np
+
+        step = float(self.qty_step)
+        ratio = np.asarray(quantities, dtype=np.float64) / step
+        # Поправка на ошибку float (0.3 / 0.1 = 2.9999999999999996, 1.005 / 0.01 = 100.49999999999999):
+        # округляется десятичная запись числа, как Decimal(str(q)) в round_quantity
+        eps = np.maximum(np.abs(ratio), 1.0) * 1e-12
+        steps = np.floor(ratio + eps) if floor else np.floor(ratio + 0.5 + eps)
+        return np.round(steps * step, self.qty_precision)
+
+    def clamp_quantities(self, quantities):
+        import numpy as np
+
+        return np.clip(quantities, float(self.min_qty), float(self.max_qty))
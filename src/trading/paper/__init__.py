@@ -0,0 +1,9 @@
+from .strategy import PaperStrategy
+from .engine import PaperEngine
+from .config import PaperConfig
+from .price_source import RecordedPriceSource, TickerPriceSource, EnginePriceSource
+
+__all__ = [
+    'PaperStrategy', 'PaperEngine', 'PaperConfig',
+    'RecordedPriceSource', 'TickerPriceSource', 'EnginePriceSource'
+]
@@ -0,0 +1,25 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+@dataclass
+class PaperConfig:
+    initial_balance: float
+    position_size: float
+    leverage: int
+    fee_rate: float
+    slippage_bps: float
+    qty_step: float
+    price_file: Optional[str] = None
+
+    @classmethod
+    def from_env(cls) -> 'PaperConfig':
+        return cls(
+            initial_balance=float(os.getenv('PAPER_BALANCE', '1000')),
+            position_size=float(os.getenv('POSITION_SIZE', '100')),
+            leverage=int(os.getenv('LEVERAGE', '10')),
+            fee_rate=float(os.getenv('PAPER_FEE_RATE', '0.00055')),
+            slippage_bps=float(os.getenv('PAPER_SLIPPAGE_BPS', '2')),
+            qty_step=float(os.getenv('PAPER_QTY_STEP', '0.001')),
+            price_file=os.getenv('PAPER_PRICE_FILE') or None
+        )
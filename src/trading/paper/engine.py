@@ -0,0 +1,171 @@
+import threading
+import time
+from contextlib import nullcontext
+from typing import Optional, Dict, Any, List
+from .config import PaperConfig
+from .price_source import PriceSource
+from ..instrument import InstrumentSpec
+from src.logger.config import setup_logger
+from src.journal import get_journal, JournalEvent
+
+
+class PaperEngine:
+    """Симуляция исполнения с тем же интерфейсом, что у BybitEngine/BinanceEngine"""
+
+    def __init__(self, config: PaperConfig, symbol: str, price_source: PriceSource, label: str = "PAPER"):
+        self.config = config
+        self.symbol = symbol
+        self.price_source = price_source
+        self.label = label
+        self.spec = InstrumentSpec.from_step(symbol, config.qty_step)
+        self.logger = setup_logger(__name__)
+        self.journal = get_journal()
+
+        self.balance = config.initial_balance
+        self.realized_pnl = 0.0
+        self.fees_paid = 0.0
+        self.trades = 0
+        self.current_position = None
+        self.last_price = None
+        self.last_order: Optional[Dict[str, Any]] = None
+        self.last_error: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+        self.logger.info(f"[{self.label}] {self.symbol}: стартовый баланс {self.balance} USDT")
+
+    def apply_config(self, config: PaperConfig) -> List[str]:
+        previous, self.config = self.config, config
+        if config.qty_step != previous.qty_step:
+            self.spec = InstrumentSpec.from_step(self.symbol, config.qty_step)
+            return ['qty_step']
+        return []
+
+    def _round_quantity(self, quantity: float) -> float:
+        return self.spec.round_quantity(quantity, floor=True)
+
+    def _fill_price(self, side: str, price: float) -> float:
+        """Маркет-исполнение с проскальзыванием против направления сделки"""
+        slippage = price * self.config.slippage_bps / 10000
+        return price + slippage if side == "Buy" else price - slippage
+
+    def _fail(self, message: str):
+        self.last_error = {'at': time.time(), 'message': message}
+        self.logger.error(message)
+
+    def _record_order(self, side: str, quantity: float, started: float):
+        self.last_order = {
+            'side': side, 'requested': quantity, 'filled': quantity, 'ok': True,
+            'latency_ms': round((time.perf_counter() - started) * 1000, 2), 'at': time.time()
+        }
+
+    def order_in_flight(self):
+        # Сверки позиций с биржей у симуляции нет
+        return nullcontext()
+
+    @property
+    def last_balance(self) -> float:
+        return self.balance
+
+    def get_account_balance(self) -> float:
+        return self.balance
+
+    def get_current_price(self) -> float:
+        price = self.price_source.get_price()
+        if price:
+            self.last_price = price
+        return price
+
+    def get_current_position(self) -> Optional[Dict[str, Any]]:
+        position = self.current_position
+        if position is None:
+            return None
+
+        price = self.last_price or position['entry_price']
+        direction = 1 if position['side'] == "Buy" else -1
+        return {
+            'side': position['side'],
+            'size': position['size'],
+            'entry_price': position['entry_price'],
+            'unrealized_pnl': round(direction * position['size'] * (price - position['entry_price']), 4)
+        }
+
+    def close_position(self, client_id: Optional[str] = None) -> bool:
+        started = time.perf_counter()
+        with self._lock:
+            position = self.current_position
+            if not position:
+                return True
+
+            price = self.get_current_price()
+            if price == 0:
+                self._fail(f"[{self.label}] Не удалось получить текущую цену")
+                return False
+
+            opposite_side = "Sell" if position['side'] == "Buy" else "Buy"
+            fill_price = self._fill_price(opposite_side, price)
+            direction = 1 if position['side'] == "Buy" else -1
+            pnl = direction * position['size'] * (fill_price - position['entry_price'])
+            fee = position['size'] * fill_price * self.config.fee_rate
+
+            self.balance += pnl - fee
+            self.realized_pnl += pnl
+            self.fees_paid += fee
+            self.trades += 1
+            self.current_position = None
+            self._record_order(opposite_side, position['size'], started)
+            self.journal.record(JournalEvent.FILL, self.symbol, {
+                'side': opposite_side, 'qty': position['size'], 'reduce_only': True, 'price': fill_price,
+                'entry_price': position['entry_price'], 'pnl': pnl, 'fee': fee, 'mode': self.label,
+                'client_id': client_id
+            })
+
+            self.logger.info(
+                f"[{self.label}] Закрыта {position['side']} позиция по {fill_price:.4f}, "
+                f"PnL: {pnl:.4f} USDT, комиссия: {fee:.4f}, баланс: {self.balance:.4f}")
+            return True
+
+    def open_position(self, side: str, client_id: Optional[str] = None) -> bool:
+        side = side.capitalize()
+        started = time.perf_counter()
+
+        with self._lock:
+            price = self.get_current_price()
+            if price == 0:
+                self._fail(f"[{self.label}] Не удалось получить текущую цену")
+                return False
+
+            if self.balance < self.config.position_size:
+                self._fail(
+                    f"[{self.label}] Недостаточно средств. Требуется: {self.config.position_size}, "
+                    f"доступно: {self.balance}")
+                return False
+
+            fill_price = self._fill_price(side, price)
+            quantity = self._round_quantity(self.config.position_size * self.config.leverage / fill_price)
+            if quantity <= 0:
+                self._fail(f"[{self.label}] Количество {quantity} меньше шага {self.config.qty_step}")
+                return False
+
+            fee = quantity * fill_price * self.config.fee_rate
+            self.balance -= fee
+            self.fees_paid += fee
+            self.current_position = {
+                'side': side,
+                'size': quantity,
+                'entry_price': fill_price
+            }
+            self._record_order(side, quantity, started)
+            self.journal.record(JournalEvent.FILL, self.symbol, {
+                'side': side, 'qty': quantity, 'reduce_only': False, 'price': fill_price,
+                'fee': fee, 'mode': self.label, 'client_id': client_id
+            })
+
+            direction = "Long" if side == "Buy" else "Short"
+            self.logger.info(f"[{self.label}] Открыта {direction} позиция: {quantity} {self.symbol} по {fill_price:.4f}")
+            return True
+
+    def open_long(self, client_id: Optional[str] = None) -> bool:
+        return self.open_position("Buy", client_id)
+
+    def open_short(self, client_id: Optional[str] = None) -> bool:
+        return self.open_position("Sell", client_id)
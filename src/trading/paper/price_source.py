@@ -0,0 +1,71 @@
+from typing import Callable, Protocol
+from src.logger.config import setup_logger
+
+logger = setup_logger(__name__)
+
+
+class PriceSource(Protocol):
+    def get_price(self) -> float:
+        ...
+
+
+class RecordedPriceSource:
+    """Воспроизведение записанных цен (CSV с колонкой close) - каждый запрос сдвигает на один бар"""
+
+    def __init__(self, path: str):
+        from src.backtest.data import load_closes
+
+        self._prices = load_closes(path).tolist()
+        self._index = 0
+        logger.info(f"Загружено {len(self._prices)} цен из {path}")
+
+    def get_price(self) -> float:
+        price = self._prices[self._index]
+        if self._index < len(self._prices) - 1:
+            self._index += 1
+        return price
+
+
+class TickerPriceSource:
+    """Цена с публичного тикера биржи (без подписи, не расходует лимиты аккаунта)"""
+
+    def __init__(self, fetch: Callable[[], float]):
+        self._fetch = fetch
+
+    def get_price(self) -> float:
+        try:
+            return self._fetch()
+        except Exception as e:
+            logger.error(f"Ошибка получения цены для paper trading: {e}")
+            return 0
+
+
+class EnginePriceSource:
+    """Цена из живого движка - shadow режим переиспользует уже полученную цену без нового запроса"""
+
+    def __init__(self, engine):
+        self._engine = engine
+
+    def get_price(self) -> float:
+        price = getattr(self._engine, 'last_price', None)
+        if price:
+            return price
+        return self._engine.get_current_price()
+
+
+def bybit_ticker_source(symbol: str, testnet: bool = False) -> TickerPriceSource:
+    from pybit.unified_trading import HTTP
+
+    session = HTTP(testnet=testnet)
+    return TickerPriceSource(
+        lambda: float(session.get_tickers(category="linear", symbol=symbol)['result']['list'][0]['lastPrice'])
+    )
+
+
+def binance_ticker_source(symbol: str, testnet: bool = False) -> TickerPriceSource:
+    from binance.client import Client
+
+    client = Client(testnet=testnet, ping=False)
+    if testnet:
+        client.FUTURES_URL = 'https://testnet.binancefuture.com/fapi'
+    return TickerPriceSource(lambda: float(client.futures_symbol_ticker(symbol=symbol)['price']))
@@ -0,0 +1,13 @@
+from .engine import PaperEngine
+from .config import PaperConfig
+from .price_source import PriceSource
+from ..strategy import TradingStrategy
+
+
+class PaperStrategy(TradingStrategy):
+    # Биржи нет - пауза при развороте не нужна
+    reverse_delay = 0
+
+    def __init__(self, symbol: str, price_source: PriceSource, label: str = "PAPER"):
+        config = PaperConfig.from_env()
+        super().__init__(config, PaperEngine(config, symbol, price_source, label))
@@ -0,0 +1,48 @@
+import os
+from dataclasses import dataclass
+from typing import Optional
+
+
+def _setting(name: str, symbol: str, default: str) -> str:
+    # Настройка символа (STOP_LOSS_PCT_ETHUSDT) перекрывает общую (STOP_LOSS_PCT)
+    return os.getenv(f"{name}_{symbol}", os.getenv(name, default))
+
+
+@dataclass
+class ProtectionConfig:
+    """Защитные ордера позиции в процентах от цены входа (0 - выключено)"""
+    stop_loss_pct: float = 0
+    take_profit_pct: float = 0
+    trailing_stop_pct: float = 0
+    # Цена срабатывания: mark (устойчива к проколам) или last
+    trigger: str = "mark"
+
+    @classmethod
+    def from_env(cls, symbol: str) -> 'ProtectionConfig':
+        trigger = _setting('PROTECTION_TRIGGER', symbol, 'mark').lower()
+        if trigger not in ('mark', 'last'):
+            raise ValueError(f"PROTECTION_TRIGGER: {trigger}. Поддерживаются: mark, last")
+
+        return cls(
+            stop_loss_pct=float(_setting('STOP_LOSS_PCT', symbol, '0')),
+            take_profit_pct=float(_setting('TAKE_PROFIT_PCT', symbol, '0')),
+            trailing_stop_pct=float(_setting('TRAILING_STOP_PCT', symbol, '0')),
+            trigger=trigger
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.stop_loss_pct or self.take_profit_pct or self.trailing_stop_pct)
+
+    def stop_loss(self, is_long: bool, price: float) -> Optional[float]:
+        if not self.stop_loss_pct:
+            return None
+        return price * (1 - self.stop_loss_pct / 100) if is_long else price * (1 + self.stop_loss_pct / 100)
+
+    def take_profit(self, is_long: bool, price: float) -> Optional[float]:
+        if not self.take_profit_pct:
+            return None
+        return price * (1 + self.take_profit_pct / 100) if is_long else price * (1 - self.take_profit_pct / 100)
+
+    def trailing_distance(self, price: float) -> Optional[float]:
+        return price * self.trailing_stop_pct / 100 if self.trailing_stop_pct else None
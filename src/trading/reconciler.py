@@ -0,0 +1,178 @@
+import asyncio
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Any
+from src.logger.config import setup_logger
+from src.journal import get_journal, JournalEvent
+from src.metrics import get_metrics
+
+
+@dataclass
+class DriftEvent:
+    ts: float
+    account: str
+    symbol: str
+    kind: str
+    local: Optional[Dict[str, Any]]
+    exchange: Optional[Dict[str, Any]]
+
+
+class PositionReconciler:
+    """Фоновая сверка локальных позиций движков с биржей.
+
+    Все символы одного аккаунта проверяются одним запросом (Bybit - по запросу на
+    расчетную монету, см. positions_scope движка). Интервал адаптивный:
+    idle_interval в покое и active_interval в течение active_window секунд после ордера.
+    """
+
+    def __init__(self, idle_interval: float = 60, active_interval: float = 2,
+                 active_window: float = 30, order_grace: float = 1.0, max_events: int = 500):
+        self.logger = setup_logger(__name__)
+        self.journal = get_journal()
+        self.metrics = get_metrics()
+        self.idle_interval = idle_interval
+        self.active_interval = active_interval
+        self.active_window = active_window
+        self.order_grace = order_grace
+
+        self.engines: Dict[str, Dict[str, Any]] = {}
+        self.events = deque(maxlen=max_events)
+        self.checks = 0
+        self.is_running = False
+
+        self._last_order: Dict[str, float] = {}
+        # Символы с ордером в процессе (закрытие, пауза разворота, открытие): их позиция меняется
+        self._in_flight: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._active_until = 0.0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def register(self, engine):
+        self.engines.setdefault(engine.account, {})[engine.symbol] = engine
+        engine.reconciler = self
+
+    def unregister(self, engine):
+        engines = self.engines.get(engine.account, {})
+        if engines.get(engine.symbol) is engine:
+            del engines[engine.symbol]
+            if not engines:
+                del self.engines[engine.account]
+        engine.reconciler = None
+
+    def begin_order(self, symbol: str):
+        with self._lock:
+            self._in_flight[symbol] = self._in_flight.get(symbol, 0) + 1
+
+    def end_order(self, symbol: str):
+        with self._lock:
+            count = self._in_flight.get(symbol, 0) - 1
+            if count > 0:
+                self._in_flight[symbol] = count
+            else:
+                self._in_flight.pop(symbol, None)
+        self.notify_order(symbol)
+
+    def _busy(self, symbol: str, since: float) -> bool:
+        """Ордер в процессе или завершился позже начала запроса позиций (ответ биржи мог его не застать)"""
+        with self._lock:
+            if symbol in self._in_flight:
+                return True
+        return self._last_order.get(symbol, 0) > since - self.order_grace
+
+    def notify_order(self, symbol: str):
+        """Вызывается движком после ордера: ускоряем сверку (можно из любого потока)"""
+        now = time.monotonic()
+        self._last_order[symbol] = now
+        self._active_until = now + self.active_window
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def start(self):
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.logger.info(
+            f"Сверка позиций запущена: {self.idle_interval} сек в покое, {self.active_interval} сек после ордеров")
+
+        while self.is_running:
+            try:
+                await self.reconcile()
+            except Exception as e:
+                self.logger.error(f"Ошибка сверки позиций: {e}")
+
+            interval = self.active_interval if time.monotonic() < self._active_until else self.idle_interval
+            self._wakeup.clear()
+            try:
+                # Ордер прерывает длинный сон, дальше работаем в быстром режиме
+                await asyncio.wait_for(self._wakeup.wait(), timeout=interval)
+                await asyncio.sleep(self.active_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self.is_running = False
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+        self.logger.info("Сверка позиций остановлена")
+
+    async def reconcile(self):
+        for account, engines in list(self.engines.items()):
+            scopes: Dict[Optional[str], Dict[str, Any]] = {}
+            for symbol, engine in list(engines.items()):
+                scopes.setdefault(engine.positions_scope, {})[symbol] = engine
+            for scoped in scopes.values():
+                await self._reconcile_scope(account, scoped)
+
+    async def _reconcile_scope(self, account: str, engines: Dict[str, Any]):
+        # Один запрос на группу: все ее символы сразу
+        any_engine = next(iter(engines.values()))
+        requested = time.monotonic()
+        positions = await asyncio.to_thread(any_engine.get_positions_batch)
+        if positions is None:
+            return
+
+        self.checks += 1
+        for symbol, engine in engines.items():
+            if self._busy(symbol, requested):
+                # Позиция меняется прямо сейчас или биржа может еще не отразить ордер
+                continue
+            self._compare(account, engine, positions.get(symbol))
+
+    def _compare(self, account: str, engine, exchange: Optional[Dict[str, Any]]):
+        local = engine.current_position
+        kind = None
+
+        if local is None and exchange is not None:
+            kind = "unexpected_position"
+        elif local is not None and exchange is None:
+            kind = "missing_position"
+        elif local is not None and exchange is not None:
+            if local['side'] != exchange['side']:
+                kind = "side_mismatch"
+            elif abs(local['size'] - exchange['size']) > float(engine.spec.qty_step) / 2:
+                kind = "size_mismatch"
+
+        if kind is None:
+            return
+
+        event = DriftEvent(
+            ts=time.time(), account=account, symbol=engine.symbol, kind=kind,
+            local=dict(local) if local else None, exchange=exchange
+        )
+        self.events.append(event)
+        self.journal.record(JournalEvent.DRIFT, engine.symbol, asdict(event))
+        self.metrics.inc('reconciler_drift_total', {'symbol': engine.symbol, 'kind': kind})
+        self.logger.warning(f"Расхождение позиции {engine.symbol} ({kind}): локально {local}, на бирже {exchange}")
+
+        # Истина - биржа: принимаем ее состояние локально
+        engine.current_position = dict(exchange) if exchange else None
+        engine.risk.sync_position(account, engine.symbol, exchange)
+
+    def drift_events(self, symbol: Optional[str] = None) -> List[Dict[str, Any]]:
+        return [asdict(event) for event in self.events if symbol is None or event.symbol == symbol]
@@ -0,0 +1,185 @@
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Tuple, Optional, Deque, Any
+from src.logger.config import setup_logger
+from src.metrics import get_metrics
+
+
+@dataclass
+class RiskLimits:
+    """Лимиты pre-trade проверок (0 - лимит отключен)"""
+    max_symbol_notional: float = 0
+    max_account_notional: float = 0
+    max_total_exposure: float = 0
+    daily_loss_limit: float = 0
+    max_flips_per_hour: int = 0
+    kill_switch: bool = False
+
+    @classmethod
+    def from_env(cls) -> 'RiskLimits':
+        return cls(
+            max_symbol_notional=float(os.getenv('RISK_MAX_SYMBOL_NOTIONAL', '0')),
+            max_account_notional=float(os.getenv('RISK_MAX_ACCOUNT_NOTIONAL', '0')),
+            max_total_exposure=float(os.getenv('RISK_MAX_TOTAL_EXPOSURE', '0')),
+            daily_loss_limit=float(os.getenv('RISK_DAILY_LOSS_LIMIT', '0')),
+            max_flips_per_hour=int(os.getenv('RISK_MAX_FLIPS_PER_HOUR', '0')),
+            kill_switch=os.getenv('RISK_KILL_SWITCH', 'false').lower() == 'true'
+        )
+
+
+class RiskEngine:
+    """Pre-trade риск-контроль в памяти процесса.
+
+    Проверка ордера не делает сетевых запросов; состояние (номинал позиций,
+    реализованный PnL за день, частота разворотов) обновляется по исполнениям.
+    Reduce-only ордера не блокируются - закрытие позиции только снижает риск.
+    """
+
+    def __init__(self, limits: RiskLimits):
+        self.logger = setup_logger(__name__)
+        self.metrics = get_metrics()
+        self.limits = limits
+        self._lock = threading.Lock()
+        # (account, symbol) -> (signed qty, entry price)
+        self._positions: Dict[Tuple[str, str], Tuple[float, float]] = {}
+        self._opens: Dict[Tuple[str, str], Deque[float]] = {}
+        self._day_end = 0.0
+        self._daily_pnl = 0.0
+
+    def _roll_day(self):
+        # Сброс дневного PnL в полночь UTC; граница дня считается один раз
+        now = time.time()
+        if now >= self._day_end:
+            self._day_end = (now // 86400 + 1) * 86400
+            self._daily_pnl = 0.0
+
+    def update_limits(self, limits: RiskLimits):
+        """Новые лимиты (hot reload); включенный через API kill switch перезагрузка не снимает"""
+        limits.kill_switch = limits.kill_switch or self.limits.kill_switch
+        self.limits = limits
+        self.logger.info(f"Лимиты риск-контроля обновлены: {limits}")
+
+    def set_kill_switch(self, enabled: bool):
+        self.limits.kill_switch = enabled
+        self.metrics.set('risk_kill_switch', 1 if enabled else 0)
+        self.logger.warning(f"Kill switch {'ВКЛЮЧЕН' if enabled else 'выключен'}")
+
+    def check_order(self, account: str, symbol: str, quantity: float, price: float,
+                    reduce_only: bool = False) -> Optional[str]:
+        """None - ордер разрешен, иначе причина отказа"""
+        self.metrics.inc('risk_checks_total')
+        if reduce_only:
+            return None
+
+        reason = self._check_open(account, symbol, quantity * price)
+        if reason:
+            self.metrics.inc('risk_rejections_total', {'symbol': symbol, 'reason': reason})
+            self.logger.warning(f"Риск-контроль отклонил ордер {symbol}: {reason}")
+        return reason
+
+    def _check_open(self, account: str, symbol: str, notional: float) -> Optional[str]:
+        limits = self.limits
+        if limits.kill_switch:
+            return "kill_switch"
+
+        with self._lock:
+            self._roll_day()
+            if limits.daily_loss_limit and self._daily_pnl <= -limits.daily_loss_limit:
+                return "daily_loss_limit"
+
+            if limits.max_flips_per_hour:
+                opens = self._opens.get((account, symbol))
+                if opens:
+                    cutoff = time.time() - 3600
+                    while opens and opens[0] < cutoff:
+                        opens.popleft()
+                    if len(opens) >= limits.max_flips_per_hour:
+                        return "max_flips_per_hour"
+
+            symbol_notional = account_notional = total_notional = notional
+            for (pos_account, pos_symbol), (qty, entry) in self._positions.items():
+                exposure = abs(qty) * entry
+                total_notional += exposure
+                if pos_account == account:
+                    account_notional += exposure
+                    if pos_symbol == symbol:
+                        symbol_notional += exposure
+
+        if limits.max_symbol_notional and symbol_notional > limits.max_symbol_notional:
+            return "max_symbol_notional"
+        if limits.max_account_notional and account_notional > limits.max_account_notional:
+            return "max_account_notional"
+        if limits.max_total_exposure and total_notional > limits.max_total_exposure:
+            return "max_total_exposure"
+        return None
+
+    def sync_position(self, account: str, symbol: str, position: Optional[Dict[str, Any]]):
+        """Позиция с биржи (старт, сверка) - заменяет локальное состояние, не считается разворотом"""
+        with self._lock:
+            if position:
+                qty = position['size'] if position['side'] == "Buy" else -position['size']
+                self._positions[(account, symbol)] = (qty, position['entry_price'])
+            else:
+                self._positions.pop((account, symbol), None)
+
+    def on_fill(self, account: str, symbol: str, is_buy: bool, quantity: float, price: float,
+                reduce_only: bool = False, realized_pnl: Optional[float] = None):
+        """Обновление состояния по исполнению (вызывается движком после ордера)"""
+        key = (account, symbol)
+        with self._lock:
+            self._roll_day()
+            qty, entry = self._positions.get(key, (0.0, 0.0))
+
+            if reduce_only:
+                remaining = max(abs(qty) - quantity, 0.0)
+                if remaining > 0:
+                    self._positions[key] = (remaining if qty > 0 else -remaining, entry)
+                else:
+                    self._positions.pop(key, None)
+                if realized_pnl is not None:
+                    self._daily_pnl += realized_pnl
+            else:
+                new_qty = qty + (quantity if is_buy else -quantity)
+                if qty == 0 or (qty > 0) != is_buy:
+                    new_entry = price
+                else:
+                    # Средняя цена входа для доливки в ту же сторону
+                    new_entry = (abs(qty) * entry + quantity * price) / abs(new_qty)
+
+                if new_qty:
+                    self._positions[key] = (new_qty, new_entry)
+                else:
+                    self._positions.pop(key, None)
+                self._opens.setdefault(key, deque()).append(time.time())
+
+            self.metrics.set('risk_daily_realized_pnl', self._daily_pnl)
+            self.metrics.set('risk_total_exposure', sum(abs(q) * e for q, e in self._positions.values()))
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            self._roll_day()
+            return {
+                'limits': dict(self.limits.__dict__),
+                'daily_realized_pnl': self._daily_pnl,
+                'positions': [
+                    {'account': account, 'symbol': symbol, 'qty': qty, 'entry_price': entry}
+                    for (account, symbol), (qty, entry) in self._positions.items()
+                ]
+            }
+
+
+_risk_engine: Optional[RiskEngine] = None
+_risk_lock = threading.Lock()
+
+
+def get_risk_engine() -> RiskEngine:
+    """Общий на процесс риск-движок (лимиты из окружения при первом обращении)"""
+    global _risk_engine
+    if _risk_engine is None:
+        with _risk_lock:
+            if _risk_engine is None:
+                _risk_engine = RiskEngine(RiskLimits.from_env())
+    return _risk_engine
@@ -2,20 +2,31 @@
 from typing import Optional
 from src.parser.models import TradingSignal, SignalType
 from src.logger.config import setup_logger
+from src.journal import get_journal, JournalEvent
 
 
 class SignalFilter:
     def __init__(self):
         self.logger = setup_logger(__name__)
+        self.journal = get_journal()
         self.last_signal: Optional[SignalType] = None
 
     def should_process(self, signal: TradingSignal) -> bool:
         """
         Проверяет должен ли сигнал быть обработан на основе чередования
         """
+        accepted = self._check(signal)
+        self.journal.record(JournalEvent.FILTER, signal.symbol, {'signal': signal.signal.value, 'accepted': accepted})
+        return accepted
+
+    def confirm(self, signal: TradingSignal):
+        """Сигнал исполнен - чередование считается от него. Неисполненный сигнал (сбой биржи)
+        не запоминается, и его повтор пройдет фильтр"""
+        self.last_signal = signal.signal
+
+    def _check(self, signal: TradingSignal) -> bool:
         if self.last_signal is None:
             # Первый сигнал - всегда обрабатываем, логируем не нужно
-            self.last_signal = signal.signal
             return True
 
         if self.last_signal == signal.signal:
@@ -23,6 +34,5 @@ class SignalFilter:
             self.logger.info(f"Дублирующий сигнал {signal.signal.value} - игнорируется")
             return False
 
-        # Противоположный сигнал - обрабатываем и обновляем состояние
-        self.last_signal = signal.signal
-        return True
\ No newline at end of file
+        # Противоположный сигнал - обрабатываем; состояние обновит confirm после исполнения
+        return True
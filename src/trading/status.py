@@ -0,0 +1,33 @@
+import time
+from dataclasses import asdict
+from typing import Any, Dict, Iterable
+
+
+def strategy_status(strategy) -> Dict[str, Any]:
+    """Снимок состояния символа из памяти: поля обновляются самими движками
+    при их обычных запросах, сборка снимка не обращается к бирже"""
+    engine = strategy.engine
+    position = engine.current_position
+    return {
+        'symbol': engine.symbol,
+        'mode': getattr(engine, 'label', 'LIVE'),
+        'account': getattr(engine, 'account', None),
+        'position': dict(position) if position else None,
+        'balance': engine.last_balance,
+        'last_price': engine.last_price,
+        'last_signal': dict(strategy.last_signal) if strategy.last_signal else None,
+        'last_order': engine.last_order,
+        'protection': asdict(engine.protection) if getattr(engine, 'protection', None) else None,
+        'health': {
+            'ready': engine.spec is not None,
+            'reconciled': getattr(engine, 'reconciler', None) is not None,
+            'last_error': engine.last_error
+        }
+    }
+
+
+def status_snapshot(strategies: Iterable) -> Dict[str, Any]:
+    return {
+        'timestamp': time.time(),
+        'symbols': [strategy_status(strategy) for strategy in strategies if strategy is not None]
+    }
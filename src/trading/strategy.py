@@ -0,0 +1,90 @@
+# src/trading/strategy.py
+import time
+from typing import Optional
+from .signal_filter import SignalFilter
+from src.parser.models import TradingSignal, SignalType
+from src.logger.config import setup_logger
+
+
+class TradingStrategy:
+    """Общая логика стратегии поверх любого движка (Bybit, Binance, paper):
+    фильтр чередования, проверка текущей позиции, открытие и разворот"""
+
+    # Пауза между закрытием и открытием при развороте (бирже нужно время на обновление позиции)
+    reverse_delay = 1.0
+
+    def __init__(self, config, engine):
+        self.logger = setup_logger(type(self).__module__)
+        self.config = config
+        self.signal_filter = SignalFilter()
+        self.last_signal = None
+        self.engine = engine
+        label = getattr(engine, 'label', None)
+        self._prefix = f"[{label}] " if label else ""
+
+    def process_signal(self, signal: TradingSignal) -> bool:
+        self.last_signal = {'signal': str(signal), 'timeframe': signal.timeframe,
+                            'received_at': time.time(), 'processed': None}
+        processed = self._process_signal(signal)
+        self.last_signal['processed'] = processed
+        return processed
+
+    def _process_signal(self, signal: TradingSignal) -> bool:
+        try:
+            # Уровень 1: Фильтр чередования
+            if not self.signal_filter.should_process(signal):
+                return True
+
+            # Уровень 2: Проверка текущей позиции
+            current_position = self.engine.get_current_position()
+
+            if current_position is None:
+                processed = self._open_new_position(signal)
+            elif (SignalType.LONG if current_position['side'] == "Buy" else SignalType.SHORT) == signal.signal:
+                self.logger.info(f"{self._prefix}Позиция {signal.signal.value} уже открыта - пропускаем")
+                processed = True
+            else:
+                processed = self._reverse_position(signal)
+
+            # Фильтр запоминает только исполненный сигнал: после сбоя повтор сигнала снова торгует
+            if processed:
+                self.signal_filter.confirm(signal)
+            return processed
+
+        except Exception as e:
+            self.logger.error(f"{self._prefix}Ошибка обработки сигнала {signal}: {e}")
+            return False
+
+    @staticmethod
+    def _client_id(signal: TradingSignal, leg: str) -> Optional[str]:
+        # Ордер каждой ноги сигнала получает id доставки: повтор не создаст второй ордер на бирже
+        return f"{signal.signal_id}-{leg}" if signal.signal_id else None
+
+    def _open_new_position(self, signal: TradingSignal) -> bool:
+        """Открытие новой позиции когда текущей нет"""
+
+        if signal.is_long:
+            return self.engine.open_long(self._client_id(signal, 'o'))
+        else:
+            return self.engine.open_short(self._client_id(signal, 'o'))
+
+    def _reverse_position(self, signal: TradingSignal) -> bool:
+        """Закрытие текущей позиции и открытие новой"""
+        self.logger.info(f"{self._prefix}Разворот позиции в {signal.signal.value}")
+
+        # Закрытие, пауза и открытие - одна операция для сверки позиций
+        with self.engine.order_in_flight():
+            if not self.engine.close_position(self._client_id(signal, 'c')):
+                self.logger.error(f"{self._prefix}Не удалось закрыть текущую позицию")
+                return False
+
+            if self.reverse_delay:
+                time.sleep(self.reverse_delay)
+
+            return self._open_new_position(signal)
+
+    def get_position_info(self):
+        return self.engine.get_current_position()
+
+    def get_balance(self) -> float:
+        return self.engine.get_account_balance()
@@ -0,0 +1,155 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Tuple
+from src.logger.config import setup_logger
+from src.metrics import get_metrics
+
+
+@dataclass(frozen=True)
+class OrderTemplate:
+    side: str
+    quantity: float
+    reduce_only: bool
+    params: Dict[str, Any]
+    price: Optional[float]
+    # Сколько заняла подготовка (чтения с биржи + расчет) - столько сигнал не ждет
+    build_seconds: float
+
+
+class OrderTemplates:
+    """Заранее подготовленные ордера символа: long и short на открытие и reduce-only
+    на закрытие известной позиции, с уже рассчитанными объемом и параметрами.
+
+    Включаются явно (ORDER_TEMPLATES=true): фоновый цикл раз в interval читает цену
+    и баланс по REST и расходует тот же лимит запросов биржи, что и ордера. Шаблоны
+    пересобираются, если изменились цена, баланс, конфигурация или позиция. Чтения
+    идут с шагом interval от начала предыдущего, и сигнал берет шаблон, пока следующее
+    чтение не должно было завершиться: возраст цены не больше interval плюс длительность
+    недавних чтений (цена станет ценой входа и риска). Иначе движок готовит ордер как
+    раньше. После исполнения движок вызывает invalidate(): цикл пересобирает шаблоны сразу.
+    """
+
+    # Запаздывание пробуждения цикла по расписанию
+    SCHEDULE_SLACK = 0.05
+
+    def __init__(self, engine):
+        self.logger = setup_logger(__name__)
+        self.metrics = get_metrics()
+        self.engine = engine
+        self.is_running = False
+
+        self._templates: Dict[Tuple[str, bool], OrderTemplate] = {}
+        self._state: Optional[tuple] = None
+        self._checked_at = 0.0
+        # Длительности последних чтений цены и баланса
+        self._read_seconds = deque([0.0], maxlen=5)
+        self._generation = 0
+        self._wakeup: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.engine.config.order_templates
+
+    @property
+    def max_age(self) -> float:
+        """Возраст цены шаблона, до которого следующее чтение по расписанию еще идет"""
+        return self.engine.config.template_interval + max(self._read_seconds) + self.SCHEDULE_SLACK
+
+    def take(self, side: str, reduce_only: bool = False) -> Optional[OrderTemplate]:
+        """Свежий шаблон или None (выключено, устарел, не собран)"""
+        if not self.enabled or time.monotonic() - self._checked_at > self.max_age:
+            return None
+        return self._templates.get((side, reduce_only))
+
+    def match(self, side: str, quantity: float, reduce_only: bool) -> Optional[OrderTemplate]:
+        template = self.take(side, reduce_only)
+        return template if template is not None and template.quantity == quantity else None
+
+    def invalidate(self):
+        """Баланс, позиция или конфигурация изменились (можно из любого потока)"""
+        self._generation += 1
+        self._templates = {}
+        self._state = None
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    def refresh(self):
+        """Чтение цены и баланса и пересборка шаблонов (блокирующий, в потоке)"""
+        engine = self.engine
+        generation = self._generation
+        started = time.perf_counter()
+        # Возраст шаблона считается от чтения цены, а не от конца сборки
+        read_at = time.monotonic()
+
+        balance_future = engine._reads.submit(engine.get_account_balance)
+        price = engine.get_current_price()
+        balance = balance_future.result()
+        self._read_seconds.append(time.monotonic() - read_at)
+        position = engine.current_position
+        if price == 0:
+            return
+
+        state = (price, balance, engine.config, position and (position['side'], position['size']))
+        if state == self._state:
+            self._checked_at = read_at
+            return
+
+        templates = {}
+        quantity = engine._quantity_for(price)
+        if balance >= engine.config.position_size and not engine.spec.check_order(quantity, price, allow_slicing=True):
+            for side in (engine.BUY, engine.SELL):
+                templates[(side, False)] = self._build(side, quantity, False, price, started)
+
+        if position:
+            side = engine.SELL if position['side'] == "Buy" else engine.BUY
+            templates[(side, True)] = self._build(side, engine._round_quantity(position['size']), True, None, started)
+
+        if generation != self._generation:
+            # Пока читали, прошло исполнение - результат уже устарел
+            return
+
+        self._templates = templates
+        self._state = state
+        self._checked_at = read_at
+        self.metrics.inc('order_template_builds_total', {'symbol': engine.symbol})
+
+    def _build(self, side: str, quantity: float, reduce_only: bool, price: Optional[float],
+               started: float) -> OrderTemplate:
+        return OrderTemplate(
+            side=side, quantity=quantity, reduce_only=reduce_only,
+            params=self.engine._order_params(side, quantity, reduce_only), price=price,
+            build_seconds=time.perf_counter() - started
+        )
+
+    async def start(self):
+        if self.is_running:
+            return
+
+        self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self.logger.info(f"Шаблоны ордеров {self.engine.symbol}: обновление раз в {self.engine.config.template_interval} сек")
+
+        while self.is_running:
+            # Шаг считается от начала чтения: иначе между чтениями interval плюс их длительность
+            started = time.monotonic()
+            if self.enabled:
+                try:
+                    await asyncio.to_thread(self.refresh)
+                except Exception as e:
+                    self.logger.error(f"Ошибка обновления шаблонов ордеров {self.engine.symbol}: {e}")
+
+            self._wakeup.clear()
+            timeout = self.engine.config.template_interval - (time.monotonic() - started)
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=max(timeout, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    def stop(self):
+        self.is_running = False
+        if self._loop is not None and self._wakeup is not None:
+            self._loop.call_soon_threadsafe(self._wakeup.set)
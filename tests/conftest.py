@@ -0,0 +1,4 @@
+import os
+
+# Тесты не пишут в журнал сделок data/journal.db
+os.environ.setdefault('JOURNAL_ENABLED', 'false')
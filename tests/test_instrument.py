@@ -0,0 +1,157 @@
+from decimal import Decimal
+
+import numpy as np
+import pytest
+
+from src.trading.instrument import InstrumentSpec
+
+# Ответы бирж для ETHUSDT (перпетуал) в том виде, в каком их возвращает API
+BYBIT_INSTRUMENT = {
+    'symbol': 'ETHUSDT',
+    'contractType': 'LinearPerpetual',
+    'status': 'Trading',
+    'priceScale': '2',
+    'priceFilter': {'minPrice': '0.01', 'maxPrice': '199999.98', 'tickSize': '0.01'},
+    'lotSizeFilter': {
+        'maxOrderQty': '7240.00',
+        'maxMktOrderQty': '724.00',
+        'minOrderQty': '0.01',
+        'qtyStep': '0.01',
+        'postOnlyMaxOrderQty': '7240.00',
+        'minNotionalValue': '5'
+    },
+}
+
+BINANCE_SYMBOL = {
+    'symbol': 'ETHUSDT',
+    'pricePrecision': 2,
+    'quantityPrecision': 3,
+    'filters': [
+        {'filterType': 'PRICE_FILTER', 'minPrice': '39.86', 'maxPrice': '306177', 'tickSize': '0.01'},
+        {'filterType': 'LOT_SIZE', 'minQty': '0.001', 'maxQty': '10000', 'stepSize': '0.001'},
+        {'filterType': 'MARKET_LOT_SIZE', 'minQty': '0.001', 'maxQty': '2000', 'stepSize': '0.001'},
+        {'filterType': 'MAX_NUM_ORDERS', 'limit': 200},
+        {'filterType': 'MIN_NOTIONAL', 'notional': '20'},
+        {'filterType': 'PERCENT_PRICE', 'multiplierUp': '1.0500', 'multiplierDown': '0.9500',
+         'multiplierDecimal': '4'},
+    ],
+}
+
+
+@pytest.fixture
+def bybit():
+    return InstrumentSpec.from_bybit(BYBIT_INSTRUMENT)
+
+
+@pytest.fixture
+def binance():
+    return InstrumentSpec.from_binance(BINANCE_SYMBOL)
+
+
+def test_from_bybit_reads_filters(bybit):
+    assert bybit.symbol == 'ETHUSDT'
+    assert bybit.qty_step == Decimal('0.01')
+    assert bybit.tick_size == Decimal('0.01')
+    assert bybit.min_qty == Decimal('0.01')
+    # Для маркет-ордеров - maxMktOrderQty, а не maxOrderQty
+    assert bybit.max_qty == Decimal('724.00')
+    assert bybit.min_notional == Decimal('5')
+    assert (bybit.qty_precision, bybit.price_precision) == (2, 2)
+
+
+def test_from_bybit_without_market_limit_and_notional():
+    lot_size_filter = {k: v for k, v in BYBIT_INSTRUMENT['lotSizeFilter'].items()
+                       if k not in ('maxMktOrderQty', 'minNotionalValue')}
+    spec = InstrumentSpec.from_bybit(dict(BYBIT_INSTRUMENT, lotSizeFilter=lot_size_filter))
+    assert spec.max_qty == Decimal('7240.00')
+    assert spec.min_notional == 0
+
+
+def test_from_binance_reads_filters(binance):
+    assert binance.qty_step == Decimal('0.001')
+    assert binance.tick_size == Decimal('0.01')
+    assert binance.min_qty == Decimal('0.001')
+    # MARKET_LOT_SIZE ограничивает маркет-ордера сильнее LOT_SIZE
+    assert binance.max_qty == Decimal('2000')
+    assert binance.min_notional == Decimal('20')
+    assert (binance.qty_precision, binance.price_precision) == (3, 2)
+
+
+def test_from_binance_legacy_min_notional():
+    filters = [item for item in BINANCE_SYMBOL['filters'] if item['filterType'] not in ('MIN_NOTIONAL',
+                                                                                         'MARKET_LOT_SIZE')]
+    filters.append({'filterType': 'MIN_NOTIONAL', 'minNotional': '5'})
+    spec = InstrumentSpec.from_binance(dict(BINANCE_SYMBOL, filters=filters))
+    assert spec.min_notional == Decimal('5')
+    assert spec.max_qty == Decimal('10000')
+
+
+@pytest.mark.parametrize('quantity, floor, expected', [
+    (0.123456, False, 0.12),
+    (0.125, False, 0.13),
+    (0.129, True, 0.12),
+    (0.3, True, 0.3),
+    (1.005, False, 1.01),
+    (0.004, False, 0.0),
+])
+def test_round_quantity_to_step(bybit, quantity, floor, expected):
+    assert bybit.round_quantity(quantity, floor=floor) == expected
+
+
+def test_round_quantity_is_exact_multiple(binance):
+    for quantity in (0.1 + 0.2, 1 / 3, 2.0004999, 1234.5678):
+        rounded = binance.round_quantity(quantity)
+        assert Decimal(str(rounded)) % binance.qty_step == 0
+        assert binance.check_order(rounded, 2000) is None
+
+
+@pytest.mark.parametrize('price, expected', [(2000.004, 2000.0), (2000.005, 2000.01), (1999.999, 2000.0)])
+def test_round_price_to_tick(bybit, price, expected):
+    assert bybit.round_price(price) == expected
+
+
+def test_clamp_quantity(binance):
+    assert binance.clamp_quantity(0.0001) == 0.001
+    assert binance.clamp_quantity(5000) == 2000
+    assert binance.clamp_quantity(1.5) == 1.5
+
+
+def test_format_without_exponent():
+    spec = InstrumentSpec.from_step('BTCUSDT', 0.00001, tick_size=0.1)
+    assert spec.format_quantity(0.00001) == '0.00001'
+    assert spec.format_price(65000.0) == '65000.0'
+
+
+def test_check_order(binance):
+    assert binance.check_order(0.5, 2000) is None
+    assert 'меньше минимального' in binance.check_order(0.0005, 2000)
+    assert 'больше максимального' in binance.check_order(2500, 2000)
+    assert binance.check_order(2500, 2000, allow_slicing=True) is None
+    assert 'не кратно шагу' in binance.check_order(0.0015, 20000)
+    # 0.005 * 2000 = 10 USDT < minNotional 20
+    assert 'Стоимость ордера' in binance.check_order(0.005, 2000)
+    assert binance.check_order(0.01, 2000) is None
+
+
+def test_from_step_has_no_upper_limit():
+    spec = InstrumentSpec.from_step('ETHUSDT', 0.001)
+    assert spec.min_qty == spec.qty_step == Decimal('0.001')
+    assert spec.check_order(1e9, 2000) is None
+
+
+@pytest.mark.parametrize('floor', [False, True])
+def test_vectorized_rounding_matches_scalar(bybit, binance, floor):
+    rng = np.random.default_rng(42)
+    # Половины шага (1.005 при шаге 0.01) в float лежат чуть ниже середины - как и round_quantity,
+    # векторный путь должен округлять их вверх
+    ties = [0.1 + 0.2, 0.3, 0.7, 1.1, 2.675, 0.125, 1.005, 0.285, 4.015, 0.575]
+    quantities = np.concatenate([rng.uniform(0, 50, 2000), ties])
+    for spec in (bybit, binance):
+        vectorized = spec.round_quantities(quantities, floor=floor)
+        scalar = [spec.round_quantity(float(quantity), floor=floor) for quantity in quantities]
+        assert vectorized.tolist() == scalar
+
+
+def test_vectorized_clamp_matches_scalar(binance):
+    quantities = np.array([0.0, 0.0004, 0.001, 1.5, 2000, 2000.5, 1e6])
+    assert binance.clamp_quantities(quantities).tolist() == [binance.clamp_quantity(q) for q in quantities]
@@ -0,0 +1,31 @@
+from src.metrics.registry import MetricsRegistry
+
+
+def test_summary_max_is_separate_gauge():
+    metrics = MetricsRegistry()
+    labels = {'symbol': 'ETHUSDT'}
+    metrics.observe('execution_fill_seconds', 0.2, labels)
+    metrics.observe('execution_fill_seconds', 0.5, labels)
+    metrics.observe('execution_price_improvement_bps', -1.5, labels)
+
+    lines = metrics.render_prometheus().splitlines()
+    assert lines == [
+        '# TYPE execution_fill_seconds summary',
+        'execution_fill_seconds_count{symbol="ETHUSDT"} 2',
+        'execution_fill_seconds_sum{symbol="ETHUSDT"} 0.7',
+        '# TYPE execution_fill_max_seconds gauge',
+        'execution_fill_max_seconds{symbol="ETHUSDT"} 0.5',
+        '# TYPE execution_price_improvement_bps summary',
+        'execution_price_improvement_bps_count{symbol="ETHUSDT"} 1',
+        'execution_price_improvement_bps_sum{symbol="ETHUSDT"} -1.5',
+        '# TYPE execution_price_improvement_max_bps gauge',
+        'execution_price_improvement_max_bps{symbol="ETHUSDT"} -1.5',
+    ]
+
+
+def test_snapshot_uses_gauge_name_for_max():
+    metrics = MetricsRegistry()
+    metrics.observe('order_prepare_seconds', 0.01)
+    snapshot = metrics.snapshot()
+    assert snapshot['order_prepare_seconds_count'] == {'': 1}
+    assert snapshot['order_prepare_max_seconds'] == {'': 0.01}
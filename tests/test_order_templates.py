@@ -0,0 +1,78 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from src.trading.templates import OrderTemplates
+
+INTERVAL = 0.2
+READ_SECONDS = 0.08
+
+
+class SlowEngine:
+    """Движок с медленным чтением цены (REST под нагрузкой)"""
+
+    symbol = 'ETHUSDT'
+    BUY = 'Buy'
+    SELL = 'Sell'
+
+    def __init__(self):
+        self.config = SimpleNamespace(order_templates=True, template_interval=INTERVAL, position_size=100.0)
+        self.spec = SimpleNamespace(check_order=lambda quantity, price, allow_slicing=False: None)
+        self.current_position = None
+        self._reads = ThreadPoolExecutor(max_workers=1)
+        self.price = 2000.0
+
+    def get_current_price(self) -> float:
+        time.sleep(READ_SECONDS)
+        self.price += 0.01
+        return self.price
+
+    def get_account_balance(self) -> float:
+        return 500.0
+
+    def _quantity_for(self, price: float) -> float:
+        return 0.05
+
+    def _order_params(self, side, quantity, reduce_only):
+        return {'side': side, 'qty': quantity}
+
+
+def test_templates_stay_fresh_between_slow_reads():
+    engine = SlowEngine()
+    templates = OrderTemplates(engine)
+
+    async def sample():
+        task = asyncio.create_task(templates.start())
+        # Первая сборка
+        await asyncio.sleep(READ_SECONDS + 0.05)
+        misses = hits = 0
+        until = time.monotonic() + 6 * INTERVAL
+        while time.monotonic() < until:
+            if templates.take(engine.BUY) is None:
+                misses += 1
+            else:
+                hits += 1
+            await asyncio.sleep(0.005)
+        templates.stop()
+        await task
+        return hits, misses
+
+    try:
+        hits, misses = asyncio.run(sample())
+    finally:
+        engine._reads.shutdown()
+    assert hits > 0
+    assert misses == 0
+
+
+def test_stale_template_is_not_taken():
+    engine = SlowEngine()
+    templates = OrderTemplates(engine)
+    try:
+        templates.refresh()
+    finally:
+        engine._reads.shutdown()
+    assert templates.take(engine.BUY).price == engine.price
+    templates._checked_at -= templates.max_age + 0.01
+    assert templates.take(engine.BUY) is None
@@ -0,0 +1,101 @@
+from contextlib import nullcontext
+
+from src.parser.models import TradingSignal, SignalType
+from src.trading.consensus import SignalConsensus, ConsensusConfig, ConsensusRule
+from src.trading.strategy import TradingStrategy
+
+
+class FakeEngine:
+    """Движок, у которого первые failures ордеров отклоняются биржей"""
+
+    symbol = 'ETHUSDT'
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.position = None
+        self.orders = []
+
+    def get_current_position(self):
+        return self.position
+
+    def order_in_flight(self):
+        return nullcontext()
+
+    def _order(self, side):
+        self.orders.append(side)
+        if self.failures:
+            self.failures -= 1
+            return False
+        self.position = {'side': side, 'size': 1.0, 'entry_price': 2000.0}
+        return True
+
+    def open_long(self, client_id=None):
+        return self._order('Buy')
+
+    def open_short(self, client_id=None):
+        return self._order('Sell')
+
+    def close_position(self, client_id=None):
+        self.position = None
+        return True
+
+
+def signal(direction: SignalType, timeframe: str = None) -> TradingSignal:
+    return TradingSignal(symbol='ETHUSDT', signal=direction, timeframe=timeframe)
+
+
+def make_strategy(failures: int = 0) -> TradingStrategy:
+    strategy = TradingStrategy(config=None, engine=FakeEngine(failures))
+    strategy.reverse_delay = 0
+    return strategy
+
+
+def test_failed_open_is_retried():
+    strategy = make_strategy(failures=1)
+    assert strategy.process_signal(signal(SignalType.LONG)) is False
+    assert strategy.process_signal(signal(SignalType.LONG)) is True
+    assert strategy.engine.orders == ['Buy', 'Buy']
+    assert strategy.engine.position['side'] == 'Buy'
+
+
+def test_failed_reverse_is_retried():
+    strategy = make_strategy()
+    assert strategy.process_signal(signal(SignalType.LONG))
+    strategy.engine.failures = 1
+    assert strategy.process_signal(signal(SignalType.SHORT)) is False
+    assert strategy.process_signal(signal(SignalType.SHORT)) is True
+    assert strategy.engine.position['side'] == 'Sell'
+
+
+def test_repeat_after_success_is_filtered():
+    strategy = make_strategy()
+    assert strategy.process_signal(signal(SignalType.LONG))
+    assert strategy.process_signal(signal(SignalType.LONG))
+    assert strategy.engine.orders == ['Buy']
+
+
+def test_consensus_reemits_until_confirmed():
+    consensus = SignalConsensus(ConsensusConfig(timeframes={'15': 1.0, '60': 1.0}, rule=ConsensusRule.ALL))
+    assert consensus.update(signal(SignalType.LONG, '15')) is None
+    combined = consensus.update(signal(SignalType.LONG, '60'))
+    assert combined is not None and combined.signal == SignalType.LONG
+
+    # Сделка не исполнена - повтор голоса выпускает ее снова
+    retried = consensus.update(signal(SignalType.LONG, '60'))
+    assert retried is not None and retried.signal == SignalType.LONG
+
+    consensus.confirm(retried)
+    assert consensus.update(signal(SignalType.LONG, '60')) is None
+
+
+def test_consensus_reload_keeps_confirmed_direction():
+    config = ConsensusConfig(timeframes={'15': 1.0, '60': 1.0}, rule=ConsensusRule.ALL)
+    consensus = SignalConsensus(config)
+    consensus.update(signal(SignalType.LONG, '15'))
+    assert consensus.update(signal(SignalType.LONG, '60')) is not None
+
+    # Перезагрузка не подтверждает неисполненный разворот
+    consensus.configure(ConsensusConfig(timeframes={'15': 1.0, '60': 1.0}, rule=ConsensusRule.MAJORITY))
+    assert consensus.state('ETHUSDT')['direction'] is None
+    retried = consensus.update(signal(SignalType.LONG, '60'))
+    assert retried is not None and retried.signal == SignalType.LONG